@@ -1,4 +1,10 @@
-from app import app
+import sys
+from pathlib import Path
+
+# リポジトリ直下の main.py を読み込めるようにする
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from main import app
 
 # Vercel用のエントリーポイント
 handler = app
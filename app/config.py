@@ -14,23 +14,147 @@ class Config:
     
     # Gemini API
     GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+    # Gemini API呼び出しの同時実行数上限（ワーカーあたり）
+    GEMINI_MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", "8"))
     
-    # プロキシ設定
+    # Gemini API HTTP接続（コネクションプール・タイムアウト）
+    GEMINI_POOL_MAXSIZE = int(os.getenv("GEMINI_POOL_MAXSIZE", "10"))
+    GEMINI_CONNECT_TIMEOUT = float(os.getenv("GEMINI_CONNECT_TIMEOUT", "10"))
+    GEMINI_READ_TIMEOUT = float(os.getenv("GEMINI_READ_TIMEOUT", "120"))
+    # 起動時にGemini APIへの接続を事前確立する（0で無効）
+    GEMINI_WARMUP_CONNECTIONS = int(os.getenv("GEMINI_WARMUP_CONNECTIONS", "0"))
+    
+    # Geminiの接続先（"gemini": 本番API、"fake": オフライン用のフェイク）
+    GEMINI_BACKEND = os.getenv("GEMINI_BACKEND", "gemini")
+    # フェイクの応答時間・ゆらぎ（ミリ秒）とエラー注入
+    GEMINI_FAKE_LATENCY_MS = float(os.getenv("GEMINI_FAKE_LATENCY_MS", "300"))
+    GEMINI_FAKE_JITTER_MS = float(os.getenv("GEMINI_FAKE_JITTER_MS", "100"))
+    GEMINI_FAKE_ERROR_RATE = float(os.getenv("GEMINI_FAKE_ERROR_RATE", "0"))
+    GEMINI_FAKE_ERROR_CODE = int(os.getenv("GEMINI_FAKE_ERROR_CODE", "503"))
+    
+    # Gemini API呼び出しのレート制限（APIクォータに合わせる）・期限・リトライ
+    GEMINI_RATE_LIMIT_RPM = float(os.getenv("GEMINI_RATE_LIMIT_RPM", "600"))
+    GEMINI_RATE_BURST = int(os.getenv("GEMINI_RATE_BURST", "10"))
+    GEMINI_CALL_DEADLINE = float(os.getenv("GEMINI_CALL_DEADLINE", "180"))
+    GEMINI_MAX_RETRIES = int(os.getenv("GEMINI_MAX_RETRIES", "3"))
+    GEMINI_RETRY_BASE_DELAY = float(os.getenv("GEMINI_RETRY_BASE_DELAY", "0.5"))
+    GEMINI_RETRY_MAX_DELAY = float(os.getenv("GEMINI_RETRY_MAX_DELAY", "8"))
+    # p95（モデルごと）を超えて応答がない generate_content に重複リクエストを送る
+    GEMINI_HEDGE = os.getenv("GEMINI_HEDGE", "False") == "True"
+    GEMINI_HEDGE_MIN_SAMPLES = int(os.getenv("GEMINI_HEDGE_MIN_SAMPLES", "20"))
+    
+    # モデルの振り分け（しきい値以下の入力は高速モデル、議事録の最終整形は常に通常モデル）
+    GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
+    GEMINI_FAST_MODEL = os.getenv("GEMINI_FAST_MODEL", "gemini-2.5-flash-lite")
+    MODEL_ROUTE_SUMMARY_MAX_CHARS = int(os.getenv("MODEL_ROUTE_SUMMARY_MAX_CHARS", "2000"))
+    MODEL_ROUTE_STT_MAX_BYTES = int(os.getenv("MODEL_ROUTE_STT_MAX_BYTES", str(1024 * 1024)))
+    MODEL_ROUTE_MINUTES_MAP_MAX_CHARS = int(os.getenv("MODEL_ROUTE_MINUTES_MAP_MAX_CHARS", "0"))
+    
+    # プロキシ設定（Gemini API接続にのみ使用）
     HTTP_PROXY = os.getenv("HTTP_PROXY")
     HTTPS_PROXY = os.getenv("HTTPS_PROXY")
     
     # サーバー設定
     DEBUG = os.getenv("DEBUG", "False") == "True"
+    # リクエストごとのJSONログ（所要時間・処理段階別の時間）
+    ACCESS_LOG = os.getenv("ACCESS_LOG", "True") == "True"
     HOST = "0.0.0.0"
     PORT = 8001
     
+    # Gemini API 結果キャッシュ（文字起こし・要約）
+    RESULT_CACHE_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "500"))
+    RESULT_CACHE_MAX_BYTES = int(os.getenv("RESULT_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+    RESULT_CACHE_TTL_SECONDS = int(os.getenv("RESULT_CACHE_TTL_SECONDS", str(24 * 60 * 60)))
+    # SQLiteファイルのパス（空の場合はメモリのみ）
+    RESULT_CACHE_DB = os.getenv("RESULT_CACHE_DB", "")
+    RESULT_CACHE_DB_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_DB_MAX_ENTRIES", "10000"))
+    
+    # 音声アップロード（上限サイズ・一時ファイルへ退避するしきい値）
+    STT_MAX_UPLOAD_BYTES = int(os.getenv("STT_MAX_UPLOAD_BYTES", str(50 * 1024 * 1024)))
+    STT_SPOOL_THRESHOLD_BYTES = int(os.getenv("STT_SPOOL_THRESHOLD_BYTES", str(4 * 1024 * 1024)))
+    
+    # 文字起こしと要約を1回のGemini呼び出しで行う（失敗時は2段階処理）
+    STT_COMBINED_SUMMARY = os.getenv("STT_COMBINED_SUMMARY", "False") == "True"
+    
+    # 音声の分割アップロード（録音中の逐次文字起こし）
+    STT_CHUNK_TTL_SECONDS = int(os.getenv("STT_CHUNK_TTL_SECONDS", "600"))
+    STT_CHUNK_MAX_UPLOADS = int(os.getenv("STT_CHUNK_MAX_UPLOADS", "100"))
+    STT_CHUNK_MAX_SEGMENTS = int(os.getenv("STT_CHUNK_MAX_SEGMENTS", "120"))
+    
+    # セッション管理
+    SESSION_TTL_SECONDS = int(os.getenv("SESSION_TTL_SECONDS", str(3 * 60 * 60)))
+    SESSION_MAX_COUNT = int(os.getenv("SESSION_MAX_COUNT", "1000"))
+    SESSION_MAX_BYTES = int(os.getenv("SESSION_MAX_BYTES", str(32 * 1024 * 1024)))
+    # セッション・文字起こし・要約・議事録を保存するSQLiteファイル（空の場合はメモリのみ）
+    # 複数ワーカー（uvicorn --workers）で同じファイルを指定するとセッションを共有できる
+    INTERVIEW_DB = os.getenv("INTERVIEW_DB", "")
+    # 書き込みをまとめてコミットする待ち時間（秒）と件数
+    INTERVIEW_DB_FLUSH_INTERVAL = float(os.getenv("INTERVIEW_DB_FLUSH_INTERVAL", "0.005"))
+    INTERVIEW_DB_BATCH_SIZE = int(os.getenv("INTERVIEW_DB_BATCH_SIZE", "100"))
+    
+    # 生成済み文書のダウンロード保持期間（秒）と件数上限
+    DOCUMENT_TTL_SECONDS = int(os.getenv("DOCUMENT_TTL_SECONDS", "600"))
+    DOCUMENT_MAX_COUNT = int(os.getenv("DOCUMENT_MAX_COUNT", "200"))
+    DOCUMENT_MAX_BYTES = int(os.getenv("DOCUMENT_MAX_BYTES", str(32 * 1024 * 1024)))
+    # Word文書をメモリではなく OUTPUTS_DIR に書き出す（不要になった時点で削除）
+    DOCX_SPILL_TO_DISK = os.getenv("DOCX_SPILL_TO_DISK", "False") == "True"
+    # Word文書のベーステンプレート（.docx、空の場合は python-docx の既定テンプレート）
+    DOCX_TEMPLATE = os.getenv("DOCX_TEMPLATE", "")
+    # Word文書生成を行うプロセス数（空の場合は利用可能なコア数、0の場合はスレッドで実行）
+    CPU_POOL_WORKERS = os.getenv("CPU_POOL_WORKERS", "")
+    # 待機中・実行中の生成の上限（超えた場合は503を返す）
+    CPU_POOL_MAX_PENDING = int(os.getenv("CPU_POOL_MAX_PENDING", "32"))
+    # 1件の生成を待つ上限（秒、超えた場合は504を返す）
+    CPU_POOL_TIMEOUT = float(os.getenv("CPU_POOL_TIMEOUT", "60"))
+    # 起動時にワーカープロセスを立ち上げてテンプレートを読み込んでおく
+    CPU_POOL_WARMUP = os.getenv("CPU_POOL_WARMUP", "False") == "True"
+    
+    # 議事録の一括エクスポート（ZIP）の最大件数と同時に生成する件数
+    EXPORT_MAX_ITEMS = int(os.getenv("EXPORT_MAX_ITEMS", "200"))
+    EXPORT_CONCURRENCY = int(os.getenv("EXPORT_CONCURRENCY", "4"))
+    
+    # 質問読み上げ（TTS）のモデル・音声と、合成済み音声のキャッシュ
+    TTS_MODEL = os.getenv("TTS_MODEL", "gemini-2.5-flash-preview-tts")
+    TTS_VOICE = os.getenv("TTS_VOICE", "Kore")
+    # 保存先（空の場合は OUTPUTS_DIR/tts）とメモリ上に保持する合計サイズ（バイト）
+    TTS_CACHE_DIR = os.getenv("TTS_CACHE_DIR", "")
+    TTS_CACHE_MAX_BYTES = int(os.getenv("TTS_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+    # 全インタビュータイプの質問音声を事前に合成する（0で無効、以降は指定秒ごとに設定変更を確認）
+    TTS_PRECOMPUTE_INTERVAL = float(os.getenv("TTS_PRECOMPUTE_INTERVAL", "0"))
+    
+    # 議事録の map-reduce 整形（推定トークン数がしきい値を超えた場合）
+    MINUTES_MAP_REDUCE_TOKENS = int(os.getenv("MINUTES_MAP_REDUCE_TOKENS", "6000"))
+    MINUTES_CHUNK_TOKENS = int(os.getenv("MINUTES_CHUNK_TOKENS", "2000"))
+    MINUTES_MAP_CONCURRENCY = int(os.getenv("MINUTES_MAP_CONCURRENCY", "4"))
+    
+    # 議事録の指示文（summary_prompt）をGeminiのコンテキストキャッシュに登録
+    # （キャッシュの保持は課金対象のため、明示的に有効にした場合のみ）
+    GEMINI_CONTEXT_CACHE = os.getenv("GEMINI_CONTEXT_CACHE", "False") == "True"
+    GEMINI_CONTEXT_CACHE_TTL = int(os.getenv("GEMINI_CONTEXT_CACHE_TTL", "3600"))
+    # これより短い指示文は登録しない（モデルの最小キャッシュサイズ）
+    GEMINI_CONTEXT_CACHE_MIN_TOKENS = int(os.getenv("GEMINI_CONTEXT_CACHE_MIN_TOKENS", "1024"))
+    
+    # 議事録生成ジョブ（非同期モード）
+    DOCX_JOB_WORKERS = int(os.getenv("DOCX_JOB_WORKERS", "2"))
+    DOCX_JOB_MAX_PENDING = int(os.getenv("DOCX_JOB_MAX_PENDING", "20"))
+    DOCX_JOB_TTL_SECONDS = int(os.getenv("DOCX_JOB_TTL_SECONDS", "600"))
+    
     # ファイルパス
     BASE_DIR = Path(__file__).parent.parent
     OUTPUTS_DIR = BASE_DIR / "outputs"
     CONFIG_JSON = BASE_DIR / "config.json"
+    # config_*.json の更新確認間隔（秒）
+    CONFIG_RELOAD_INTERVAL = float(os.getenv("CONFIG_RELOAD_INTERVAL", "2.0"))
+    # 画面（HTML）・静的ファイルの更新確認間隔（秒）
+    PAGE_RELOAD_INTERVAL = float(os.getenv("PAGE_RELOAD_INTERVAL", "2.0"))
+    # 質問一覧APIのブラウザキャッシュ保持秒数（以降はETagで再検証）
+    QUESTIONS_CACHE_MAX_AGE = int(os.getenv("QUESTIONS_CACHE_MAX_AGE", "60"))
     
-    # 出力ディレクトリの作成
-    OUTPUTS_DIR.mkdir(exist_ok=True)
+    @classmethod
+    def outputs_dir(cls) -> Path:
+        """出力ディレクトリ（初回利用時に作成）"""
+        cls.OUTPUTS_DIR.mkdir(exist_ok=True)
+        return cls.OUTPUTS_DIR
     
     @classmethod
     def load_questions(cls):
@@ -0,0 +1,236 @@
+"""
+インタビュー設定（config_*.json）のレジストリ
+"""
+import hashlib
+import json
+import os
+import re
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+from app import metrics
+from app.domain.question_flow import QuestionFlow
+
+# インタビュータイプとして許可する文字列（パス操作を防ぐ）
+_TYPE_PATTERN = re.compile(r"^\w+$")
+
+# 要約用プロンプトから除去する固定項目（質問でない項目）
+FIXED_SECTIONS = ['会社メールアドレス', '訪問日時', '開催場所']
+_FIXED_SECTION_PATTERNS = [
+    re.compile(r"【" + re.escape(t) + r"】[\s\S]*?(（記載なし）|$)")
+    for t in FIXED_SECTIONS
+]
+_BLANK_LINES_PATTERN = re.compile(r"\n{2,}")
+
+
+class InterviewConfigError(ValueError):
+    """設定ファイルの読み込み・検証エラー"""
+
+
+@dataclass
+class InterviewConfig:
+    """インタビュータイプごとの設定データクラス"""
+    interview_type: str
+    path: Path
+    mtime: float
+    summary_prompt: str
+    question_flow: QuestionFlow
+    # /api/{type}/questions 用に事前生成したレスポンス本文とETag
+    questions_body: bytes = b""
+    etag: str = ""
+    # 固定項目を除去済みの要約用プロンプト（議事録の指示文）
+    instructions: str = ""
+
+    @property
+    def total_questions(self) -> int:
+        """質問数"""
+        return len(self.question_flow.questions)
+
+
+def remove_fixed_sections(text: str) -> str:
+    """不要な固定項目（質問でない項目）をプロンプトから除去する"""
+    for pattern in _FIXED_SECTION_PATTERNS:
+        text = pattern.sub('', text)
+    return _BLANK_LINES_PATTERN.sub("\n\n", text).strip()
+
+
+def _build_questions_body(interview_type: str, flow: QuestionFlow) -> bytes:
+    """質問一覧とカテゴリー別グループのJSON本文を生成"""
+    total = len(flow.questions)
+    categories: Dict[str, List[int]] = {}
+    for q in flow.questions:
+        categories.setdefault(q.category, []).append(q.id)
+    payload = {
+        "interview_type": interview_type,
+        "total_questions": total,
+        "questions": [
+            {
+                "id": q.id,
+                "text": q.text,
+                "category": q.category,
+                "is_last": q.id >= total
+            }
+            for q in flow.questions
+        ],
+        "categories": [
+            {"category": category, "question_ids": ids}
+            for category, ids in categories.items()
+        ]
+    }
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _validate(data, path: Path) -> None:
+    """設定内容の検証（不正な場合は InterviewConfigError）"""
+    if not isinstance(data, dict):
+        raise InterviewConfigError(f"{path.name}: top-level value must be an object")
+    questions = data.get("questions", [])
+    if not isinstance(questions, list):
+        raise InterviewConfigError(f"{path.name}: 'questions' must be a list")
+    seen = set()
+    for i, q in enumerate(questions):
+        if not isinstance(q, dict):
+            raise InterviewConfigError(f"{path.name}: questions[{i}] must be an object")
+        if not isinstance(q.get("id"), int):
+            raise InterviewConfigError(f"{path.name}: questions[{i}].id must be an integer")
+        for key in ("text", "category"):
+            if not isinstance(q.get(key), str):
+                raise InterviewConfigError(f"{path.name}: questions[{i}].{key} must be a string")
+        if q["id"] in seen:
+            raise InterviewConfigError(f"{path.name}: duplicate question id {q['id']}")
+        seen.add(q["id"])
+    if not isinstance(data.get("summary_prompt", ""), str):
+        raise InterviewConfigError(f"{path.name}: 'summary_prompt' must be a string")
+
+
+def load_interview_config(interview_type: str, path: Path) -> InterviewConfig:
+    """
+    設定ファイルを読み込んで検証
+
+    Args:
+        interview_type: インタビュータイプ
+        path: 設定ファイルのパス
+
+    Returns:
+        設定オブジェクト
+    """
+    mtime = path.stat().st_mtime
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except json.JSONDecodeError as e:
+        raise InterviewConfigError(f"{path.name}: invalid JSON ({e})") from e
+    _validate(data, path)
+    flow = QuestionFlow(data.get("questions", []))
+    body = _build_questions_body(interview_type, flow)
+    summary_prompt = data.get("summary_prompt", "")
+    with metrics.timed("sanitize"):
+        instructions = remove_fixed_sections(summary_prompt)
+    return InterviewConfig(
+        interview_type=interview_type,
+        path=path,
+        mtime=mtime,
+        summary_prompt=summary_prompt,
+        question_flow=flow,
+        questions_body=body,
+        etag='"' + hashlib.sha256(body).hexdigest()[:32] + '"',
+        instructions=instructions
+    )
+
+
+class InterviewConfigRegistry:
+    """
+    全インタビュータイプの設定をメモリ上に保持するレジストリ
+
+    設定ファイルは起動時に一度だけ読み込み、以降は更新時刻（mtime）が
+    変わったファイルのみ再読み込みする。mtimeの確認は check_interval 秒に
+    一回までに抑えるため、通常の質問取得ではディスクI/Oが発生しない。
+    """
+
+    def __init__(self, config_dir: Path, check_interval: float = 2.0):
+        """
+        Args:
+            config_dir: config_*.json を置くディレクトリ
+            check_interval: 更新確認の最小間隔（秒）
+        """
+        self.config_dir = Path(config_dir)
+        self.check_interval = check_interval
+        self._configs: Dict[str, InterviewConfig] = {}
+        self._errors: Dict[str, str] = {}
+        self._checked_at: Dict[str, float] = {}
+
+    @property
+    def errors(self) -> Dict[str, str]:
+        """読み込みに失敗したタイプとエラー内容"""
+        return dict(self._errors)
+
+    def interview_types(self) -> List[str]:
+        """読み込み済みのインタビュータイプ一覧"""
+        return sorted(self._configs)
+
+    def _path_for(self, interview_type: str) -> Path:
+        return self.config_dir / f"config_{interview_type}.json"
+
+    def load_all(self) -> Dict[str, str]:
+        """
+        config_*.json をすべて読み込む
+
+        Returns:
+            読み込みに失敗したタイプとエラー内容
+        """
+        for path in sorted(self.config_dir.glob("config_*.json")):
+            interview_type = path.stem[len("config_"):]
+            if _TYPE_PATTERN.match(interview_type):
+                self._load(interview_type, path)
+        return self.errors
+
+    def _load(self, interview_type: str, path: Path) -> None:
+        self._checked_at[interview_type] = time.monotonic()
+        try:
+            self._configs[interview_type] = load_interview_config(interview_type, path)
+            self._errors.pop(interview_type, None)
+        except (OSError, InterviewConfigError) as e:
+            self._configs.pop(interview_type, None)
+            self._errors[interview_type] = str(e)
+
+    def _refresh(self, interview_type: str) -> None:
+        """必要に応じて設定ファイルを再読み込み"""
+        now = time.monotonic()
+        checked_at = self._checked_at.get(interview_type)
+        if checked_at is not None and now - checked_at < self.check_interval:
+            return
+        self._checked_at[interview_type] = now
+
+        path = self._path_for(interview_type)
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            self._configs.pop(interview_type, None)
+            self._errors.pop(interview_type, None)
+            return
+
+        current = self._configs.get(interview_type)
+        if current is None or current.mtime != mtime:
+            self._load(interview_type, path)
+
+    def get(self, interview_type: str) -> Optional[InterviewConfig]:
+        """
+        インタビュータイプの設定を取得
+
+        Args:
+            interview_type: インタビュータイプ
+
+        Returns:
+            設定オブジェクト（存在しない場合はNone）
+
+        Raises:
+            InterviewConfigError: 設定ファイルが不正な場合
+        """
+        if not _TYPE_PATTERN.match(interview_type):
+            return None
+        self._refresh(interview_type)
+        config = self._configs.get(interview_type)
+        if config is None and interview_type in self._errors:
+            raise InterviewConfigError(self._errors[interview_type])
+        return config
@@ -27,6 +27,9 @@ class QuestionFlow:
             )
             for q in questions
         ]
+        # ID → 質問・並び順のインデックス
+        self._by_id = {q.id: q for q in self.questions}
+        self._position = {q.id: i for i, q in enumerate(self.questions)}
     
     def get_question(self, question_id: int) -> Optional[Question]:
         """
@@ -38,10 +41,7 @@ class QuestionFlow:
         Returns:
             質問オブジェクト
         """
-        for q in self.questions:
-            if q.id == question_id:
-                return q
-        return None
+        return self._by_id.get(question_id)
     
     def get_next_question(self, current_id: int) -> Optional[Question]:
         """
@@ -53,9 +53,9 @@ class QuestionFlow:
         Returns:
             次の質問オブジェクト（最後の場合はNone）
         """
-        for i, q in enumerate(self.questions):
-            if q.id == current_id and i < len(self.questions) - 1:
-                return self.questions[i + 1]
+        i = self._position.get(current_id)
+        if i is not None and i < len(self.questions) - 1:
+            return self.questions[i + 1]
         return None
     
     def is_last_question(self, question_id: int) -> bool:
@@ -0,0 +1,225 @@
+"""
+インタビューセッションの管理
+"""
+import secrets
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable, List, Optional
+from app.domain.question_flow import QuestionFlow
+from app.domain.summary import InterviewSummary, Summary
+from app.domain.transcript import Transcript
+
+if TYPE_CHECKING:
+    from app.services.interview_store import InterviewStore
+
+# セッション1件あたりの固定オーバーヘッド（バイト、概算）
+_SESSION_OVERHEAD = 512
+
+
+def _summary_size(summary: Summary) -> int:
+    """要約1件のメモリ使用量（概算）"""
+    return (
+        len(summary.question_text.encode("utf-8"))
+        + len(summary.summary_text.encode("utf-8"))
+        + len(summary.category.encode("utf-8"))
+        + 128
+    )
+
+
+@dataclass
+class InterviewSession:
+    """インタビューセッションデータクラス"""
+    session_id: str
+    interview_type: str
+    question_flow: QuestionFlow
+    summary: InterviewSummary = field(default_factory=InterviewSummary)
+    created_at: float = field(default_factory=time.monotonic)
+    last_access: float = field(default_factory=time.monotonic)
+    size_bytes: int = _SESSION_OVERHEAD
+    # 永続化先での最終更新時刻（他のワーカーでの更新の検出に使う）
+    stored_at: float = 0.0
+
+
+class SessionStore:
+    """
+    セッションIDごとのインタビュー状態を保持するストア
+
+    最終アクセス順（LRU）で並べ、TTLを過ぎたセッション、または
+    セッション数・合計サイズの上限を超えた分を古い順に破棄する。
+
+    store を指定した場合はメモリ上のセッションをキャッシュとして使い、
+    状態は永続化先に書き込む。別のワーカープロセスで作成・更新されたセッションや
+    再起動前のセッションも永続化先から読み込んで再開できる。
+    """
+
+    def __init__(self, ttl_seconds: float, max_sessions: int, max_bytes: int,
+                 store: Optional["InterviewStore"] = None,
+                 resolve_flow: Optional[Callable[[str], Optional[QuestionFlow]]] = None):
+        """
+        Args:
+            ttl_seconds: 最終アクセスからセッションを保持する秒数
+            max_sessions: 保持するセッション数の上限
+            max_bytes: 全セッションの合計サイズ上限（バイト、概算）
+            store: 永続化先（Noneの場合はメモリのみ）
+            resolve_flow: インタビュータイプから質問フローを取得する関数
+                （永続化先から読み込んだセッションに使う）
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self.store = store
+        self.resolve_flow = resolve_flow
+        self._sessions: "OrderedDict[str, InterviewSession]" = OrderedDict()
+        self._total_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    @property
+    def total_bytes(self) -> int:
+        """全セッションの合計サイズ（バイト、概算）"""
+        return self._total_bytes
+
+    async def create(self, interview_type: str, question_flow: QuestionFlow) -> InterviewSession:
+        """
+        新しいセッションを作成
+
+        Args:
+            interview_type: インタビュータイプ
+            question_flow: タイプに対応する質問フロー
+
+        Returns:
+            作成したセッション
+        """
+        session = InterviewSession(
+            session_id=secrets.token_urlsafe(16),
+            interview_type=interview_type,
+            question_flow=question_flow
+        )
+        if self.store is not None:
+            session.stored_at = await self.store.create_session(session.session_id, interview_type)
+        self._sessions[session.session_id] = session
+        self._total_bytes += session.size_bytes
+        self._evict()
+        return session
+
+    async def get(self, session_id: str) -> Optional[InterviewSession]:
+        """
+        セッションを取得（期限切れの場合はNone）
+
+        Args:
+            session_id: セッションID
+
+        Returns:
+            セッション
+        """
+        self._evict()
+        session = self._sessions.get(session_id)
+        if self.store is not None:
+            session = await self._sync_from_store(session_id, session)
+        if session is not None:
+            session.last_access = time.monotonic()
+            self._sessions.move_to_end(session_id)
+        return session
+
+    async def _sync_from_store(self, session_id: str,
+                               cached: Optional[InterviewSession]) -> Optional[InterviewSession]:
+        """メモリ上のセッションが永続化先より古ければ読み込み直す"""
+        if cached is not None:
+            updated_at = await self.store.session_updated_at(session_id)
+            if updated_at is None:
+                self.remove(session_id)
+                return None
+            if updated_at <= cached.stored_at:
+                return cached
+
+        stored = await self.store.get_session(session_id)
+        if stored is None:
+            self.remove(session_id)
+            return None
+        question_flow = self.resolve_flow(stored.interview_type) if self.resolve_flow else None
+        if question_flow is None:
+            return None
+
+        self.remove(session_id)
+        session = InterviewSession(
+            session_id=session_id,
+            interview_type=stored.interview_type,
+            question_flow=question_flow,
+            stored_at=stored.updated_at
+        )
+        for summary in stored.summaries:
+            session.summary.add_summary(summary)
+            session.size_bytes += _summary_size(summary)
+        self._sessions[session_id] = session
+        self._total_bytes += session.size_bytes
+        self._evict()
+        return session
+
+    async def add_summary(self, session: InterviewSession, summary: Summary,
+                          transcript: Optional[Transcript] = None):
+        """
+        セッションに要約を追加し、サイズ上限を適用
+
+        Args:
+            session: セッション
+            summary: 要約
+            transcript: 要約元の文字起こし（永続化先にのみ保存）
+        """
+        if self.store is not None:
+            session.stored_at = await self.store.save_answer(session.session_id, summary, transcript)
+        previous = session.summary.get_summary(summary.question_id)
+        delta = _summary_size(summary) - (_summary_size(previous) if previous else 0)
+        session.summary.add_summary(summary)
+        if session.session_id in self._sessions:
+            session.size_bytes += delta
+            self._total_bytes += delta
+        self._evict()
+
+    async def save_minutes(self, session: InterviewSession, content: str):
+        """
+        セッションの整形済み議事録を永続化先に保存（メモリのみの場合は何もしない）
+
+        Args:
+            session: セッション
+            content: 整形済みの議事録テキスト
+        """
+        if self.store is not None:
+            session.stored_at = await self.store.save_minutes(
+                session.session_id, session.interview_type, content
+            )
+
+    async def get_transcripts(self, session: InterviewSession) -> List[Transcript]:
+        """
+        セッションの文字起こしを質問ID順に取得（メモリのみの場合は空）
+
+        Args:
+            session: セッション
+
+        Returns:
+            文字起こしのリスト
+        """
+        if self.store is None:
+            return []
+        return await self.store.get_transcripts(session.session_id)
+
+    def remove(self, session_id: str):
+        """セッションを削除"""
+        session = self._sessions.pop(session_id, None)
+        if session is not None:
+            self._total_bytes -= session.size_bytes
+
+    def _evict(self):
+        """期限切れ・上限超過のセッションを古い順に破棄"""
+        now = time.monotonic()
+        while self._sessions:
+            session_id, oldest = next(iter(self._sessions.items()))
+            expired = now - oldest.last_access > self.ttl_seconds
+            over_limit = (
+                len(self._sessions) > self.max_sessions
+                or self._total_bytes > self.max_bytes
+            )
+            if not (expired or over_limit):
+                break
+            self.remove(session_id)
@@ -0,0 +1,221 @@
+"""
+アプリケーションメトリクス（Prometheus テキスト形式で出力）
+"""
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Tuple
+
+_registry: List = []
+_registry_lock = threading.Lock()
+
+# ヒストグラムの既定のバケット（秒）
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+
+class Counter:
+    """ラベル付きカウンター"""
+
+    def __init__(self, name: str, description: str, labelnames: Tuple[str, ...] = ()):
+        """
+        Args:
+            name: メトリクス名
+            description: 説明（# HELP に出力）
+            labelnames: ラベル名
+        """
+        self.name = name
+        self.description = description
+        self.labelnames = labelnames
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels: str):
+        """カウンターを増やす"""
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        """現在の値"""
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        return self._values.get(key, 0)
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} counter",
+        ]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {value:g}")
+        return lines
+
+
+class Gauge(Counter):
+    """増減するラベル付きの値"""
+
+    def dec(self, amount: float = 1, **labels: str):
+        """値を減らす"""
+        self.inc(-amount, **labels)
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        lines[1] = f"# TYPE {self.name} gauge"
+        return lines
+
+
+class Histogram:
+    """ラベル付きヒストグラム（累積バケット・合計・件数）"""
+
+    def __init__(self, name: str, description: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        """
+        Args:
+            name: メトリクス名
+            description: 説明（# HELP に出力）
+            labelnames: ラベル名
+            buckets: バケットの上限値（昇順）
+        """
+        self.name = name
+        self.description = description
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets)
+        # ラベル値 -> (バケットごとの件数, 合計, 件数)
+        self._values: Dict[Tuple[str, ...], Tuple[List[int], float, int]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str):
+        """値を記録"""
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total, count = self._values.get(key) or ([0] * len(self.buckets), 0.0, 0)
+            if index < len(counts):
+                counts[index] += 1
+            self._values[key] = (counts, total + value, count + 1)
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} histogram",
+        ]
+        with self._lock:
+            items = sorted((k, (list(c), t, n)) for k, (c, t, n) in self._values.items())
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.labelnames + ("le",), key + (f"{bound:g}",))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames + ("le",), key + ("+Inf",))
+            lines.append(f"{self.name}_bucket{labels} {count}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {total:g}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape(value)}"' for name, value in zip(names, values)
+    )
+    return "{" + pairs + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def counter(name: str, description: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+    """
+    カウンターを作成して登録
+
+    Args:
+        name: メトリクス名
+        description: 説明
+        labelnames: ラベル名
+
+    Returns:
+        カウンター
+    """
+    metric = Counter(name, description, labelnames)
+    with _registry_lock:
+        _registry.append(metric)
+    return metric
+
+
+def gauge(name: str, description: str, labelnames: Tuple[str, ...] = ()) -> Gauge:
+    """ゲージを作成して登録"""
+    metric = Gauge(name, description, labelnames)
+    with _registry_lock:
+        _registry.append(metric)
+    return metric
+
+
+def histogram(name: str, description: str, labelnames: Tuple[str, ...] = (),
+              buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+    """ヒストグラムを作成して登録"""
+    metric = Histogram(name, description, labelnames, buckets)
+    with _registry_lock:
+        _registry.append(metric)
+    return metric
+
+
+stage_duration = histogram(
+    "app_stage_duration_seconds",
+    "Time spent in each processing stage",
+    ("stage",)
+)
+
+# リクエストごとの処理段階別の所要時間（秒）。リクエストログに出力する
+_request_stages: ContextVar[Optional[Dict[str, float]]] = ContextVar("request_stages", default=None)
+
+
+def start_request_stages() -> Tuple[Dict[str, float], object]:
+    """現在のリクエストの段階別時間の記録を開始（戻り値のトークンで終了する）"""
+    stages: Dict[str, float] = {}
+    return stages, _request_stages.set(stages)
+
+
+def end_request_stages(token):
+    """段階別時間の記録を終了"""
+    _request_stages.reset(token)
+
+
+def record_stage(stage: str, seconds: float):
+    """
+    処理段階の所要時間を記録
+
+    Args:
+        stage: 段階名（upload_read / stt / summarize など）
+        seconds: 所要時間（秒）
+    """
+    stage_duration.observe(seconds, stage=stage)
+    stages = _request_stages.get()
+    if stages is not None:
+        stages[stage] = stages.get(stage, 0) + seconds
+
+
+@contextmanager
+def timed(stage: str) -> Iterator[None]:
+    """with ブロックの所要時間を処理段階として記録"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(stage, time.perf_counter() - started)
+
+
+def render() -> str:
+    """登録済みの全メトリクスを Prometheus テキスト形式で出力"""
+    with _registry_lock:
+        metrics = list(_registry)
+    lines = []
+    for metric in metrics:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
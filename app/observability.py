@@ -0,0 +1,106 @@
+"""
+リクエスト計測ミドルウェアと構造化ログ（JSON）
+"""
+import json
+import sys
+import time
+from datetime import datetime, timezone
+from app import metrics
+
+http_requests = metrics.counter(
+    "http_requests_total",
+    "HTTP requests by method, route and status",
+    ("method", "route", "status")
+)
+http_request_duration = metrics.histogram(
+    "http_request_duration_seconds",
+    "HTTP request duration until the response body is sent",
+    ("method", "route")
+)
+http_in_flight = metrics.gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being handled"
+)
+
+
+def log_event(event: str, **fields):
+    """
+    1行のJSONとしてログを出力
+
+    Args:
+        event: イベント名
+        **fields: 出力する項目
+    """
+    record = {
+        "ts": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+        "event": event,
+        **fields
+    }
+    sys.stdout.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+    sys.stdout.flush()
+
+
+class RequestMetricsMiddleware:
+    """
+    リクエストごとの所要時間・段階別時間・同時処理数を記録するASGIミドルウェア
+
+    レスポンス本文の送信時間（response_send）はヘッダー送信から本文の送信完了まで。
+    ストリーミングレスポンスでは生成中の時間も含まれる。
+    """
+
+    def __init__(self, app, access_log: bool = True, skip_paths=("/metrics",)):
+        """
+        Args:
+            app: ASGIアプリケーション
+            access_log: リクエストごとにJSONログを出力する
+            skip_paths: ログを出力しないパス
+        """
+        self.app = app
+        self.access_log = access_log
+        self.skip_paths = set(skip_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        response_started = None
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal response_started, status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                response_started = time.perf_counter()
+            await send(message)
+
+        stages, token = metrics.start_request_stages()
+        http_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            finished = time.perf_counter()
+            http_in_flight.dec()
+            metrics.end_request_stages(token)
+            if response_started is not None:
+                metrics.record_stage("response_send", finished - response_started)
+                stages["response_send"] = finished - response_started
+
+            # ラベルの種類が増えないよう、実際のパスではなくルートのパターンを使う
+            route = scope.get("route")
+            route_path = getattr(route, "path", "unmatched")
+            method = scope["method"]
+            http_requests.inc(method=method, route=route_path, status=str(status))
+            http_request_duration.observe(finished - started, method=method, route=route_path)
+
+            if self.access_log and scope["path"] not in self.skip_paths:
+                log_event(
+                    "request",
+                    method=method,
+                    path=scope["path"],
+                    route=route_path,
+                    status=status,
+                    duration_ms=round((finished - started) * 1000, 1),
+                    stages_ms={k: round(v * 1000, 1) for k, v in stages.items()}
+                )
@@ -0,0 +1,198 @@
+"""
+アップロード音声の取り込み（サイズ上限・一時ファイルへの退避）
+"""
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+from fastapi import UploadFile
+
+# 1回に読み込むサイズ（バイト）
+_READ_SIZE = 64 * 1024
+
+
+class AudioTooLargeError(ValueError):
+    """音声データがサイズ上限を超えている"""
+
+
+@dataclass
+class AudioInput:
+    """
+    取り込み済みの音声データクラス
+
+    しきい値以下の音声はメモリ上（data）に、超える音声は一時ファイル（path）に保持する。
+    """
+    mime_type: str
+    size: int
+    digest: str
+    data: Optional[bytes] = None
+    path: Optional[Path] = None
+
+    def cleanup(self):
+        """一時ファイルを削除"""
+        if self.path is not None:
+            self.path.unlink(missing_ok=True)
+            self.path = None
+
+
+def audio_from_bytes(audio_data: bytes, mime_type: str) -> AudioInput:
+    """
+    メモリ上の音声データから AudioInput を作成
+
+    Args:
+        audio_data: 音声データ
+        mime_type: MIMEタイプ
+
+    Returns:
+        音声データ
+    """
+    return AudioInput(
+        mime_type=mime_type,
+        size=len(audio_data),
+        digest=hashlib.sha256(audio_data).hexdigest(),
+        data=audio_data
+    )
+
+
+async def ingest_upload(file: UploadFile, mime_type: str, max_bytes: int,
+                        memory_threshold: int) -> AudioInput:
+    """
+    アップロード音声を少しずつ読み込み、サイズ上限を確認しながら取り込む
+
+    memory_threshold を超えた時点で一時ファイルに切り替えるため、
+    1リクエストあたりのメモリ使用量は音声の長さによらず一定に抑えられる。
+
+    Args:
+        file: アップロードファイル
+        mime_type: MIMEタイプ
+        max_bytes: 受け付ける最大サイズ（バイト）
+        memory_threshold: メモリ上に保持する最大サイズ（バイト）
+
+    Returns:
+        音声データ
+
+    Raises:
+        AudioTooLargeError: max_bytes を超えた場合
+    """
+    digest = hashlib.sha256()
+    buffer = bytearray()
+    spool = None
+    size = 0
+    try:
+        while True:
+            chunk = await file.read(_READ_SIZE)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > max_bytes:
+                raise AudioTooLargeError(f"Audio exceeds {max_bytes} bytes")
+            digest.update(chunk)
+            if spool is None and size > memory_threshold:
+                # しきい値を超えたら一時ファイルに退避
+                spool = tempfile.NamedTemporaryFile(prefix="audio_", delete=False)
+                spool.write(buffer)
+                buffer = bytearray()
+            if spool is not None:
+                spool.write(chunk)
+            else:
+                buffer.extend(chunk)
+    except BaseException:
+        if spool is not None:
+            spool.close()
+            os.unlink(spool.name)
+        raise
+
+    if spool is not None:
+        spool.close()
+        return AudioInput(
+            mime_type=mime_type,
+            size=size,
+            digest=digest.hexdigest(),
+            path=Path(spool.name)
+        )
+    return AudioInput(
+        mime_type=mime_type,
+        size=size,
+        digest=digest.hexdigest(),
+        data=bytes(buffer)
+    )
+
+
+class UploadLimitMiddleware:
+    """
+    音声アップロードのサイズ上限を本文の受信中に適用するASGIミドルウェア
+
+    path_prefix で始まるパスだけを対象にする。Content-Length が上限を超える場合は
+    本文を読まずに413を返し、Content-Length のない（chunked）アップロードは
+    受信したバイト数を数えて、上限を超えた時点で受信を打ち切って413を返す。
+    """
+
+    def __init__(self, app, path_prefix: str, max_bytes: int):
+        """
+        Args:
+            app: ASGIアプリケーション
+            path_prefix: 対象のパス（前方一致）
+            max_bytes: 受け付けるリクエスト本文の最大サイズ（バイト）
+        """
+        self.app = app
+        self.path_prefix = path_prefix
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith(self.path_prefix):
+            await self.app(scope, receive, send)
+            return
+
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                if value.isdigit() and int(value) > self.max_bytes:
+                    await self._reject(send)
+                    return
+                break
+
+        received = 0
+        too_large = False
+        response_started = False
+
+        async def receive_wrapper():
+            nonlocal received, too_large
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    too_large = True
+                    raise AudioTooLargeError(f"Upload exceeds {self.max_bytes} bytes")
+            return message
+
+        async def send_wrapper(message):
+            nonlocal response_started
+            # 上限を超えた後にアプリが返すエラー（本文の解析失敗など）は413に置き換える
+            if too_large:
+                return
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        except Exception:
+            if not too_large:
+                raise
+        if too_large and not response_started:
+            await self._reject(send)
+
+    async def _reject(self, send):
+        body = json.dumps({"error": f"Upload exceeds {self.max_bytes} bytes"}).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("ascii")),
+                (b"connection", b"close"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,219 @@
+"""
+分割アップロードされた音声の逐次文字起こし
+"""
+import asyncio
+import secrets
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, List, Optional
+from app.services.audio_ingest import AudioInput
+
+if TYPE_CHECKING:
+    from app.services.stt_service import STTService
+
+# セグメント境界の重複とみなす最小・最大文字数
+_MIN_OVERLAP = 4
+_MAX_OVERLAP = 60
+
+
+class ChunkedUploadError(ValueError):
+    """分割アップロードの不正な操作"""
+
+
+def stitch_transcripts(parts: List[str], overlapped: Optional[List[bool]] = None) -> str:
+    """
+    セグメントごとの文字起こしを連結し、境界で重複した文字列を取り除く
+
+    前のセグメントの末尾と重ねて録音されたセグメントだけ、前の末尾と
+    先頭が一致する最長部分（_MIN_OVERLAP 文字以上）を重複とみなして1回分にする。
+    重ねずに録音されたセグメントはそのまま連結する（同じ言葉の繰り返しを消さない）。
+
+    Args:
+        parts: セグメント順の文字起こしリスト
+        overlapped: セグメントごとに、前のセグメントと重ねて録音したかどうか
+            （省略時はすべて重ねていないものとする）
+
+    Returns:
+        連結した文字起こし
+    """
+    result = ""
+    for index, part in enumerate(parts):
+        part = part.strip()
+        if not part:
+            continue
+        if not result:
+            result = part
+            continue
+        if not (overlapped and overlapped[index]):
+            result += part
+            continue
+        overlap = 0
+        limit = min(len(result), len(part), _MAX_OVERLAP)
+        for k in range(limit, _MIN_OVERLAP - 1, -1):
+            if result.endswith(part[:k]):
+                overlap = k
+                break
+        result += part[overlap:]
+    return result
+
+
+@dataclass
+class ChunkedUpload:
+    """分割アップロード1件分の状態"""
+    upload_id: str
+    mime_type: str
+    segments: Dict[int, asyncio.Task] = field(default_factory=dict)
+    # 前のセグメントと重ねて録音した長さ（ミリ秒、連番ごと）
+    overlaps: Dict[int, int] = field(default_factory=dict)
+    last_access: float = field(default_factory=time.monotonic)
+
+    def cancel(self):
+        """未完了の文字起こしを中止"""
+        for task in self.segments.values():
+            task.cancel()
+
+
+class ChunkedTranscriber:
+    """
+    録音中に届いた音声セグメントをバックグラウンドで文字起こしし、
+    録音終了時に連結して返す
+
+    各セグメントは単体で再生可能な音声（録音をN秒ごとに区切ったもの）を想定する。
+    TTLを過ぎた、またはアップロード数の上限を超えたアップロードは古い順に破棄する。
+    """
+
+    def __init__(self, stt_service: "STTService", ttl_seconds: float,
+                 max_uploads: int, max_segments: int):
+        """
+        Args:
+            stt_service: 音声認識サービス
+            ttl_seconds: 最終アクセスからアップロードを保持する秒数
+            max_uploads: 同時に保持するアップロード数の上限
+            max_segments: 1アップロードあたりのセグメント数の上限
+        """
+        self.stt_service = stt_service
+        self.ttl_seconds = ttl_seconds
+        self.max_uploads = max_uploads
+        self.max_segments = max_segments
+        self._uploads: "OrderedDict[str, ChunkedUpload]" = OrderedDict()
+
+    def start(self, mime_type: str) -> ChunkedUpload:
+        """
+        分割アップロードを開始
+
+        Args:
+            mime_type: セグメントのMIMEタイプ
+
+        Returns:
+            アップロード
+        """
+        upload = ChunkedUpload(upload_id=secrets.token_urlsafe(16), mime_type=mime_type)
+        self._uploads[upload.upload_id] = upload
+        self._evict()
+        return upload
+
+    def get(self, upload_id: str) -> Optional[ChunkedUpload]:
+        """
+        アップロードを取得（期限切れの場合はNone）
+
+        Args:
+            upload_id: アップロードID
+
+        Returns:
+            アップロード
+        """
+        self._evict()
+        upload = self._uploads.get(upload_id)
+        if upload is not None:
+            upload.last_access = time.monotonic()
+            self._uploads.move_to_end(upload_id)
+        return upload
+
+    def add_segment(self, upload: ChunkedUpload, seq: int, audio: AudioInput,
+                    overlap_ms: int = 0):
+        """
+        セグメントを受け取り、バックグラウンドで文字起こしを開始
+
+        同じ連番の再送は無視する（クライアントのリトライに対して冪等）。
+
+        Args:
+            upload: アップロード
+            seq: セグメントの連番（0始まり）
+            audio: セグメントの音声データ（文字起こし後に一時ファイルを削除する）
+            overlap_ms: 前のセグメントの末尾と重ねて録音した長さ（ミリ秒、0は重ねていない）
+        """
+        if seq < 0 or seq >= self.max_segments:
+            audio.cleanup()
+            raise ChunkedUploadError(f"seq must be between 0 and {self.max_segments - 1}")
+        if seq in upload.segments:
+            audio.cleanup()
+            return
+        upload.segments[seq] = asyncio.create_task(self._transcribe_segment(audio))
+        upload.overlaps[seq] = max(0, overlap_ms)
+
+    async def _transcribe_segment(self, audio: AudioInput) -> str:
+        try:
+            return await self.stt_service.transcribe_input(audio)
+        finally:
+            audio.cleanup()
+
+    def discard(self, upload_id: str):
+        """
+        アップロードを破棄（未完了の文字起こしも中止）
+
+        Args:
+            upload_id: アップロードID
+        """
+        upload = self._uploads.pop(upload_id, None)
+        if upload is not None:
+            upload.cancel()
+
+    async def finish(self, upload_id: str, total_segments: Optional[int] = None) -> str:
+        """
+        全セグメントの文字起こしを待って連結
+
+        セグメントが足りない場合はアップロードを残したままエラーにする
+        （送信中だったセグメントが届いてから、もう一度 finish を呼べる）。
+
+        Args:
+            upload_id: アップロードID
+            total_segments: クライアントが送信したセグメント数（省略時は受信済みの数）
+
+        Returns:
+            連結した文字起こし
+
+        Raises:
+            ChunkedUploadError: アップロードが見つからない・セグメントがない・欠落している場合
+            GeminiCallError: 文字起こしに失敗したセグメントがある場合
+        """
+        upload = self.get(upload_id)
+        if upload is None:
+            raise ChunkedUploadError("Upload not found")
+        count = len(upload.segments) if total_segments is None else total_segments
+        if count <= 0:
+            raise ChunkedUploadError("No segments received")
+        expected = set(range(count))
+        if set(upload.segments) != expected:
+            missing = sorted(expected - set(upload.segments))
+            raise ChunkedUploadError(f"Missing segments: {missing}")
+        del self._uploads[upload_id]
+        order = sorted(upload.segments)
+        try:
+            parts = await asyncio.gather(*(upload.segments[seq] for seq in order))
+        except Exception:
+            # 失敗したセグメントがあれば残りの文字起こしも止める
+            upload.cancel()
+            raise
+        return stitch_transcripts(parts, [upload.overlaps.get(seq, 0) > 0 for seq in order])
+
+    def _evict(self):
+        """期限切れ・上限超過のアップロードを古い順に破棄"""
+        now = time.monotonic()
+        while self._uploads:
+            upload_id, oldest = next(iter(self._uploads.items()))
+            expired = now - oldest.last_access > self.ttl_seconds
+            if not (expired or len(self._uploads) > self.max_uploads):
+                break
+            del self._uploads[upload_id]
+            oldest.cancel()
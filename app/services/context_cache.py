@@ -0,0 +1,115 @@
+"""
+Gemini コンテキストキャッシュ（固定のプロンプト先頭部分をモデル側に登録）
+"""
+import asyncio
+import time
+from typing import Dict, Optional, Tuple
+from app import metrics
+from app.services import gemini_call
+from app.services.result_cache import make_key
+
+# 期限切れ直前のキャッシュは使わずに作り直す（秒）
+_REFRESH_MARGIN = 60
+
+context_cache_lookups = metrics.counter(
+    "gemini_context_cache_lookups_total",
+    "Context cache lookups by outcome (hit / create / unavailable)",
+    ("result",)
+)
+
+
+class ContextCache:
+    """
+    プロンプトの固定部分（議事録の指示文など）をGeminiのコンテキストキャッシュに
+    登録し、以降の呼び出しでは可変部分だけを送れるようにする
+
+    登録は (モデル, 先頭部分) ごとに1回だけ行い、同時に要求された場合も
+    作成リクエストは1つにまとめる。作成に失敗した場合は retry_after 秒の間
+    キャッシュを使わない（呼び出し側はプロンプト全体を送る）。
+    """
+
+    def __init__(self, client, ttl_seconds: int = 3600, retry_after: float = 300):
+        """
+        Args:
+            client: Geminiクライアント
+            ttl_seconds: モデル側キャッシュの有効期間（秒）
+            retry_after: 作成失敗後に再試行するまでの時間（秒）
+        """
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.retry_after = retry_after
+        self._entries: Dict[str, Tuple[str, float]] = {}
+        self._failed: Dict[str, float] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    async def get(self, model: str, prefix: str) -> Optional[str]:
+        """
+        先頭部分を登録したキャッシュ名を取得（未登録なら作成）
+
+        Args:
+            model: モデル名（キャッシュはモデルごと）
+            prefix: プロンプトの固定部分
+
+        Returns:
+            キャッシュ名（cached_content に指定する）。使えない場合はNone
+        """
+        key = make_key("context", model, prefix)
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None and entry[1] - _REFRESH_MARGIN > now:
+            context_cache_lookups.inc(result="hit")
+            return entry[0]
+        if self._failed.get(key, 0) > now:
+            context_cache_lookups.inc(result="unavailable")
+            return None
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            context_cache_lookups.inc(result="hit")
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        name = None
+        try:
+            cached = await gemini_call.call(
+                self.client.caches.create,
+                discard=lambda cache: self.client.caches.delete(name=cache.name),
+                model=model,
+                contents=[prefix],
+                config={'ttl': f"{self.ttl_seconds}s", 'display_name': 'minutes-prompt'}
+            )
+            name = cached.name
+            context_cache_lookups.inc(result="create")
+            self._entries[key] = (name, time.monotonic() + self.ttl_seconds)
+            self._failed.pop(key, None)
+        except Exception as e:
+            print(f"Context cache Error: {e}")
+            context_cache_lookups.inc(result="unavailable")
+            self._failed[key] = time.monotonic() + self.retry_after
+        finally:
+            future.set_result(name)
+            del self._inflight[key]
+        return name
+
+    def invalidate(self, model: str, prefix: str):
+        """
+        キャッシュを使った呼び出しが失敗した場合に登録を破棄
+
+        Args:
+            model: モデル名
+            prefix: プロンプトの固定部分
+        """
+        key = make_key("context", model, prefix)
+        self._entries.pop(key, None)
+        self._failed[key] = time.monotonic() + self.retry_after
+
+    async def close(self):
+        """作成したキャッシュをモデル側から削除"""
+        entries = list(self._entries.values())
+        self._entries.clear()
+        for name, _ in entries:
+            try:
+                await gemini_call.call(self.client.caches.delete, name=name)
+            except Exception as e:
+                print(f"Context cache cleanup Error: {e}")
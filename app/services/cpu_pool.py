@@ -0,0 +1,207 @@
+"""
+CPU負荷の高い処理（Word文書の生成など）をプロセスプールで実行するユーティリティ
+"""
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+from app import metrics
+from app.config import Config
+
+cpu_tasks = metrics.counter(
+    "cpu_pool_tasks_total",
+    "CPU-bound tasks by outcome (ok / error / timeout / rejected / broken)",
+    ("outcome",)
+)
+cpu_pending = metrics.gauge(
+    "cpu_pool_pending_tasks",
+    "CPU-bound tasks queued or running in the pool"
+)
+
+_executor: Optional[Executor] = None
+_executor_lock = threading.Lock()
+# 待機中・実行中の件数（タイムアウト後も処理が終わるまで数える）
+_pending = 0
+_pending_lock = threading.Lock()
+
+
+class CPUPoolError(Exception):
+    """CPU処理プールのエラー（混雑・タイムアウト）"""
+
+    def __init__(self, message: str, status_code: int = 503, retry_after: Optional[float] = None):
+        """
+        Args:
+            message: エラー内容
+            status_code: クライアントに返すHTTPステータス
+            retry_after: 再試行までの推奨秒数
+        """
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+def pool_size() -> int:
+    """
+    プロセス数（CPU_POOL_WORKERS、未指定の場合は利用可能なコア数）
+
+    0 の場合はプロセスを使わずスレッドで実行する（サーバーレス環境など）。
+    """
+    if Config.CPU_POOL_WORKERS:
+        return max(0, int(Config.CPU_POOL_WORKERS))
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def _get_executor() -> Executor:
+    """プロセスプールを取得（初回のみ生成、作成できない環境ではスレッドで代用）"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = _create_executor()
+        return _executor
+
+
+def _create_executor() -> Executor:
+    executor: Optional[Executor] = None
+    workers = pool_size()
+    if workers > 0:
+        try:
+            # スレッドを持つ親プロセスからの fork を避けて spawn で起動する
+            executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        except (OSError, ImportError, NotImplementedError) as e:
+            print(f"CPU pool unavailable, using threads: {e}")
+    if executor is None:
+        executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="cpu")
+    return executor
+
+
+def _replace_broken(broken: Executor):
+    """
+    壊れたプロセスプール（ワーカーが異常終了したもの）を作り直す
+
+    同時に複数のタスクが失敗した場合も、作り直すのは最初の1回だけ。
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is broken:
+            print("CPU pool worker died, restarting the pool")
+            _executor = _create_executor()
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def _release(_future: Future):
+    """実行が終わった（またはキャンセルされた）タスクの枠を空ける"""
+    global _pending
+    with _pending_lock:
+        _pending -= 1
+    cpu_pending.dec()
+
+
+def _submit(executor: Executor, func: Callable[..., Any], args: tuple) -> Future:
+    """
+    タスクを投入（上限に達している場合は CPUPoolError）
+
+    枠はタスクの実行が実際に終わるまで保持する。タイムアウトで待つのをやめても
+    ワーカーは処理を続けているため、ここで空けると上限以上の処理が溜まる。
+    """
+    global _pending
+    with _pending_lock:
+        if _pending >= Config.CPU_POOL_MAX_PENDING:
+            cpu_tasks.inc(outcome="rejected")
+            raise CPUPoolError("Document rendering is busy", status_code=503, retry_after=5)
+        _pending += 1
+    cpu_pending.inc()
+    try:
+        future = executor.submit(func, *args)
+    except (BrokenProcessPool, RuntimeError):
+        # 壊れた・作り直しで停止したプールへの投入
+        _release(None)
+        raise BrokenProcessPool("CPU pool is not running")
+    future.add_done_callback(_release)
+    return future
+
+
+async def run_cpu(func: Callable[..., Any], *args, timeout: Optional[float] = None) -> Any:
+    """
+    関数をプロセスプールで実行し、イベントループ（とGIL）を占有しない
+
+    待機中・実行中の件数が CPU_POOL_MAX_PENDING に達している場合は待たずに
+    CPUPoolError（503）を送出する。ワーカーが異常終了してプールが壊れた場合は
+    プールを作り直して1回だけ再実行する。func と引数・戻り値は pickle できる
+    必要がある（モジュールの最上位で定義した関数を使う）。
+
+    Args:
+        func: 実行する関数
+        *args: 位置引数
+        timeout: 待ち時間の上限（秒、Noneの場合は CPU_POOL_TIMEOUT）
+
+    Returns:
+        関数の戻り値
+
+    Raises:
+        CPUPoolError: 混雑している・プールを作り直しても失敗した（503）、
+            または時間内に終わらなかった（504）
+    """
+    for _ in range(2):
+        executor = _get_executor()
+        try:
+            future = _submit(executor, func, args)
+            # 待機中のタスクはタイムアウト時にキャンセルされる（実行中のものは最後まで続く）
+            result = await asyncio.wait_for(
+                asyncio.wrap_future(future), timeout or Config.CPU_POOL_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            cpu_tasks.inc(outcome="timeout")
+            raise CPUPoolError("Document rendering timed out", status_code=504)
+        except CPUPoolError:
+            raise
+        except BrokenProcessPool:
+            cpu_tasks.inc(outcome="broken")
+            _replace_broken(executor)
+            continue
+        except Exception:
+            cpu_tasks.inc(outcome="error")
+            raise
+        cpu_tasks.inc(outcome="ok")
+        return result
+    raise CPUPoolError("Document rendering is unavailable", status_code=503, retry_after=5)
+
+
+async def warmup(func: Callable[[], Any]) -> int:
+    """
+    全ワーカーを起動して初期化処理を実行（初回リクエストでのプロセス起動を避ける）
+
+    Args:
+        func: 各ワーカーで実行する初期化関数（モジュールの最上位で定義したもの）
+
+    Returns:
+        初期化を実行した件数
+    """
+    loop = asyncio.get_running_loop()
+    executor = _get_executor()
+    workers = pool_size() if isinstance(executor, ProcessPoolExecutor) else 1
+    results = await asyncio.gather(
+        *(loop.run_in_executor(executor, func) for _ in range(workers)),
+        return_exceptions=True
+    )
+    for result in results:
+        if isinstance(result, Exception):
+            print(f"CPU pool warm-up Error: {result}")
+    return sum(1 for result in results if not isinstance(result, Exception))
+
+
+def shutdown():
+    """プロセスプールを停止"""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
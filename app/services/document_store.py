@@ -0,0 +1,129 @@
+"""
+生成済み文書の一時保管（ダウンロード用トークン）
+"""
+import secrets
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+
+@dataclass
+class GeneratedDocument:
+    """生成済み文書データクラス（メモリ上のバイト列、またはディスク上のファイル）"""
+    filename: str
+    data: Optional[bytes] = None
+    path: Optional[Path] = None
+    created_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def size(self) -> int:
+        """メモリ上に保持しているサイズ（バイト）"""
+        return len(self.data) if self.data is not None else 0
+
+    def cleanup(self):
+        """ディスク上のファイルを削除"""
+        if self.path is not None:
+            self.path.unlink(missing_ok=True)
+
+
+def sweep_directory(directory: Path, max_age_seconds: float, pattern: str = "*.docx") -> int:
+    """
+    ディレクトリ内の古い生成ファイルを削除（前回起動時の残骸など）
+
+    Args:
+        directory: 対象ディレクトリ
+        max_age_seconds: これより古いファイルを削除する（秒）
+        pattern: 対象ファイルのパターン
+
+    Returns:
+        削除したファイル数
+    """
+    if not directory.exists():
+        return 0
+    threshold = time.time() - max_age_seconds
+    removed = 0
+    for path in directory.glob(pattern):
+        try:
+            if path.stat().st_mtime < threshold:
+                path.unlink()
+                removed += 1
+        except OSError:
+            continue
+    return removed
+
+
+class DocumentStore:
+    """
+    生成済み文書をトークンで引けるように一時的に保持するストア
+
+    TTLを過ぎたもの、または件数・合計サイズの上限を超えた分は古い順に破棄し、
+    ディスク上のファイルも削除する。
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int, max_bytes: int):
+        """
+        Args:
+            ttl_seconds: 保持する秒数
+            max_entries: 保持する件数の上限
+            max_bytes: メモリ上に保持する合計サイズの上限（バイト）
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._documents: "OrderedDict[str, GeneratedDocument]" = OrderedDict()
+        self._total_bytes = 0
+
+    def put(self, document: GeneratedDocument) -> str:
+        """
+        文書を登録
+
+        Args:
+            document: 生成済み文書
+
+        Returns:
+            ダウンロード用トークン
+        """
+        token = secrets.token_urlsafe(16)
+        self._documents[token] = document
+        self._total_bytes += document.size
+        self._evict()
+        return token
+
+    def get(self, token: str) -> Optional[GeneratedDocument]:
+        """
+        文書を取得（期限切れの場合はNone）
+
+        Args:
+            token: ダウンロード用トークン
+
+        Returns:
+            文書
+        """
+        self._evict()
+        return self._documents.get(token)
+
+    def clear(self):
+        """すべての文書を破棄"""
+        while self._documents:
+            self._remove(next(iter(self._documents)))
+
+    def _remove(self, token: str):
+        document = self._documents.pop(token)
+        self._total_bytes -= document.size
+        document.cleanup()
+
+    def _evict(self):
+        """期限切れ・上限超過の文書を古い順に破棄"""
+        now = time.monotonic()
+        while self._documents:
+            token, oldest = next(iter(self._documents.items()))
+            expired = now - oldest.created_at > self.ttl_seconds
+            over_limit = (
+                len(self._documents) > self.max_entries
+                or self._total_bytes > self.max_bytes
+            )
+            if not (expired or over_limit):
+                break
+            self._remove(token)
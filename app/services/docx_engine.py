@@ -0,0 +1,260 @@
+"""
+Word文書の高速生成（ベーステンプレートの再利用と Markdown サブセットの一括変換）
+"""
+import io
+import re
+import threading
+import zipfile
+from pathlib import Path
+from typing import Dict, List, Optional
+from xml.sax.saxutils import escape
+from docx import Document
+
+_DOCUMENT_PART = "word/document.xml"
+
+# テンプレートから参照するスタイル（名前 -> 役割）
+_STYLE_NAMES = {
+    "heading1": "Heading 1",
+    "heading2": "Heading 2",
+    "heading3": "Heading 3",
+    "bullet": "List Bullet",
+    "table": "Table Grid",
+}
+
+# XML 1.0 で使えない制御文字
+_INVALID_XML_CHARS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f￾￿]")
+
+# 行の種類の判定（1行につき1回だけ照合する）
+_LINE_PATTERN = re.compile(
+    r"^(?:"
+    r"(?P<heading>#{1,3})\s+(?P<heading_text>.*)"
+    r"|(?P<section>【[^】]+】)"
+    r"|(?P<rule>(?:-{3,}|\*{3,}|_{3,}))"
+    r"|(?:[-*]\s+|・\s*)(?P<bullet>.*)"
+    r"|(?P<number>\d{1,3}[.)．])\s+(?P<number_text>.*)"
+    r"|(?P<table>\|.*)"
+    r")$"
+)
+_TABLE_SEPARATOR = re.compile(r"^:?-{3,}:?$")
+
+# 番号付きリストのぶら下げインデント（twip）
+_NUMBER_INDENT = 420
+
+
+def _text(value: str) -> str:
+    return escape(_INVALID_XML_CHARS.sub("", value))
+
+
+def _runs(text: str, bold: bool = False) -> str:
+    """**太字** を含むテキストを w:r の並びに変換"""
+    parts = text.split("**")
+    if len(parts) % 2 == 0:
+        # 閉じられていない ** はそのまま文字として残す
+        parts[-2:] = ["**".join(parts[-2:])]
+    runs = []
+    for i, part in enumerate(parts):
+        if not part:
+            continue
+        rpr = "<w:rPr><w:b/></w:rPr>" if bold or i % 2 == 1 else ""
+        runs.append(f'<w:r>{rpr}<w:t xml:space="preserve">{_text(part)}</w:t></w:r>')
+    return "".join(runs)
+
+
+class DocxTemplate:
+    """
+    ベーステンプレート（1回だけ読み込み、生成ごとに本文だけ差し替える）
+
+    python-docx でテンプレートを開いてスタイルIDと本文領域の幅を調べ、
+    本文以外のパーツは圧縮済みのZIPとして保持する。生成時はそのZIPに
+    document.xml を追記するだけなので、テンプレートの展開・解析は発生しない。
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        """
+        Args:
+            path: テンプレートの .docx（Noneの場合は python-docx の既定テンプレート）
+        """
+        doc = Document(str(path)) if path else Document()
+        body = doc.element.body
+        for child in list(body):
+            if not child.tag.endswith("}sectPr"):
+                body.remove(child)
+
+        # 名前で探すため、日本語版Wordで作成したテンプレートでも使える
+        self.style_ids: Dict[str, Optional[str]] = {}
+        for role, name in _STYLE_NAMES.items():
+            try:
+                self.style_ids[role] = doc.styles[name].style_id
+            except KeyError:
+                self.style_ids[role] = None
+
+        section = doc.sections[0]
+        # 本文領域の幅（EMU -> twip）
+        self.text_width = int(
+            (section.page_width - section.left_margin - section.right_margin) / 635
+        )
+
+        buffer = io.BytesIO()
+        doc.save(buffer)
+        source = zipfile.ZipFile(io.BytesIO(buffer.getvalue()))
+        document_xml = source.read(_DOCUMENT_PART).decode("utf-8")
+        body_start = document_xml.index("<w:body>") + len("<w:body>")
+        sect_start = document_xml.index("<w:sectPr", body_start)
+        self._prefix = document_xml[:body_start]
+        self._suffix = document_xml[sect_start:]
+
+        # document.xml 以外のパーツ（圧縮済み）
+        static = io.BytesIO()
+        with zipfile.ZipFile(static, "w", zipfile.ZIP_DEFLATED) as target:
+            for info in source.infolist():
+                if info.filename != _DOCUMENT_PART:
+                    target.writestr(info, source.read(info.filename))
+        self._static_zip = static.getvalue()
+
+    def pstyle(self, role: str) -> str:
+        """段落スタイル指定（テンプレートにない場合は指定なし）"""
+        style_id = self.style_ids.get(role)
+        return f'<w:pStyle w:val="{style_id}"/>' if style_id else ""
+
+    def package(self, body_xml: str) -> bytes:
+        """
+        本文を差し込んだ .docx を作成
+
+        Args:
+            body_xml: w:body 直下の要素（w:p / w:tbl）
+
+        Returns:
+            Wordファイルのバイト列
+        """
+        buffer = io.BytesIO(self._static_zip)
+        buffer.seek(0, io.SEEK_END)
+        with zipfile.ZipFile(buffer, "a", zipfile.ZIP_DEFLATED) as target:
+            target.writestr(
+                _DOCUMENT_PART,
+                (self._prefix + body_xml + self._suffix).encode("utf-8"),
+                compress_type=zipfile.ZIP_DEFLATED,
+                compresslevel=6
+            )
+        return buffer.getvalue()
+
+
+class MinutesRenderer:
+    """
+    議事録テキスト（Markdown サブセット）を WordprocessingML に変換
+
+    対応する記法: # / ## / ### 見出し、【…】だけの行（見出し2）、- * ・ の箇条書き、
+    1. の番号付きリスト、| 区切りの表、**太字**、--- の区切り線（空行として出力）。
+    各行は1回の正規表現照合で分類し、本文のXMLは文字列として連結してから
+    まとめてZIPに書き込む（段落ごとのオブジェクト生成を行わない）。
+    """
+
+    def __init__(self, template: DocxTemplate):
+        """
+        Args:
+            template: ベーステンプレート
+        """
+        self.template = template
+
+    def paragraph(self, text: str = "", role: Optional[str] = None, bold: bool = False,
+                  indent: bool = False) -> str:
+        """段落1つ分のXML"""
+        ppr = self.template.pstyle(role) if role else ""
+        if indent:
+            ppr += f'<w:ind w:left="{_NUMBER_INDENT}" w:hanging="{_NUMBER_INDENT}"/>'
+        if ppr:
+            ppr = f"<w:pPr>{ppr}</w:pPr>"
+        return f"<w:p>{ppr}{_runs(text, bold)}</w:p>"
+
+    def table(self, lines: List[str]) -> str:
+        """| 区切りの行から表のXMLを作成（1行目は見出し行として太字）"""
+        rows = []
+        for line in lines:
+            cells = [cell.strip() for cell in line.strip().strip("|").split("|")]
+            if all(_TABLE_SEPARATOR.match(cell) for cell in cells):
+                continue
+            rows.append(cells)
+        if not rows:
+            return ""
+        columns = max(len(row) for row in rows)
+        width = self.template.text_width // columns
+        style_id = self.template.style_ids.get("table")
+        style = f'<w:tblStyle w:val="{style_id}"/>' if style_id else ""
+        parts = [
+            f'<w:tbl><w:tblPr>{style}<w:tblW w:w="0" w:type="auto"/></w:tblPr><w:tblGrid>',
+            f'<w:gridCol w:w="{width}"/>' * columns,
+            "</w:tblGrid>",
+        ]
+        for index, row in enumerate(rows):
+            parts.append("<w:tr>")
+            for cell in row + [""] * (columns - len(row)):
+                parts.append(
+                    f'<w:tc><w:tcPr><w:tcW w:w="{width}" w:type="dxa"/></w:tcPr>'
+                    f"<w:p>{_runs(cell, bold=index == 0)}</w:p></w:tc>"
+                )
+            parts.append("</w:tr>")
+        parts.append("</w:tbl>")
+        return "".join(parts)
+
+    def render_markdown(self, content: str) -> List[str]:
+        """
+        整形済みテキストを本文のXML要素に変換（1パス）
+
+        Args:
+            content: Geminiで整形済みの議事録テキスト
+
+        Returns:
+            w:p / w:tbl のXML文字列のリスト
+        """
+        elements = []
+        table_lines: List[str] = []
+        for raw in content.split("\n"):
+            line = raw.strip()
+            match = _LINE_PATTERN.match(line) if line else None
+            if table_lines and (match is None or match.group("table") is None):
+                elements.append(self.table(table_lines))
+                table_lines = []
+
+            if not line:
+                elements.append("<w:p/>")
+            elif match is None:
+                elements.append(self.paragraph(line))
+            elif match.group("table") is not None:
+                table_lines.append(line)
+            elif match.group("heading") is not None:
+                level = len(match.group("heading"))
+                elements.append(self.paragraph(match.group("heading_text"), f"heading{level}"))
+            elif match.group("section") is not None:
+                elements.append(self.paragraph(match.group("section"), "heading2"))
+            elif match.group("bullet") is not None:
+                elements.append(self.paragraph(match.group("bullet"), "bullet"))
+            elif match.group("number") is not None:
+                elements.append(self.paragraph(
+                    f"{match.group('number')} {match.group('number_text')}", indent=True
+                ))
+            else:
+                elements.append("<w:p/>")
+        if table_lines:
+            elements.append(self.table(table_lines))
+        return elements
+
+
+_template: Optional[DocxTemplate] = None
+_template_lock = threading.Lock()
+
+
+def get_template(path: Optional[Path] = None) -> DocxTemplate:
+    """
+    共有のベーステンプレートを取得（初回のみ読み込む）
+
+    Args:
+        path: テンプレートの .docx（Noneの場合は python-docx の既定テンプレート）
+
+    Returns:
+        テンプレート
+    """
+    global _template
+    if _template is None:
+        with _template_lock:
+            if _template is None:
+                _template = DocxTemplate(path)
+    return _template
@@ -1,19 +1,24 @@
 """
 Word文書生成サービス
 """
+import io
+import os
+import secrets
 from docx import Document
-from docx.shared import Pt
 from datetime import datetime
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 from app.domain.summary import Summary
 from app.config import Config
+from app.services.docx_engine import MinutesRenderer, get_template
 
 class DocxService:
     """Word文書生成サービス"""
     
     def __init__(self):
-        pass
+        """ベーステンプレートを読み込む（プロセス内で共有し、2回目以降は読み込まない）"""
+        template_path = Path(Config.DOCX_TEMPLATE) if Config.DOCX_TEMPLATE else None
+        self.renderer = MinutesRenderer(get_template(template_path))
     
     def generate_document(self, summaries: List[Summary], formatted_content: str = None, output_path: Path = None) -> Path:
         """
@@ -28,62 +33,99 @@ class DocxService:
             生成されたファイルのパス
         """
         if output_path is None:
+            # 同一秒の生成でも衝突しないよう乱数を付与
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            output_path = Config.OUTPUTS_DIR / f"議事録_{timestamp}.docx"
+            output_path = Config.outputs_dir() / f"議事録_{timestamp}_{secrets.token_hex(4)}.docx"
         
-        doc = Document()
+        # ファイル保存
+        output_path.write_bytes(self.render_bytes(summaries, formatted_content))
+        
+        return output_path
+    
+    def render_bytes(self, summaries: List[Summary], formatted_content: str = None) -> bytes:
+        """
+        議事録Wordファイルをメモリ上に生成（ディスクに書き込まない）
+        
+        Args:
+            summaries: 要約データリスト
+            formatted_content: Gemini APIで整形済みのコンテンツ（オプション）
+            
+        Returns:
+            Wordファイルのバイト列
+        """
+        renderer = self.renderer
         
         # タイトル
-        title = doc.add_heading('議事録', level=1)
+        elements = [renderer.paragraph('議事録', 'heading1')]
         
         # 整形済みコンテンツがある場合はそれを使用
         if formatted_content:
             # Markdown形式のコンテンツを解析してWord文書に変換
-            lines = formatted_content.split('\n')
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    doc.add_paragraph('')
-                    continue
-                
-                # 見出し
-                if line.startswith('## '):
-                    doc.add_heading(line[3:], level=2)
-                elif line.startswith('# '):
-                    doc.add_heading(line[2:], level=1)
-                # リスト項目
-                elif line.startswith('- '):
-                    doc.add_paragraph(line[2:], style='List Bullet')
-                # その他は通常の段落
-                else:
-                    doc.add_paragraph(line)
+            elements.extend(renderer.render_markdown(formatted_content))
         else:
             # 従来の方式（カテゴリごと）
-            doc.add_paragraph(f'日付: {datetime.now().strftime("%Y年%m月%d日")}')
-            doc.add_paragraph(f'場所: （未入力）')
-            doc.add_paragraph('')
+            elements.append(renderer.paragraph(f'日付: {datetime.now().strftime("%Y年%m月%d日")}'))
+            elements.append(renderer.paragraph('場所: （未入力）'))
+            elements.append(renderer.paragraph())
             
             # カテゴリごとにグループ化
             categories = {}
             for summary in summaries:
-                if summary.category not in categories:
-                    categories[summary.category] = []
-                categories[summary.category].append(summary)
+                categories.setdefault(summary.category, []).append(summary)
             
             # セクションごとに出力
             for category, items in categories.items():
-                doc.add_heading(f'■ {category}', level=2)
-                
+                elements.append(renderer.paragraph(f'■ {category}', 'heading2'))
                 for item in items:
-                    # 質問
-                    p = doc.add_paragraph()
-                    p.add_run(f'{item.question_id}. {item.question_text}').bold = True
-                    
-                    # 要約
-                    doc.add_paragraph(f'要約: {item.summary_text}')
-                    doc.add_paragraph('')
+                    # 質問・要約
+                    elements.append(renderer.paragraph(
+                        f'{item.question_id}. {item.question_text}', bold=True
+                    ))
+                    elements.append(renderer.paragraph(f'要約: {item.summary_text}'))
+                    elements.append(renderer.paragraph())
         
-        # ファイル保存
-        doc.save(output_path)
+        # 表で終わる場合、Wordの仕様に合わせて空の段落を置く
+        if elements[-1].startswith('<w:tbl>'):
+            elements.append(renderer.paragraph())
         
-        return output_path
+        return renderer.template.package(''.join(elements))
+    
+    def build_document(self, summaries: List[Summary], formatted_content: str = None):
+        """
+        議事録のDocumentオブジェクトを組み立て
+        
+        Args:
+            summaries: 要約データリスト
+            formatted_content: Gemini APIで整形済みのコンテンツ（オプション）
+            
+        Returns:
+            python-docx の Document
+        """
+        return Document(io.BytesIO(self.render_bytes(summaries, formatted_content)))
+
+
+# プロセスプールのワーカーごとのサービス（テンプレートはワーカーごとに1回だけ読み込む）
+_worker_service: Optional[DocxService] = None
+
+
+def _service() -> DocxService:
+    global _worker_service
+    if _worker_service is None:
+        _worker_service = DocxService()
+    return _worker_service
+
+
+def warm_worker() -> int:
+    """ワーカープロセスでテンプレートを読み込んでおく（プロセスIDを返す）"""
+    _service()
+    return os.getpid()
+
+
+def render_minutes(summaries: List[Summary], formatted_content: str = None) -> bytes:
+    """プロセスプール用: 議事録Wordファイルをメモリ上に生成"""
+    return _service().render_bytes(summaries, formatted_content)
+
+
+def write_minutes(summaries: List[Summary], formatted_content: str = None) -> Path:
+    """プロセスプール用: 議事録Wordファイルを OUTPUTS_DIR に生成"""
+    return _service().generate_document(summaries, formatted_content)
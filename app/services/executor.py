@@ -0,0 +1,127 @@
+"""
+ブロッキング処理の非同期実行ユーティリティ
+"""
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Iterator, Optional
+from app.config import Config
+
+_executor: Optional[ThreadPoolExecutor] = None
+_semaphore: Optional[asyncio.Semaphore] = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Gemini呼び出し専用のスレッドプールを取得（初回のみ生成）"""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=Config.GEMINI_MAX_CONCURRENCY,
+            thread_name_prefix="gemini"
+        )
+    return _executor
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    """同時実行数を制限するセマフォを取得（初回のみ生成）"""
+    global _semaphore
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(Config.GEMINI_MAX_CONCURRENCY)
+    return _semaphore
+
+
+async def run_blocking(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    同期関数をワーカースレッドで実行し、イベントループをブロックしない
+
+    同時実行数は Config.GEMINI_MAX_CONCURRENCY で制限される。
+    上限を超えた呼び出しはスレッドプールのキューではなくセマフォで待機する。
+    呼び出し側がキャンセルしてもスレッドは処理を続けるため、枠はスレッドの
+    処理が実際に終わるまで保持する。
+
+    Args:
+        func: 実行する同期関数
+        *args: 位置引数
+        **kwargs: キーワード引数
+
+    Returns:
+        関数の戻り値
+    """
+    loop = asyncio.get_running_loop()
+    future = await _start(loop, functools.partial(func, *args, **kwargs))
+    return await asyncio.shield(future)
+
+
+async def _start(loop: asyncio.AbstractEventLoop, func: Callable[[], Any]) -> asyncio.Future:
+    """セマフォの枠を取得してワーカースレッドで実行を開始（枠は実行が終わった時点で返す）"""
+    semaphore = _get_semaphore()
+    await semaphore.acquire()
+    try:
+        future = loop.run_in_executor(_get_executor(), func)
+    except BaseException:
+        semaphore.release()
+        raise
+    future.add_done_callback(lambda _: semaphore.release())
+    # 呼び出し側が待つのをやめた後に失敗しても、未回収の例外として警告を出さない
+    future.add_done_callback(_consume_exception)
+    return future
+
+
+def _consume_exception(future: asyncio.Future):
+    if not future.cancelled():
+        future.exception()
+
+
+async def iterate_blocking(func: Callable[..., Iterator[Any]], *args, **kwargs) -> AsyncIterator[Any]:
+    """
+    同期イテレータ（ストリーミング応答など）をワーカースレッドで回し、要素を順に返す
+
+    イテレータを消費している間はワーカーを1つ占有し、同時実行数に数えられる。
+    途中で中断した場合、ワーカーは次の要素を受け取った時点で読み出しをやめる
+    （それまで枠は保持するが、呼び出し側はその終了を待たない）。
+
+    Args:
+        func: イテレータを返す同期関数
+        *args: 位置引数
+        **kwargs: キーワード引数
+
+    Yields:
+        イテレータの各要素
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    done = object()
+    cancelled = False
+
+    def _pump():
+        try:
+            for item in func(*args, **kwargs):
+                if cancelled:
+                    break
+                loop.call_soon_threadsafe(queue.put_nowait, (item, None))
+            loop.call_soon_threadsafe(queue.put_nowait, (done, None))
+        except Exception as e:
+            loop.call_soon_threadsafe(queue.put_nowait, (done, e))
+
+    future = await _start(loop, _pump)
+    try:
+        while True:
+            item, error = await queue.get()
+            if item is done:
+                if error is not None:
+                    raise error
+                break
+            yield item
+    finally:
+        # 途中で中断された場合はワーカー側の読み出しも止める
+        # （応答が止まったストリームでも期限どおりに戻れるよう、ワーカーの終了は待たない）
+        cancelled = True
+
+
+def shutdown():
+    """スレッドプールを停止"""
+    global _executor, _semaphore
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+    _executor = None
+    _semaphore = None
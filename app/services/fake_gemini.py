@@ -0,0 +1,157 @@
+"""
+オフライン用のフェイクGeminiクライアント（ベンチマーク・負荷試験用）
+
+GEMINI_BACKEND=fake のとき get_client() が本物の代わりに返す。
+各サービスが使う models / files / caches のメソッドだけを同じ呼び出し形式で
+実装し、ネットワークに出ずに遅延・ゆらぎ・エラーを再現する。
+"""
+import hashlib
+import itertools
+import json
+import random
+import time
+from types import SimpleNamespace
+from typing import Iterator
+import requests
+from google.genai import errors
+
+
+class FakeBackendSettings:
+    """フェイクの応答特性"""
+
+    def __init__(self, latency_ms: float = 300, jitter_ms: float = 100,
+                 error_rate: float = 0.0, error_code: int = 503, stream_chunks: int = 8):
+        """
+        Args:
+            latency_ms: 1呼び出しの平均応答時間（ミリ秒）
+            jitter_ms: 応答時間のゆらぎ（±ミリ秒、一様分布）
+            error_rate: エラーを返す確率（0〜1）
+            error_code: 返すエラーのHTTPステータス
+            stream_chunks: ストリーミング応答の分割数
+        """
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_code = error_code
+        self.stream_chunks = max(stream_chunks, 1)
+
+    def delay(self) -> float:
+        """今回の応答時間（秒）"""
+        jitter = random.uniform(-self.jitter_ms, self.jitter_ms)
+        return max(self.latency_ms + jitter, 0) / 1000
+
+    def maybe_fail(self):
+        """error_rate の確率で APIError を送出"""
+        if random.random() >= self.error_rate:
+            return
+        response = requests.Response()
+        response.status_code = self.error_code
+        response.reason = "Injected"
+        response._content = json.dumps(
+            {"error": {"code": self.error_code, "message": "Injected fake error"}}
+        ).encode("utf-8")
+        raise errors.APIError(self.error_code, response)
+
+
+def _digest(contents) -> str:
+    """入力内容から応答を決めるための短いハッシュ"""
+    return hashlib.sha256(repr(contents).encode("utf-8")).hexdigest()[:8]
+
+
+def _reply(contents, config) -> str:
+    """入力に応じたそれらしい応答テキスト"""
+    digest = _digest(contents)
+    response_type = getattr(config, "response_mime_type", None)
+    if isinstance(config, dict):
+        response_type = config.get("response_mime_type")
+    if response_type == "application/json":
+        return json.dumps(
+            {"transcript": f"フェイク文字起こし {digest}", "summary": f"フェイク要約 {digest}"},
+            ensure_ascii=False
+        )
+    if isinstance(contents, list) and len(contents) > 1:
+        # 音声パートを含む呼び出し（文字起こし）
+        return f"フェイク文字起こし {digest}"
+    return (
+        f"# 議事録 {digest}\n"
+        "## 概要\n"
+        "- フェイク応答の要点1\n"
+        "- フェイク応答の要点2\n"
+        "## 決定事項\n"
+        "フェイク応答の本文です。"
+    )
+
+
+def _speech_reply(contents) -> SimpleNamespace:
+    """音声合成の応答（テキストの長さに比例した無音の16bit PCM）"""
+    # 24kHz で1文字あたり0.1秒
+    pcm = b"\x00\x00" * 2400 * max(len(str(contents)), 1)
+    blob = SimpleNamespace(mime_type="audio/L16;codec=pcm;rate=24000", data=pcm)
+    part = SimpleNamespace(inline_data=blob, text=None)
+    return SimpleNamespace(candidates=[SimpleNamespace(content=SimpleNamespace(parts=[part]))])
+
+
+class _FakeModels:
+    def __init__(self, settings: FakeBackendSettings):
+        self.settings = settings
+
+    def generate_content(self, *, model: str, contents, config=None):
+        time.sleep(self.settings.delay())
+        self.settings.maybe_fail()
+        if "AUDIO" in (getattr(config, "response_modalities", None) or []):
+            response = _speech_reply(contents)
+            response.text = None
+            response.model = model
+            return response
+        return SimpleNamespace(text=_reply(contents, config), model=model)
+
+    def generate_content_stream(self, *, model: str, contents, config=None) -> Iterator:
+        text = _reply(contents, config)
+        count = self.settings.stream_chunks
+        size = max(len(text) // count, 1)
+        delay = self.settings.delay()
+        # 最初の応答までに遅延の半分、残りをチャンク間に配分
+        time.sleep(delay / 2)
+        self.settings.maybe_fail()
+        for start in range(0, len(text), size):
+            yield SimpleNamespace(text=text[start:start + size])
+            time.sleep(delay / 2 / count)
+
+
+class _FakeFiles:
+    def __init__(self, settings: FakeBackendSettings):
+        self.settings = settings
+        self._ids = itertools.count(1)
+
+    def upload(self, *, path: str, config=None):
+        time.sleep(self.settings.delay())
+        self.settings.maybe_fail()
+        name = f"files/fake-{next(self._ids)}"
+        return SimpleNamespace(name=name, uri=f"https://fake.invalid/{name}")
+
+    def delete(self, *, name: str, config=None):
+        return SimpleNamespace()
+
+
+class _FakeCaches:
+    def __init__(self, settings: FakeBackendSettings):
+        self.settings = settings
+        self._ids = itertools.count(1)
+
+    def create(self, *, model: str, contents, config=None):
+        time.sleep(self.settings.delay())
+        self.settings.maybe_fail()
+        return SimpleNamespace(name=f"cachedContents/fake-{next(self._ids)}", model=model)
+
+    def delete(self, *, name: str, config=None):
+        return SimpleNamespace()
+
+
+class FakeClient:
+    """genai.Client のうち本アプリが使う部分だけを持つフェイク"""
+
+    def __init__(self, settings: FakeBackendSettings):
+        self.settings = settings
+        self.models = _FakeModels(settings)
+        self.files = _FakeFiles(settings)
+        self.caches = _FakeCaches(settings)
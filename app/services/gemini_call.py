@@ -0,0 +1,412 @@
+"""
+Gemini API呼び出しの共通ラッパー（レート制限・期限・リトライ・ヘッジ）
+"""
+import asyncio
+import random
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, Optional, Set, Tuple
+from app import metrics
+from app.config import Config
+from app.observability import log_event
+from app.services.executor import iterate_blocking, run_blocking
+
+gemini_requests = metrics.counter(
+    "gemini_requests_total",
+    "Gemini API calls by model and outcome (ok / retry / error / hedged)",
+    ("model", "outcome")
+)
+gemini_request_duration = metrics.histogram(
+    "gemini_request_duration_seconds",
+    "Gemini API call latency per successful attempt",
+    ("model",)
+)
+gemini_tokens = metrics.counter(
+    "gemini_tokens_total",
+    "Gemini tokens by model and kind (prompt / cached / output)",
+    ("model", "kind")
+)
+
+
+def record_usage(model: str, response: Any):
+    """応答の usage_metadata からトークン数を記録"""
+    usage = getattr(response, "usage_metadata", None)
+    if usage is None:
+        return
+    for kind, attr in (("prompt", "prompt_token_count"),
+                       ("cached", "cached_content_token_count"),
+                       ("output", "candidates_token_count")):
+        value = getattr(usage, attr, None)
+        if value:
+            gemini_tokens.inc(value, model=model, kind=kind)
+
+
+class GeminiCallError(RuntimeError):
+    """
+    Gemini呼び出しの失敗（リトライしても成功しない・期限切れ）
+
+    status_code はクライアントに返すHTTPステータス
+    （レート制限: 503、期限切れ: 504、その他: 502）。
+    """
+
+    def __init__(self, message: str, status_code: int = 502,
+                 retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """トークンバケット方式のレート制限（rate 個/秒、最大 capacity 個まで貯まる）"""
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Args:
+            rate: 1秒あたりの補充数（0以下の場合は無制限）
+            capacity: バケットの容量（バースト許容数）
+        """
+        self.rate = rate
+        self.capacity = max(capacity, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self) -> bool:
+        """待たずに取得できる場合のみトークンを1つ消費"""
+        if self.rate <= 0:
+            return True
+        self._refill()
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        return False
+
+    async def acquire(self, deadline: Optional[float] = None):
+        """
+        トークンを1つ消費（足りない場合は補充まで待つ）
+
+        待機は先着順。期限までに取得できない場合は待たずに失敗する。
+
+        Args:
+            deadline: 期限（time.monotonic() の値）
+
+        Raises:
+            GeminiCallError: 期限までにトークンを取得できない場合
+        """
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                wait = (1 - self._tokens) / self.rate
+                if deadline is not None and time.monotonic() + wait > deadline:
+                    raise GeminiCallError("Gemini rate limit exceeded", 503, retry_after=wait)
+                await asyncio.sleep(wait)
+                self._refill()
+            self._tokens -= 1
+
+
+class LatencyTracker:
+    """直近の呼び出し時間を保持し、パーセンタイルを計算"""
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self._samples = deque(maxlen=window)
+        self.min_samples = min_samples
+
+    def record(self, seconds: float):
+        self._samples.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """q（0〜1）パーセンタイル。サンプルが少ない間はNone"""
+        if len(self._samples) < self.min_samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def is_retryable(error: BaseException) -> bool:
+    """一時的なエラー（429・5xx・通信エラー）かどうか"""
+    # google.genai / requests は読み込みが重いため、実際に呼び出しが失敗した時点で読み込む
+    import requests
+    from google.genai import errors
+    if isinstance(error, errors.APIError):
+        return error.code == 429 or (error.code or 0) >= 500
+    return isinstance(error, (requests.ConnectionError, requests.Timeout))
+
+
+def _retry_after(error: BaseException) -> Optional[float]:
+    """429応答の Retry-After ヘッダー（秒）"""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    value = headers.get("Retry-After", "")
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def _to_call_error(error: BaseException) -> GeminiCallError:
+    if getattr(error, "code", None) == 429:
+        return GeminiCallError(f"Gemini rate limit exceeded: {error}", 503,
+                               retry_after=_retry_after(error))
+    return GeminiCallError(f"Gemini call failed: {error}", 502)
+
+
+def _operation(func: Callable[..., Any]) -> str:
+    """呼び出す操作の名前（generate_content / upload など）"""
+    return getattr(func, "__name__", "") or type(func).__name__
+
+
+class GeminiCaller:
+    """レート制限・期限・リトライ・ヘッジ付きでGemini APIを呼び出す"""
+
+    def __init__(self, rate_per_second: float, burst: int, deadline: float,
+                 max_retries: int, base_delay: float, max_delay: float,
+                 hedge: bool = False, hedge_min_samples: int = 20):
+        """
+        Args:
+            rate_per_second: 1秒あたりの呼び出し数の上限（0以下の場合は無制限）
+            burst: 一度に許容する呼び出し数
+            deadline: 1呼び出しの期限（秒、リトライ・待機を含む）
+            max_retries: 最大リトライ回数
+            base_delay: バックオフの初期待ち時間（秒）
+            max_delay: バックオフの最大待ち時間（秒）
+            hedge: p95を超えても応答がない場合に同じリクエストをもう1つ送る
+            hedge_min_samples: ヘッジを始めるのに必要な計測数
+        """
+        self.bucket = TokenBucket(rate_per_second, burst)
+        self.deadline = deadline
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.hedge = hedge
+        self.hedge_min_samples = hedge_min_samples
+        self.hedged = 0
+        # 呼び出し時間は操作とモデルの組ごとに計測する（アップロードと生成では桁が違う）
+        self._latency: Dict[Tuple[str, str], LatencyTracker] = {}
+        # 使わなかった結果の後始末（実行中のタスクを保持）
+        self._cleanups: Set[asyncio.Task] = set()
+
+    def latency(self, operation: str, model: str) -> LatencyTracker:
+        """操作とモデルの組ごとの呼び出し時間"""
+        key = (operation, model)
+        tracker = self._latency.get(key)
+        if tracker is None:
+            tracker = self._latency[key] = LatencyTracker(min_samples=self.hedge_min_samples)
+        return tracker
+
+    def _backoff(self, attempt: int, error: BaseException) -> float:
+        """指数バックオフ（フルジッター）。Retry-After があればそれ以上待つ"""
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        return max(delay, _retry_after(error) or 0)
+
+    async def call(self, func: Callable[..., Any], *args,
+                   deadline: Optional[float] = None, idempotent: bool = False,
+                   discard: Optional[Callable[[Any], Any]] = None, **kwargs) -> Any:
+        """
+        同期のGemini API呼び出しをワーカースレッドで実行
+
+        リトライとヘッジは idempotent=True の呼び出し（generate_content など、
+        2回実行しても副作用が残らないもの）に限る。ファイルのアップロードや
+        キャッシュの作成は1回だけ送り、期限切れ・キャンセルで使わなかった結果は
+        discard で後始末する。
+
+        Args:
+            func: 呼び出す関数（client.models.generate_content など）
+            *args: 位置引数
+            deadline: 期限（秒、省略時は既定値）
+            idempotent: 同じリクエストを再送してよい
+            discard: 使わなかった結果を渡して呼ぶ同期関数（作成したリソースの削除など）
+            **kwargs: キーワード引数
+
+        Returns:
+            関数の戻り値
+
+        Raises:
+            GeminiCallError: リトライしても成功しない・期限切れの場合
+        """
+        deadline_at = time.monotonic() + (deadline or self.deadline)
+        model = kwargs.get("model", "")
+        max_retries = self.max_retries if idempotent else 0
+        attempt = 0
+        while True:
+            remaining = deadline_at - time.monotonic()
+            if remaining <= 0:
+                raise GeminiCallError("Gemini call deadline exceeded", 504)
+            try:
+                return await asyncio.wait_for(
+                    self._attempt(func, args, kwargs, deadline_at, idempotent, discard), remaining
+                )
+            except GeminiCallError:
+                gemini_requests.inc(model=model, outcome="error")
+                raise
+            except asyncio.TimeoutError:
+                gemini_requests.inc(model=model, outcome="error")
+                raise GeminiCallError("Gemini call deadline exceeded", 504) from None
+            except Exception as e:
+                retry = is_retryable(e) and attempt < max_retries
+                delay = self._backoff(attempt, e) if retry else 0
+                if not retry or time.monotonic() + delay >= deadline_at:
+                    gemini_requests.inc(model=model, outcome="error")
+                    raise _to_call_error(e) from e
+                gemini_requests.inc(model=model, outcome="retry")
+                log_event("gemini_retry", model=model, attempt=attempt + 1,
+                          max_retries=max_retries, delay_s=round(delay, 2), error=str(e))
+                attempt += 1
+                await asyncio.sleep(delay)
+
+    async def _attempt(self, func, args, kwargs, deadline_at: float,
+                       idempotent: bool, discard: Optional[Callable[[Any], Any]]) -> Any:
+        """1回分の呼び出し（遅い場合はヘッジ）"""
+        await self.bucket.acquire(deadline_at)
+        model = kwargs.get("model", "")
+        latency = self.latency(_operation(func), model)
+        started = time.monotonic()
+        tasks = [asyncio.ensure_future(run_blocking(func, *args, **kwargs))]
+        winner = None
+        try:
+            hedge_after = latency.percentile(0.95) if self.hedge and idempotent else None
+            if hedge_after is not None:
+                done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+                # クォータに余裕がある場合のみ重複リクエストを送る
+                if not done and self.bucket.try_acquire():
+                    self.hedged += 1
+                    gemini_requests.inc(model=model, outcome="hedged")
+                    tasks.append(asyncio.ensure_future(run_blocking(func, *args, **kwargs)))
+
+            error = None
+            for future in asyncio.as_completed(tasks):
+                try:
+                    result = await future
+                except Exception as e:
+                    error = error or e
+                    continue
+                winner = result
+                elapsed = time.monotonic() - started
+                latency.record(elapsed)
+                gemini_requests.inc(model=model, outcome="ok")
+                gemini_request_duration.observe(elapsed, model=model)
+                record_usage(model, result)
+                return result
+            raise error
+        finally:
+            for task in tasks:
+                if discard is None:
+                    task.cancel()
+                elif not task.done() or (not task.cancelled() and task.exception() is None
+                                         and task.result() is not winner):
+                    # 待つのをやめた呼び出しも最後まで実行されるため、結果が出たら後始末する
+                    task.add_done_callback(lambda done, d=discard: self._discard(d, done))
+
+    def _discard(self, discard: Callable[[Any], Any], task: asyncio.Future):
+        """使わなかった呼び出しの結果を後始末（作成されたリソースを削除する）"""
+        if task.cancelled() or task.exception() is not None:
+            return
+        cleanup = asyncio.ensure_future(self._run_discard(discard, task.result()))
+        self._cleanups.add(cleanup)
+        cleanup.add_done_callback(self._cleanups.discard)
+
+    async def _run_discard(self, discard: Callable[[Any], Any], result: Any):
+        try:
+            await run_blocking(discard, result)
+        except Exception as e:
+            print(f"Gemini cleanup Error: {e}")
+
+    async def stream(self, func: Callable[..., Iterator[Any]], *args,
+                     deadline: Optional[float] = None, **kwargs) -> AsyncIterator[Any]:
+        """
+        ストリーミング応答を逐次返す
+
+        最初の要素を受け取る前の一時的なエラーはリトライする。
+        受信開始後のエラーは GeminiCallError として送出する。
+        期限は受信が終わるまでのストリーム全体に適用する。
+
+        Args:
+            func: イテレータを返す関数（client.models.generate_content_stream など）
+            *args: 位置引数
+            deadline: 期限（秒、省略時は既定値）
+            **kwargs: キーワード引数
+
+        Yields:
+            イテレータの各要素
+
+        Raises:
+            GeminiCallError: リトライしても成功しない・期限切れの場合
+        """
+        deadline_at = time.monotonic() + (deadline or self.deadline)
+        model = kwargs.get("model", "")
+        attempt = 0
+        while True:
+            await self.bucket.acquire(deadline_at)
+            started = time.monotonic()
+            last = None
+            items = iterate_blocking(func, *args, **kwargs)
+            try:
+                while True:
+                    remaining = deadline_at - time.monotonic()
+                    if remaining <= 0:
+                        raise asyncio.TimeoutError
+                    try:
+                        item = await asyncio.wait_for(items.__anext__(), remaining)
+                    except StopAsyncIteration:
+                        break
+                    last = item
+                    yield item
+            except asyncio.TimeoutError:
+                gemini_requests.inc(model=model, outcome="error")
+                raise GeminiCallError("Gemini call deadline exceeded", 504) from None
+            except Exception as e:
+                # 受信開始後はリトライしない
+                retry = last is None and is_retryable(e) and attempt < self.max_retries
+                delay = self._backoff(attempt, e) if retry else 0
+                if not retry or time.monotonic() + delay >= deadline_at:
+                    gemini_requests.inc(model=model, outcome="error")
+                    raise _to_call_error(e) from e
+                gemini_requests.inc(model=model, outcome="retry")
+                log_event("gemini_retry", model=model, attempt=attempt + 1,
+                          max_retries=self.max_retries, delay_s=round(delay, 2), error=str(e))
+                attempt += 1
+                await asyncio.sleep(delay)
+                continue
+            finally:
+                await items.aclose()
+            gemini_requests.inc(model=model, outcome="ok")
+            gemini_request_duration.observe(time.monotonic() - started, model=model)
+            # 使用量は最後のチャンクに含まれる
+            record_usage(model, last)
+            return
+
+
+_caller: Optional[GeminiCaller] = None
+
+
+def get_caller() -> GeminiCaller:
+    """全サービスで共有する呼び出しラッパーを取得（初回のみ生成）"""
+    global _caller
+    if _caller is None:
+        _caller = GeminiCaller(
+            rate_per_second=Config.GEMINI_RATE_LIMIT_RPM / 60,
+            burst=Config.GEMINI_RATE_BURST,
+            deadline=Config.GEMINI_CALL_DEADLINE,
+            max_retries=Config.GEMINI_MAX_RETRIES,
+            base_delay=Config.GEMINI_RETRY_BASE_DELAY,
+            max_delay=Config.GEMINI_RETRY_MAX_DELAY,
+            hedge=Config.GEMINI_HEDGE,
+            hedge_min_samples=Config.GEMINI_HEDGE_MIN_SAMPLES
+        )
+    return _caller
+
+
+async def call(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """共有ラッパーで呼び出す（GeminiCaller.call を参照）"""
+    return await get_caller().call(func, *args, **kwargs)
+
+
+def stream(func: Callable[..., Iterator[Any]], *args, **kwargs) -> AsyncIterator[Any]:
+    """共有ラッパーでストリーミング呼び出し（GeminiCaller.stream を参照）"""
+    return get_caller().stream(func, *args, **kwargs)
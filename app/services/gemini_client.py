@@ -0,0 +1,180 @@
+"""
+Google Gemini API - 共有クライアント（HTTPコネクションプール付き）
+"""
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+import requests
+from requests.adapters import HTTPAdapter
+from google import genai
+from google.genai import errors
+from google.genai._api_client import ApiClient, HttpRequest, HttpResponse, RequestJsonEncoder
+from app.config import Config
+
+
+# _PooledApiClient が上書きしている SDK 内部（ApiClient._request_unauthorized・
+# Client._get_api_client）を確認したバージョン。requirements.txt でも固定しており、
+# 異なるバージョンでは上書きせず SDK 標準のクライアントを使う
+_SDK_VERSION = "0.2.2"
+
+
+def _build_session() -> requests.Session:
+    """Gemini API用のHTTPセッション（keep-alive・コネクションプール）を作成"""
+    session = requests.Session()
+    # 環境変数のプロキシ設定には依存せず、Configの値のみを使用する
+    session.trust_env = False
+    proxies = {}
+    if Config.HTTP_PROXY:
+        proxies["http"] = Config.HTTP_PROXY
+    if Config.HTTPS_PROXY:
+        proxies["https"] = Config.HTTPS_PROXY
+    session.proxies.update(proxies)
+
+    adapter = HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=Config.GEMINI_POOL_MAXSIZE,
+        pool_block=False
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class _PooledApiClient(ApiClient):
+    """
+    共有セッションとタイムアウトを使うApiClient
+
+    SDK 0.2.2 は http_options でセッションやタイムアウトを指定できず、
+    リクエストごとに requests.Session を作り直すため、送信部分だけを上書きする。
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.session = _build_session()
+        self.timeout = (Config.GEMINI_CONNECT_TIMEOUT, Config.GEMINI_READ_TIMEOUT)
+
+    def _request_unauthorized(
+        self,
+        http_request: HttpRequest,
+        stream: bool = False,
+    ) -> HttpResponse:
+        data = None
+        if http_request.data:
+            if not isinstance(http_request.data, bytes):
+                data = json.dumps(http_request.data, cls=RequestJsonEncoder)
+            else:
+                data = http_request.data
+
+        response = self.session.request(
+            method=http_request.method,
+            url=http_request.url,
+            headers=http_request.headers,
+            data=data,
+            stream=stream,
+            timeout=self.timeout
+        )
+        errors.APIError.raise_for_response(response)
+        return HttpResponse(
+            response.headers, response if stream else [response.text]
+        )
+
+
+class _PooledClient(genai.Client):
+    """_PooledApiClient を使うGeminiクライアント"""
+
+    @staticmethod
+    def _get_api_client(vertexai=None, api_key=None, credentials=None,
+                        project=None, location=None, debug_config=None,
+                        http_options=None):
+        if debug_config and debug_config.client_mode in ("record", "replay", "auto"):
+            # 記録・再生モード（SDKのテスト用）は SDK 標準の処理に任せる
+            return genai.Client._get_api_client(
+                vertexai=vertexai,
+                api_key=api_key,
+                credentials=credentials,
+                project=project,
+                location=location,
+                debug_config=debug_config,
+                http_options=http_options,
+            )
+        return _PooledApiClient(
+            vertexai=vertexai,
+            api_key=api_key,
+            credentials=credentials,
+            project=project,
+            location=location,
+            http_options=http_options,
+        )
+
+
+_client: Optional[genai.Client] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> genai.Client:
+    """
+    全サービスで共有するGeminiクライアントを取得（初回のみ生成）
+
+    Config.GEMINI_BACKEND が "fake" の場合は、ネットワークに出ない
+    フェイククライアント（fake_gemini.FakeClient）を返す。
+
+    Returns:
+        Geminiクライアント
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None and Config.GEMINI_BACKEND == "fake":
+                from app.services.fake_gemini import FakeBackendSettings, FakeClient
+                _client = FakeClient(FakeBackendSettings(
+                    latency_ms=Config.GEMINI_FAKE_LATENCY_MS,
+                    jitter_ms=Config.GEMINI_FAKE_JITTER_MS,
+                    error_rate=Config.GEMINI_FAKE_ERROR_RATE,
+                    error_code=Config.GEMINI_FAKE_ERROR_CODE
+                ))
+            if _client is None:
+                if not Config.GEMINI_API_KEY:
+                    raise ValueError(
+                        "GEMINI_API_KEY environment variable is not set. "
+                        "Please set it in Render Dashboard > Environment tab."
+                    )
+                if genai.__version__ == _SDK_VERSION:
+                    _client = _PooledClient(api_key=Config.GEMINI_API_KEY)
+                else:
+                    print(
+                        f"google-genai {genai.__version__} is not {_SDK_VERSION}; "
+                        "using the SDK client without connection pooling"
+                    )
+                    _client = genai.Client(api_key=Config.GEMINI_API_KEY)
+    return _client
+
+
+def warmup(connections: int = 1) -> int:
+    """
+    Gemini APIへのTCP/TLS接続を事前に確立してプールに保持
+
+    Args:
+        connections: 確立する接続数
+
+    Returns:
+        確立に成功した接続数
+    """
+    if Config.GEMINI_BACKEND == "fake":
+        return 0
+    api_client = get_client()._api_client
+    if not isinstance(api_client, _PooledApiClient):
+        return 0
+    base_url = api_client.get_read_only_http_options()["base_url"]
+
+    def _open(_):
+        try:
+            api_client.session.head(base_url, timeout=api_client.timeout)
+            return True
+        except requests.RequestException as e:
+            print(f"Gemini warm-up failed: {e}")
+            return False
+
+    # 同時に送ることで、プールに複数の接続を残す
+    with ThreadPoolExecutor(max_workers=connections) as pool:
+        return sum(pool.map(_open, range(connections)))
@@ -1,39 +1,39 @@
 """
 Google Gemini API - 要約生成サービス
 """
-import os
-from google import genai
-from app.config import Config
+from typing import AsyncIterator, Optional
+from app.services import gemini_call
+from app.services.gemini_call import GeminiCallError
+from app.services.context_cache import ContextCache
+from app.services.gemini_client import get_client
+from app.services.model_router import ModelRouter, ROUTE_MINUTES, ROUTE_SUMMARY
+from app.services.result_cache import ResultCache, make_key
+
+SUMMARY_MODEL = 'gemini-2.5-flash'
 
 class GeminiService:
     """Gemini要約生成サービス"""
     
-    def __init__(self):
-        """Gemini APIの初期化"""
-        # 環境変数を設定
-        os.environ['GOOGLE_API_KEY'] = Config.GEMINI_API_KEY
-        
-        # プロキシ設定
-        if Config.HTTP_PROXY:
-            os.environ['HTTP_PROXY'] = Config.HTTP_PROXY
-        if Config.HTTPS_PROXY:
-            os.environ['HTTPS_PROXY'] = Config.HTTPS_PROXY
-            
-        self.client = genai.Client()
-    
-    async def summarize(self, question: str, answer: str) -> str:
+    def __init__(self, cache: Optional[ResultCache] = None,
+                 router: Optional[ModelRouter] = None,
+                 context_cache: Optional[ContextCache] = None):
         """
-        回答を要約
+        Gemini APIの初期化（共有クライアントを使用）
         
         Args:
-            question: 質問文
-            answer: 回答文
-            
-        Returns:
-            要約文
+            cache: 要約結果のキャッシュ（Noneの場合はキャッシュしない）
+            router: モデルの振り分け（Noneの場合は常に SUMMARY_MODEL）
+            context_cache: プロンプト固定部分のコンテキストキャッシュ（Noneの場合は使わない）
         """
-        try:
-            prompt = f"""
+        self.client = get_client()
+        self.cache = cache
+        self.router = router or ModelRouter(SUMMARY_MODEL)
+        self.context_cache = context_cache
+    
+    @staticmethod
+    def _build_prompt(question: str, answer: str) -> str:
+        """要約用プロンプトを作成"""
+        return f"""
 以下はインタビューの回答です。
 議事録用に簡潔に要約してください。
 箇条書きまたは1〜2文程度でまとめてください。
@@ -43,15 +43,161 @@ class GeminiService:
 
 要約:
 """
+    
+    def _static_length(self, question: str, answer: str, static_prefix: str) -> int:
+        """プロンプト先頭から回答の固定部分の終わりまでの長さ（コンテキストキャッシュの対象）"""
+        if self.context_cache is None or not static_prefix or not answer.startswith(static_prefix):
+            return 0
+        head = self._build_prompt(question, "\0").split("\0")[0]
+        return len(head) + len(static_prefix)
+    
+    async def summarize(self, question: str, answer: str, route: str = ROUTE_SUMMARY,
+                        static_prefix: str = "") -> str:
+        """
+        回答を要約
+        
+        Args:
+            question: 質問文
+            answer: 回答文
+            route: モデル振り分けの用途（回答の文字数で判定）
+            static_prefix: 回答のうち呼び出しをまたいで変わらない先頭部分
+                （コンテキストキャッシュに登録し、残りだけを送信する）
             
-            response = self.client.models.generate_content(
-                model='gemini-2.5-flash',
-                contents=prompt
-            )
-            summary = response.text.strip()
+        Returns:
+            要約文
             
-            return summary
+        Raises:
+            GeminiCallError: 要約生成に失敗した場合
+        """
+        prompt = self._build_prompt(question, answer)
+        model = self.router.select(route, len(answer))
+        static_len = self._static_length(question, answer, static_prefix)
+        
+        if self.cache is None:
+            return await self._generate(prompt, model, static_len)
+        key = make_key("summarize", model, prompt)
+        return await self.cache.get_or_compute(
+            key, lambda: self._generate(prompt, model, static_len)
+        )
+    
+    async def summarize_stream(self, question: str, answer: str, route: str = ROUTE_SUMMARY,
+                               static_prefix: str = "") -> AsyncIterator[str]:
+        """
+        回答を要約し、生成されたテキストを逐次返す
+        
+        キャッシュ済みの場合は全文を一度に返す。失敗時は GeminiCallError を送出する。
+        
+        Args:
+            question: 質問文
+            answer: 回答文
+            route: モデル振り分けの用途（回答の文字数で判定）
+            static_prefix: 回答のうち呼び出しをまたいで変わらない先頭部分
+            
+        Yields:
+            要約文の断片
+        """
+        prompt = self._build_prompt(question, answer)
+        model = self.router.select(route, len(answer))
+        key = make_key("summarize", model, prompt)
+        if self.cache is not None:
+            cached = await self.cache.get(key)
+            if cached is not None:
+                yield cached
+                return
+        
+        parts = []
+        static_len = self._static_length(question, answer, static_prefix)
+        async for chunk in self._stream(prompt, model, static_len):
+            text = chunk.text
+            if text:
+                # 先頭の空白は非ストリーミング版の strip() に合わせて除去
+                if not parts:
+                    text = text.lstrip()
+                    if not text:
+                        continue
+                parts.append(text)
+                yield text
+        
+        if self.cache is not None and parts:
+            await self.cache.set(key, "".join(parts).strip())
+    
+    async def generate(self, prompt: str, route: str = ROUTE_MINUTES) -> str:
+        """
+        プロンプトをそのまま送信して生成
+        
+        Args:
+            prompt: プロンプト
+            route: モデル振り分けの用途（プロンプトの文字数で判定）
             
-        except Exception as e:
-            print(f"Summarization Error: {e}")
-            return "（要約生成に失敗しました）"
+        Returns:
+            生成テキスト（失敗時は GeminiCallError を送出）
+        """
+        model = self.router.select(route, len(prompt))
+        if self.cache is None:
+            return await self._generate(prompt, model)
+        key = make_key("generate", model, prompt)
+        return await self.cache.get_or_compute(key, lambda: self._generate(prompt, model))
+    
+    async def _cached_content(self, prompt: str, model: str, static_len: int) -> Optional[str]:
+        """プロンプト先頭 static_len 文字を登録したコンテキストキャッシュ名"""
+        if not static_len:
+            return None
+        return await self.context_cache.get(model, prompt[:static_len])
+    
+    async def _generate(self, prompt: str, model: str, static_len: int = 0) -> str:
+        """Gemini APIで生成（失敗時は例外を送出）"""
+        response = None
+        cached_content = await self._cached_content(prompt, model, static_len)
+        if cached_content is not None:
+            try:
+                response = await gemini_call.call(
+                    self.client.models.generate_content,
+                    idempotent=True,
+                    model=model,
+                    contents=prompt[static_len:],
+                    config={'cached_content': cached_content}
+                )
+            except GeminiCallError as e:
+                # キャッシュの期限切れなどはプロンプト全体で送り直す
+                print(f"Cached content Error: {e}")
+                self.context_cache.invalidate(model, prompt[:static_len])
+        if response is None:
+            response = await gemini_call.call(
+                self.client.models.generate_content,
+                idempotent=True,
+                model=model,
+                contents=prompt
+            )
+        summary = (response.text or "").strip()
+        if not summary:
+            raise GeminiCallError("Gemini returned an empty response")
+        
+        return summary
+    
+    async def _stream(self, prompt: str, model: str, static_len: int = 0) -> AsyncIterator:
+        """ストリーミング生成（キャッシュを使った呼び出しが受信前に失敗したら全文で再送）"""
+        cached_content = await self._cached_content(prompt, model, static_len)
+        if cached_content is not None:
+            received = False
+            try:
+                async for chunk in gemini_call.stream(
+                    self.client.models.generate_content_stream,
+                    model=model,
+                    contents=prompt[static_len:],
+                    config={'cached_content': cached_content}
+                ):
+                    received = True
+                    yield chunk
+                return
+            except GeminiCallError as e:
+                if received:
+                    raise
+                print(f"Cached content Error: {e}")
+                self.context_cache.invalidate(model, prompt[:static_len])
+        
+        async for chunk in gemini_call.stream(
+            self.client.models.generate_content_stream,
+            model=model,
+            contents=prompt
+        ):
+            yield chunk
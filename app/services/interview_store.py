@@ -0,0 +1,369 @@
+"""
+インタビュー状態の永続化（SQLite・WALモード、複数ワーカープロセスで共有）
+"""
+import asyncio
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+from app import metrics
+from app.domain.summary import Summary
+from app.domain.transcript import Transcript
+
+# 1回のトランザクションで実行するSQL（文, パラメータ）の並び
+_Statements = Sequence[Tuple[str, tuple]]
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS sessions ("
+    " session_id TEXT PRIMARY KEY,"
+    " interview_type TEXT NOT NULL,"
+    " created_at REAL NOT NULL,"
+    " updated_at REAL NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS idx_sessions_updated ON sessions (updated_at)",
+    "CREATE TABLE IF NOT EXISTS transcripts ("
+    " session_id TEXT NOT NULL REFERENCES sessions (session_id) ON DELETE CASCADE,"
+    " question_id INTEGER NOT NULL,"
+    " question_text TEXT NOT NULL,"
+    " raw_text TEXT NOT NULL,"
+    " created_at REAL NOT NULL,"
+    " PRIMARY KEY (session_id, question_id)) WITHOUT ROWID",
+    "CREATE TABLE IF NOT EXISTS summaries ("
+    " session_id TEXT NOT NULL REFERENCES sessions (session_id) ON DELETE CASCADE,"
+    " question_id INTEGER NOT NULL,"
+    " question_text TEXT NOT NULL,"
+    " summary_text TEXT NOT NULL,"
+    " category TEXT NOT NULL,"
+    " created_at REAL NOT NULL,"
+    " PRIMARY KEY (session_id, question_id)) WITHOUT ROWID",
+    "CREATE TABLE IF NOT EXISTS minutes ("
+    " session_id TEXT PRIMARY KEY REFERENCES sessions (session_id) ON DELETE CASCADE,"
+    " interview_type TEXT NOT NULL,"
+    " content TEXT NOT NULL,"
+    " created_at REAL NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS idx_minutes_created ON minutes (created_at)",
+)
+
+store_batch_size = metrics.histogram(
+    "interview_store_batch_size",
+    "Writes committed together in one interview store transaction",
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200)
+)
+
+
+@dataclass
+class StoredSession:
+    """永続化されたセッション（要約を含む）"""
+    session_id: str
+    interview_type: str
+    updated_at: float
+    summaries: List[Summary]
+
+
+def _connect(db_path: Path) -> sqlite3.Connection:
+    # トランザクションは明示的に開始する（isolation_level=None）
+    conn = sqlite3.connect(
+        str(db_path), check_same_thread=False, timeout=10, isolation_level=None
+    )
+    conn.execute("PRAGMA journal_mode=WAL")
+    # WALでは NORMAL でもコミット済みデータの整合性は保たれる（電源断時に直近のみ失われうる）
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    return conn
+
+
+class InterviewStore:
+    """
+    セッション・文字起こし・要約・議事録をSQLiteに保存するストア
+
+    複数のワーカープロセスが同じファイルを開いて共有する（WALモードのため
+    読み込みは書き込みを待たない）。書き込みは flush_interval 秒の間に届いたものを
+    まとめて1回のトランザクションでコミットし、各呼び出しはコミット完了まで待つ
+    （グループコミット）。応答を返した時点で他のワーカーからも読める。
+    """
+
+    def __init__(self, db_path: Path, ttl_seconds: float, flush_interval: float = 0.005,
+                 batch_size: int = 100):
+        """
+        Args:
+            db_path: SQLiteファイルのパス
+            ttl_seconds: 最終更新からセッションを保持する秒数
+            flush_interval: 書き込みをまとめる待ち時間（秒）
+            batch_size: この件数がたまったら待たずにコミットする
+        """
+        self.ttl_seconds = ttl_seconds
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self._write_conn = _connect(db_path)
+        for statement in _SCHEMA:
+            self._write_conn.execute(statement)
+        self._read_conn = _connect(db_path)
+        self._write_lock = threading.Lock()
+        self._read_lock = threading.Lock()
+        self._pending: List[Tuple[_Statements, asyncio.Future]] = []
+        self._batch_full = asyncio.Event()
+        self._flusher: Optional[asyncio.Task] = None
+        self._commits = 0
+
+    # --- 書き込み ---
+
+    async def _write(self, statements: _Statements):
+        """SQLを次のバッチに追加し、コミットされるまで待つ"""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((statements, future))
+        if len(self._pending) >= self.batch_size:
+            self._batch_full.set()
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_loop())
+        await asyncio.shield(future)
+
+    async def _flush_loop(self):
+        while self._pending:
+            if len(self._pending) < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._batch_full.wait(), self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+            self._batch_full.clear()
+            batch, self._pending = self._pending, []
+            try:
+                errors = await asyncio.to_thread(self._commit, [s for s, _ in batch])
+            except Exception as e:
+                print(f"Interview store write Error: {e}")
+                errors = [e] * len(batch)
+            for (_, future), error in zip(batch, errors):
+                if future.done():
+                    continue
+                if error is None:
+                    future.set_result(None)
+                else:
+                    future.set_exception(error)
+
+    def _commit(self, batch: List[_Statements]) -> List[Optional[Exception]]:
+        """
+        バッチを1回のトランザクションでコミット
+
+        書き込み単位ごとにセーブポイントを置き、失敗したもの（削除済みの
+        セッションへの書き込みなど）だけを取り消す。
+
+        Returns:
+            書き込み単位ごとの例外（成功した場合はNone）
+        """
+        store_batch_size.observe(len(batch))
+        errors: List[Optional[Exception]] = []
+        with self._write_lock:
+            try:
+                self._write_conn.execute("BEGIN IMMEDIATE")
+                for statements in batch:
+                    self._write_conn.execute("SAVEPOINT item")
+                    try:
+                        for sql, params in statements:
+                            self._write_conn.execute(sql, params)
+                    except sqlite3.DatabaseError as e:
+                        self._write_conn.execute("ROLLBACK TO item")
+                        errors.append(e)
+                    else:
+                        errors.append(None)
+                    self._write_conn.execute("RELEASE item")
+                self._commits += 1
+                # コミット100回ごとに期限切れのセッションを削除（関連データも削除される）
+                if self._commits % 100 == 0:
+                    self._write_conn.execute(
+                        "DELETE FROM sessions WHERE updated_at < ?",
+                        (time.time() - self.ttl_seconds,)
+                    )
+                self._write_conn.execute("COMMIT")
+            except Exception:
+                if self._write_conn.in_transaction:
+                    self._write_conn.execute("ROLLBACK")
+                raise
+        return errors
+
+    async def create_session(self, session_id: str, interview_type: str) -> float:
+        """
+        セッションを登録
+
+        Args:
+            session_id: セッションID
+            interview_type: インタビュータイプ
+
+        Returns:
+            セッションの更新時刻（UNIX時間）
+        """
+        now = time.time()
+        await self._write([(
+            "INSERT INTO sessions VALUES (?, ?, ?, ?)",
+            (session_id, interview_type, now, now)
+        )])
+        return now
+
+    async def save_answer(self, session_id: str, summary: Summary,
+                          transcript: Optional[Transcript] = None) -> float:
+        """
+        回答（要約と文字起こし）を保存し、セッションの更新時刻を進める
+
+        Args:
+            session_id: セッションID
+            summary: 要約
+            transcript: 文字起こし
+
+        Returns:
+            セッションの更新時刻（UNIX時間）
+        """
+        now = time.time()
+        statements = [
+            (
+                "INSERT OR REPLACE INTO summaries VALUES (?, ?, ?, ?, ?, ?)",
+                (session_id, summary.question_id, summary.question_text,
+                 summary.summary_text, summary.category, now)
+            ),
+            (
+                "UPDATE sessions SET updated_at = ? WHERE session_id = ?",
+                (now, session_id)
+            ),
+        ]
+        if transcript is not None:
+            statements.insert(0, (
+                "INSERT OR REPLACE INTO transcripts VALUES (?, ?, ?, ?, ?)",
+                (session_id, transcript.question_id, transcript.question_text,
+                 transcript.raw_text, transcript.timestamp.timestamp())
+            ))
+        await self._write(statements)
+        return now
+
+    async def save_minutes(self, session_id: str, interview_type: str, content: str) -> float:
+        """
+        整形済みの議事録を保存（セッションごとに最新の1件）
+
+        Args:
+            session_id: セッションID
+            interview_type: インタビュータイプ
+            content: 整形済みの議事録テキスト
+
+        Returns:
+            セッションの更新時刻（UNIX時間）
+        """
+        now = time.time()
+        await self._write([
+            (
+                "INSERT OR REPLACE INTO minutes VALUES (?, ?, ?, ?)",
+                (session_id, interview_type, content, now)
+            ),
+            (
+                "UPDATE sessions SET updated_at = ? WHERE session_id = ?",
+                (now, session_id)
+            ),
+        ])
+        return now
+
+    async def delete_session(self, session_id: str):
+        """セッションと関連データを削除"""
+        await self._write([("DELETE FROM sessions WHERE session_id = ?", (session_id,))])
+
+    # --- 読み込み ---
+
+    def _query(self, sql: str, params: tuple) -> list:
+        with self._read_lock:
+            return self._read_conn.execute(sql, params).fetchall()
+
+    def _load_session(self, session_id: str) -> Optional[StoredSession]:
+        rows = self._query(
+            "SELECT interview_type, updated_at FROM sessions"
+            " WHERE session_id = ? AND updated_at >= ?",
+            (session_id, time.time() - self.ttl_seconds)
+        )
+        if not rows:
+            return None
+        interview_type, updated_at = rows[0]
+        summaries = [
+            Summary(question_id=row[0], question_text=row[1], summary_text=row[2], category=row[3])
+            for row in self._query(
+                "SELECT question_id, question_text, summary_text, category FROM summaries"
+                " WHERE session_id = ? ORDER BY question_id",
+                (session_id,)
+            )
+        ]
+        return StoredSession(session_id, interview_type, updated_at, summaries)
+
+    async def get_session(self, session_id: str) -> Optional[StoredSession]:
+        """
+        セッションと要約を取得
+
+        Args:
+            session_id: セッションID
+
+        Returns:
+            セッション（存在しない・期限切れの場合はNone）
+        """
+        return await asyncio.to_thread(self._load_session, session_id)
+
+    async def session_updated_at(self, session_id: str) -> Optional[float]:
+        """
+        セッションの最終更新時刻（他のワーカーでの更新の確認用）
+
+        Args:
+            session_id: セッションID
+
+        Returns:
+            最終更新時刻（UNIX時間）。存在しない・期限切れの場合はNone
+        """
+        rows = await asyncio.to_thread(
+            self._query,
+            "SELECT updated_at FROM sessions WHERE session_id = ? AND updated_at >= ?",
+            (session_id, time.time() - self.ttl_seconds)
+        )
+        return rows[0][0] if rows else None
+
+    async def get_transcripts(self, session_id: str) -> List[Transcript]:
+        """
+        セッションの文字起こしを質問ID順に取得
+
+        Args:
+            session_id: セッションID
+
+        Returns:
+            文字起こしのリスト
+        """
+        rows = await asyncio.to_thread(
+            self._query,
+            "SELECT question_id, question_text, raw_text, created_at FROM transcripts"
+            " WHERE session_id = ? ORDER BY question_id",
+            (session_id,)
+        )
+        return [
+            Transcript(question_id=row[0], question_text=row[1], raw_text=row[2],
+                       timestamp=datetime.fromtimestamp(row[3]))
+            for row in rows
+        ]
+
+    async def get_minutes(self, session_id: str) -> Optional[Tuple[str, str]]:
+        """
+        保存済みの議事録を取得
+
+        議事録の保存後に回答が追加・変更された場合は古い内容なので返さない。
+
+        Args:
+            session_id: セッションID
+
+        Returns:
+            (インタビュータイプ, 整形済みの議事録テキスト)。ない場合はNone
+        """
+        rows = await asyncio.to_thread(
+            self._query,
+            "SELECT interview_type, content FROM minutes WHERE session_id = ?"
+            " AND created_at >= (SELECT COALESCE(MAX(created_at), 0) FROM summaries"
+            " WHERE session_id = ?)",
+            (session_id, session_id)
+        )
+        return (rows[0][0], rows[0][1]) if rows else None
+
+    async def close(self):
+        """未コミットの書き込みを反映して接続を閉じる"""
+        if self._flusher is not None:
+            await self._flusher
+        with self._write_lock:
+            self._write_conn.close()
+        with self._read_lock:
+            self._read_conn.close()
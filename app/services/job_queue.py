@@ -0,0 +1,226 @@
+"""
+バックグラウンドジョブキュー（議事録生成の非同期実行）
+"""
+import asyncio
+import secrets
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+# ジョブの状態
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+
+class QueueFullError(Exception):
+    """待機中のジョブが上限に達している"""
+
+
+@dataclass
+class Job:
+    """ジョブデータクラス"""
+    job_id: str
+    key: str
+    func: Callable[[], Awaitable[Any]]
+    status: str = JOB_QUEUED
+    result: Any = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.monotonic)
+    finished_at: Optional[float] = None
+    _changed: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        """完了（成功・失敗）したかどうか"""
+        return self.status in (JOB_DONE, JOB_FAILED)
+
+    def _set_status(self, status: str):
+        self.status = status
+        if self.finished:
+            self.finished_at = time.monotonic()
+        # 待機中の購読者を起こし、次の変更用に新しいイベントを用意する
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def wait_for_change(self, timeout: float) -> bool:
+        """
+        状態が変わるまで待機
+
+        Args:
+            timeout: 最大待機秒数
+
+        Returns:
+            状態が変わった場合はTrue
+        """
+        if self.finished:
+            return False
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def to_dict(self) -> dict:
+        """APIレスポンス用の辞書"""
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "error": self.error
+        }
+
+
+class JobQueue:
+    """
+    固定数のワーカーでジョブを実行するキュー
+
+    待機中のジョブ数が max_pending に達すると submit は QueueFullError を
+    送出する（バックプレッシャー）。同じ冪等キーのジョブが実行中・完了済みの
+    場合は新しいジョブを作らずに既存のジョブを返す（完了済みでも結果が
+    使えなくなっている場合は登録し直す）。完了したジョブは ttl_seconds 経過後に破棄する。
+    """
+
+    def __init__(self, workers: int, max_pending: int, ttl_seconds: float,
+                 result_available: Optional[Callable[[Any], bool]] = None):
+        """
+        Args:
+            workers: 同時に実行するジョブ数
+            max_pending: 待機できるジョブ数の上限
+            ttl_seconds: 完了したジョブを保持する秒数
+            result_available: 完了したジョブの結果がまだ使えるかを判定する関数
+                （結果が別の場所に保存され、先に破棄されうる場合）
+        """
+        self.workers = workers
+        self.max_pending = max_pending
+        self.ttl_seconds = ttl_seconds
+        self.result_available = result_available
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._by_key: Dict[str, str] = {}
+
+    def start(self):
+        """ワーカーを起動"""
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_pending)
+        self._tasks = [
+            asyncio.create_task(self._worker()) for _ in range(self.workers)
+        ]
+
+    async def stop(self):
+        """ワーカーを停止"""
+        pending = set(self._tasks)
+        while pending:
+            # 実行中のジョブの wait_for などが完了と同時に届いたキャンセルを
+            # 握りつぶすことがあるため、止まるまでキャンセルし直す
+            for task in pending:
+                task.cancel()
+            _, pending = await asyncio.wait(pending, timeout=1)
+        self._tasks = []
+
+    def submit(self, key: str, func: Callable[[], Awaitable[Any]]) -> Job:
+        """
+        ジョブを登録
+
+        Args:
+            key: 冪等キー（同じキーの重複登録は既存ジョブを返す）
+            func: 実行するコルーチン関数
+
+        Returns:
+            ジョブ
+
+        Raises:
+            QueueFullError: 待機中のジョブが上限に達している場合
+        """
+        self.start()
+        existing = self.find(key)
+        if existing is not None:
+            return existing
+
+        job = Job(job_id=secrets.token_urlsafe(12), key=key, func=func)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise QueueFullError("Too many pending jobs")
+        self._jobs[job.job_id] = job
+        self._by_key[key] = job.job_id
+        return job
+
+    def find(self, key: str) -> Optional[Job]:
+        """
+        冪等キーで実行中・完了済みのジョブを検索
+
+        失敗したジョブ・結果が破棄されたジョブは見つからなかったものとして扱う
+        （同じキーでの再登録を許可する）。
+
+        Args:
+            key: 冪等キー
+
+        Returns:
+            ジョブ（該当なしの場合はNone）
+        """
+        self._evict()
+        job_id = self._by_key.get(key)
+        existing = self._jobs.get(job_id) if job_id is not None else None
+        if existing is None or existing.status == JOB_FAILED:
+            return None
+        if (
+            existing.status == JOB_DONE
+            and self.result_available is not None
+            and not self.result_available(existing.result)
+        ):
+            return None
+        return existing
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """
+        ジョブを取得
+
+        Args:
+            job_id: ジョブID
+
+        Returns:
+            ジョブ（存在しない・破棄済みの場合はNone）
+        """
+        self._evict()
+        return self._jobs.get(job_id)
+
+    @property
+    def pending(self) -> int:
+        """待機中のジョブ数"""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            try:
+                job._set_status(JOB_RUNNING)
+                job.result = await job.func()
+                job._set_status(JOB_DONE)
+            except asyncio.CancelledError:
+                job.error = "cancelled"
+                job._set_status(JOB_FAILED)
+                raise
+            except Exception as e:
+                print(f"Job {job.job_id} failed: {e}")
+                job.error = str(e)
+                job._set_status(JOB_FAILED)
+            finally:
+                # 完了後は入力（クロージャ）を保持しない
+                job.func = None
+                self._queue.task_done()
+
+    def _evict(self):
+        """保持期間を過ぎた完了済みジョブを破棄"""
+        now = time.monotonic()
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished and now - job.finished_at > self.ttl_seconds
+        ]
+        for job_id in expired:
+            job = self._jobs.pop(job_id)
+            if self._by_key.get(job.key) == job_id:
+                del self._by_key[job.key]
@@ -0,0 +1,317 @@
+"""
+議事録生成サービス（要約プロンプトの組み立て・Gemini整形・Word出力）
+"""
+import asyncio
+import re
+import time
+from dataclasses import dataclass
+from typing import AsyncIterator, List
+from app import metrics
+from app.domain.interview_config import InterviewConfig
+from app.domain.summary import Summary
+from app.observability import log_event
+from app.services.document_store import GeneratedDocument
+from app.services import cpu_pool
+from app.services.docx_service import render_minutes, write_minutes
+from app.services.gemini_service import GeminiService
+from app.services.model_router import ROUTE_MINUTES, ROUTE_MINUTES_MAP
+
+# 議事録作成時に Gemini へ渡す質問ラベル
+MINUTES_QUESTION = "議事録作成"
+
+# map段階（チャンクごとの要点整理）のプロンプト
+MAP_PROMPT = """以下はインタビューの質問と回答の一部です。
+後で議事録に整形するため、固有名詞・数値・日付・決定事項・課題を落とさずに、
+質問ごとに【カテゴリー】と質問文を残したまま回答を簡潔に整理してください。
+
+{chunk}"""
+
+# 全角文字（日本語など）の判定
+_CJK_PATTERN = re.compile(r"[　-ヿ㐀-鿿豈-﫿＀-￯]")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    テキストのトークン数を概算（APIを呼ばない簡易見積もり）
+    
+    日本語（全角文字）は1文字≒1トークン、それ以外は4文字≒1トークンとして数える。
+    
+    Args:
+        text: 対象テキスト
+        
+    Returns:
+        推定トークン数
+    """
+    cjk = len(_CJK_PATTERN.findall(text))
+    return cjk + (len(text) - cjk + 3) // 4
+
+
+@dataclass
+class QAItem:
+    """質問と回答1件分のテキスト"""
+    category: str
+    text: str
+
+
+@dataclass
+class MinutesInput:
+    """議事録生成の入力データクラス"""
+    interview_type: str
+    instructions: str
+    qa_items: List[QAItem]
+    summaries: List[Summary]
+
+    @property
+    def prompt(self) -> str:
+        """単発の整形に使う要約用プロンプト（指示文＋全QAテキスト）"""
+        return self.build_prompt("".join(item.text for item in self.qa_items))
+
+    def build_prompt(self, qa_text: str) -> str:
+        """指示文とQAテキストを連結して要約用プロンプトを作成"""
+        return f"{self.instructions}\n\n{qa_text}".strip()
+
+    @property
+    def filename(self) -> str:
+        """ダウンロード時のファイル名"""
+        return f"議事録_{self.summaries[0].question_id if self.summaries else 'output'}.docx"
+
+
+def split_chunks(items: List[QAItem], max_tokens: int) -> List[str]:
+    """
+    QAをカテゴリー単位でまとめ、トークン上限以内のチャンクに分割
+    
+    同じカテゴリーの回答はなるべく同じチャンクに入れ、上限に収まる範囲で
+    隣接カテゴリーをまとめる。1件で上限を超える回答はそのまま1チャンクにする。
+    
+    Args:
+        items: QAリスト（質問順）
+        max_tokens: 1チャンクあたりのトークン上限
+        
+    Returns:
+        チャンクのテキストリスト
+    """
+    # カテゴリーごとにグループ化（質問順を維持）
+    groups: List[List[QAItem]] = []
+    for item in items:
+        if groups and groups[-1][0].category == item.category:
+            groups[-1].append(item)
+        else:
+            groups.append([item])
+    
+    chunks: List[str] = []
+    current = ""
+    current_tokens = 0
+    for group in groups:
+        group_text = "".join(item.text for item in group)
+        group_tokens = estimate_tokens(group_text)
+        if group_tokens > max_tokens:
+            # カテゴリー単体で上限を超える場合は回答単位で分割
+            pieces = [item.text for item in group]
+        else:
+            pieces = [group_text]
+        for piece in pieces:
+            tokens = estimate_tokens(piece)
+            if current and current_tokens + tokens > max_tokens:
+                chunks.append(current)
+                current, current_tokens = "", 0
+            current += piece
+            current_tokens += tokens
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def prepare_minutes(config: InterviewConfig, answers: dict) -> MinutesInput:
+    """
+    全回答から議事録生成の入力を作成
+    
+    Args:
+        config: インタビュータイプの設定
+        answers: {question_id: {"transcript": "..."}, ...}
+    
+    Returns:
+        議事録生成の入力
+    """
+    type_flow = config.question_flow
+    
+    # 全質問と回答をまとめたテキストを作成
+    qa_items = []
+    summaries = []
+    for question_id_str, answer_data in answers.items():
+        question = type_flow.get_question(int(question_id_str))
+        if not question:
+            continue
+        if answer_data.get("transcript"):
+            qa_items.append(QAItem(
+                category=question.category,
+                text=(
+                    f"【{question.category}】{question.text}\n"
+                    f"回答: {answer_data['transcript']}\n\n"
+                )
+            ))
+        summaries.append(Summary(
+            question_id=question.id,
+            question_text=question.text,
+            summary_text=answer_data.get("transcript", ""),
+            category=question.category
+        ))
+    
+    return MinutesInput(
+        interview_type=config.interview_type,
+        instructions=config.instructions,
+        qa_items=qa_items,
+        summaries=summaries
+    )
+
+
+class MinutesService:
+    """議事録生成サービス"""
+    
+    def __init__(self, gemini_service: GeminiService,
+                 spill_to_disk: bool = False, map_reduce_threshold: int = 6000,
+                 chunk_tokens: int = 2000, map_concurrency: int = 4,
+                 context_cache_min_tokens: int = 0):
+        """
+        Args:
+            gemini_service: 要約生成サービス
+            spill_to_disk: Word文書をメモリではなくディスクに書き出す
+            map_reduce_threshold: 要約用プロンプトの推定トークン数がこれを超えたら map-reduce で整形
+            chunk_tokens: map-reduce の1チャンクあたりのトークン上限
+            map_concurrency: map段階の同時実行数
+            context_cache_min_tokens: 指示文の推定トークン数がこれ以上なら
+                コンテキストキャッシュに登録する（0で無効）
+        """
+        self.gemini_service = gemini_service
+        self.spill_to_disk = spill_to_disk
+        self.map_reduce_threshold = map_reduce_threshold
+        self.chunk_tokens = chunk_tokens
+        self.map_concurrency = map_concurrency
+        self.context_cache_min_tokens = context_cache_min_tokens
+    
+    def prepare(self, config: InterviewConfig, answers: dict) -> MinutesInput:
+        """
+        全回答から要約用プロンプトとSummaryリストを作成
+        
+        1ms未満で終わる処理のため、プロセスプールには送らずイベントループで実行する
+        （設定の pickle とプロセス間の往復のほうが高くつき、プールの枠も消費する）。
+        
+        Args:
+            config: インタビュータイプの設定
+            answers: {question_id: {"transcript": "..."}, ...}
+            
+        Returns:
+            議事録生成の入力
+        """
+        with metrics.timed("minutes_prepare"):
+            return prepare_minutes(config, answers)
+    
+    def use_map_reduce(self, minutes: MinutesInput) -> bool:
+        """推定トークン数から map-reduce で整形するかどうかを判定"""
+        return (
+            len(minutes.qa_items) > 1
+            and estimate_tokens(minutes.prompt) > self.map_reduce_threshold
+        )
+    
+    async def _reduce_prompt(self, minutes: MinutesInput) -> str:
+        """
+        最終整形用のプロンプトを作成
+        
+        入力が大きい場合はチャンクごとに並列で要点整理（map）し、その結果を
+        指示文と連結する。単発で送れる大きさの場合は全QAテキストをそのまま使う。
+        """
+        if not self.use_map_reduce(minutes):
+            return minutes.prompt
+        
+        chunks = split_chunks(minutes.qa_items, self.chunk_tokens)
+        log_event("minutes_map_reduce", interview_type=minutes.interview_type, chunks=len(chunks))
+        semaphore = asyncio.Semaphore(self.map_concurrency)
+        
+        async def _map(chunk: str) -> str:
+            async with semaphore:
+                try:
+                    return await self.gemini_service.generate(
+                        MAP_PROMPT.format(chunk=chunk), route=ROUTE_MINUTES_MAP
+                    )
+                except Exception as e:
+                    # 失敗したチャンクは原文のまま最終整形に渡す
+                    print(f"Map summarization Error: {e}")
+                    return chunk
+        
+        with metrics.timed("minutes_map"):
+            partials = await asyncio.gather(*(_map(chunk) for chunk in chunks))
+        return minutes.build_prompt("\n\n".join(p.strip() for p in partials))
+    
+    def _static_prefix(self, minutes: MinutesInput) -> str:
+        """コンテキストキャッシュに登録する指示文（小さすぎる場合は登録しない）"""
+        if (
+            self.context_cache_min_tokens > 0
+            and estimate_tokens(minutes.instructions) >= self.context_cache_min_tokens
+        ):
+            return minutes.instructions
+        return ""
+    
+    async def format(self, minutes: MinutesInput) -> str:
+        """
+        Gemini APIで全体を要約・整形
+        
+        Args:
+            minutes: 議事録生成の入力
+            
+        Returns:
+            整形済みの議事録テキスト
+        """
+        prompt = await self._reduce_prompt(minutes)
+        log_event("minutes_format", interview_type=minutes.interview_type,
+                  estimated_tokens=estimate_tokens(prompt))
+        with metrics.timed("minutes_format"):
+            return await self.gemini_service.summarize(
+                MINUTES_QUESTION, prompt, route=ROUTE_MINUTES,
+                static_prefix=self._static_prefix(minutes)
+            )
+    
+    async def format_stream(self, minutes: MinutesInput) -> AsyncIterator[str]:
+        """
+        Gemini APIで全体を要約・整形し、生成されたテキストを逐次返す
+        
+        Args:
+            minutes: 議事録生成の入力
+            
+        Yields:
+            整形済みテキストの断片
+        """
+        prompt = await self._reduce_prompt(minutes)
+        log_event("minutes_format", interview_type=minutes.interview_type,
+                  estimated_tokens=estimate_tokens(prompt), stream=True)
+        started = time.perf_counter()
+        first = True
+        async for text in self.gemini_service.summarize_stream(
+            MINUTES_QUESTION, prompt, route=ROUTE_MINUTES,
+            static_prefix=self._static_prefix(minutes)
+        ):
+            if first:
+                metrics.record_stage("minutes_first_token", time.perf_counter() - started)
+                first = False
+            yield text
+        metrics.record_stage("minutes_format", time.perf_counter() - started)
+    
+    async def render(self, minutes: MinutesInput, formatted_content: str) -> GeneratedDocument:
+        """
+        Word文書生成（整形済みの内容を含める）
+        
+        spill_to_disk が False の場合はメモリ上に生成し、True の場合は
+        一意なファイル名でディスクに書き出す（不要になったら cleanup() で削除）。
+        
+        Args:
+            minutes: 議事録生成の入力
+            formatted_content: 整形済みの議事録テキスト
+            
+        Returns:
+            生成済み文書
+        """
+        # 生成はプロセスプールで行い、イベントループと他のリクエストを待たせない
+        with metrics.timed("docx_build"):
+            if self.spill_to_disk:
+                path = await cpu_pool.run_cpu(write_minutes, minutes.summaries, formatted_content)
+                return GeneratedDocument(filename=minutes.filename, path=path)
+            data = await cpu_pool.run_cpu(render_minutes, minutes.summaries, formatted_content)
+            return GeneratedDocument(filename=minutes.filename, data=data)
@@ -0,0 +1,55 @@
+"""
+入力サイズと用途によるGeminiモデルの振り分け
+"""
+from typing import Dict, Optional
+from app import metrics
+
+# 振り分けの用途
+ROUTE_SUMMARY = "summary"          # 回答ごとの要約（文字数）
+ROUTE_STT = "stt"                  # 文字起こし（音声のバイト数）
+ROUTE_MINUTES = "minutes"          # 議事録の最終整形（常に通常モデル）
+ROUTE_MINUTES_MAP = "minutes_map"  # 長い議事録のチャンク要約（文字数）
+
+routing_decisions = metrics.counter(
+    "gemini_model_routing_total",
+    "Gemini model routing decisions by route and model",
+    ("route", "model")
+)
+
+
+class ModelRouter:
+    """
+    用途ごとのしきい値以下の入力を高速・低コストなモデルに振り分ける
+
+    しきい値が設定されていない用途（議事録の最終整形など）は常に通常モデルを使う。
+    """
+
+    def __init__(self, model: str, fast_model: Optional[str] = None,
+                 fast_max_sizes: Optional[Dict[str, int]] = None):
+        """
+        Args:
+            model: 通常モデル
+            fast_model: 高速モデル（Noneまたは空の場合は振り分けない）
+            fast_max_sizes: 用途ごとに高速モデルを使う入力サイズの上限（0以下で無効）
+        """
+        self.model = model
+        self.fast_model = fast_model or None
+        self.fast_max_sizes = fast_max_sizes or {}
+
+    def select(self, route: str, size: int) -> str:
+        """
+        モデルを選択
+
+        Args:
+            route: 用途（ROUTE_*）
+            size: 入力サイズ（テキストは文字数、音声はバイト数）
+
+        Returns:
+            モデル名
+        """
+        model = self.model
+        limit = self.fast_max_sizes.get(route, 0)
+        if self.fast_model and limit > 0 and size <= limit:
+            model = self.fast_model
+        routing_decisions.inc(route=route, model=model)
+        return model
@@ -0,0 +1,304 @@
+"""
+画面（HTML）と静的ファイルのメモリキャッシュ（圧縮済みデータ・ETag・フィンガープリント付きURL）
+"""
+import asyncio
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    import brotli
+except ImportError:  # brotli は任意（未インストールの場合は gzip のみ）
+    brotli = None
+
+# これより小さいファイルは圧縮しない（バイト）
+_MIN_COMPRESS_SIZE = 256
+
+_COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "image/svg+xml")
+
+# HTML内の静的ファイル参照（/static/xxx.css など）
+_STATIC_REF_PATTERN = re.compile(r'(["\'])/static/([\w./-]+)\1')
+
+# フィンガープリント付きのファイル名（app.3f2a9c1b.js）
+_FINGERPRINT_PATTERN = re.compile(r'^(?P<stem>.+)\.(?P<digest>[0-9a-f]{10})(?P<suffix>\.[^.]+)$')
+
+
+@dataclass
+class CachedFile:
+    """メモリ上のファイル（元データと圧縮済みデータ）"""
+    content_type: str
+    body: bytes
+    etag: str
+    mtime: float
+    encoded: Dict[str, bytes] = field(default_factory=dict)
+
+    @property
+    def last_modified(self) -> str:
+        """Last-Modified ヘッダーの値"""
+        return formatdate(self.mtime, usegmt=True)
+
+    def select(self, accept_encoding: str) -> Tuple[bytes, Optional[str], str]:
+        """
+        Accept-Encoding に合わせて送信するデータを選ぶ
+
+        Args:
+            accept_encoding: Accept-Encoding ヘッダーの値
+
+        Returns:
+            (本文, Content-Encoding（なしの場合はNone）, ETag)
+        """
+        accepted = _parse_accept_encoding(accept_encoding)
+        for encoding in ("br", "gzip"):
+            if encoding in self.encoded and encoding in accepted:
+                # エンコーディングごとに別の表現なので ETag も分ける
+                return self.encoded[encoding], encoding, f'{self.etag[:-1]}-{encoding}"'
+        return self.body, None, self.etag
+
+    def not_modified(self, if_none_match: str, if_modified_since: str) -> bool:
+        """
+        条件付きリクエストに対して 304 を返せるか
+
+        Args:
+            if_none_match: If-None-Match ヘッダーの値
+            if_modified_since: If-Modified-Since ヘッダーの値
+
+        Returns:
+            変更されていない場合True
+        """
+        if if_none_match:
+            tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+            base = self.etag[:-1]
+            return "*" in tags or any(
+                tag == self.etag or (tag.startswith(base + "-") and tag.endswith('"'))
+                for tag in tags
+            )
+        if if_modified_since:
+            try:
+                since = parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return int(self.mtime) <= since
+        return False
+
+
+def _parse_accept_encoding(value: str) -> List[str]:
+    """q=0 を除いた受け入れ可能なエンコーディング"""
+    accepted = []
+    for item in value.split(","):
+        name, _, params = item.strip().partition(";")
+        params = params.replace(" ", "")
+        if params.startswith("q="):
+            try:
+                if float(params[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        if name:
+            accepted.append(name.lower())
+    return accepted
+
+
+def _make_cached(body: bytes, content_type: str, mtime: float) -> CachedFile:
+    digest = hashlib.sha256(body).hexdigest()
+    cached = CachedFile(
+        content_type=content_type,
+        body=body,
+        etag=f'"{digest[:16]}"',
+        mtime=mtime
+    )
+    if len(body) >= _MIN_COMPRESS_SIZE and content_type.startswith(_COMPRESSIBLE_TYPES):
+        compressed = gzip.compress(body, compresslevel=9, mtime=0)
+        if len(compressed) < len(body):
+            cached.encoded["gzip"] = compressed
+        if brotli is not None:
+            compressed = brotli.compress(body, quality=11)
+            if len(compressed) < len(body):
+                cached.encoded["br"] = compressed
+    return cached
+
+
+class PageCache:
+    """
+    画面のHTMLと静的ファイルをメモリ上に保持するキャッシュ
+
+    読み込み時に gzip（brotli がインストールされていれば br も）で圧縮しておき、
+    リクエストごとのディスクI/Oと圧縮処理をなくす。静的ファイルは内容のハッシュを
+    含むURL（/static/app.<hash>.js）で参照するようHTMLを書き換えるため、
+    ブラウザに長期間キャッシュさせても更新時には新しいURLが使われる。
+
+    ファイルの更新時刻（mtime）の確認は check_interval 秒に一回までに抑え、
+    変更されたファイルだけを読み込み直す。ディレクトリの走査と読み込みは
+    ワーカースレッドで行い、イベントループを止めない。
+    """
+
+    def __init__(self, page_dirs: Sequence[Path], static_dir: Path,
+                 static_prefix: str = "/static", check_interval: float = 2.0):
+        """
+        Args:
+            page_dirs: HTMLを探すディレクトリ（先に見つかったものを使う）
+            static_dir: 静的ファイルのディレクトリ
+            static_prefix: 静的ファイルのURLの先頭
+            check_interval: 更新確認の最小間隔（秒）
+        """
+        self.page_dirs = [Path(d) for d in page_dirs]
+        self.static_dir = Path(static_dir)
+        self.static_prefix = static_prefix.rstrip("/")
+        self.check_interval = check_interval
+        self._pages: Dict[str, CachedFile] = {}
+        self._assets: Dict[str, CachedFile] = {}
+        # 静的ファイル名 -> (パス, mtime)
+        self._asset_sources: Dict[str, Tuple[Path, float]] = {}
+        # HTML名 -> (パス, mtime, 参照している静的ファイルの (名前, ETag))
+        self._page_sources: Dict[str, Tuple[Path, float, Tuple[Tuple[str, str], ...]]] = {}
+        self._checked_at: Optional[float] = None
+        # 読み込み（ワーカースレッド）は同時に1つだけ
+        self._lock = asyncio.Lock()
+
+    async def _refresh(self):
+        """必要に応じて変更されたファイルを読み込み直す"""
+        now = time.monotonic()
+        if self._checked_at is not None and now - self._checked_at < self.check_interval:
+            return
+        self._checked_at = now
+        async with self._lock:
+            await asyncio.to_thread(self._reload)
+
+    def _reload(self):
+        self._refresh_assets()
+        for name in list(self._page_sources):
+            self._load_page(name)
+
+    def _refresh_assets(self):
+        seen = set()
+        if self.static_dir.is_dir():
+            for path in self.static_dir.rglob("*"):
+                if not path.is_file():
+                    continue
+                name = path.relative_to(self.static_dir).as_posix()
+                seen.add(name)
+                try:
+                    mtime = os.stat(path).st_mtime
+                except OSError:
+                    continue
+                source = self._asset_sources.get(name)
+                if source is not None and source == (path, mtime):
+                    continue
+                try:
+                    body = path.read_bytes()
+                except OSError:
+                    continue
+                self._assets[name] = _make_cached(
+                    body, mimetypes.guess_type(path.name)[0] or "application/octet-stream", mtime
+                )
+                self._asset_sources[name] = (path, mtime)
+        for name in set(self._assets) - seen:
+            del self._assets[name]
+            del self._asset_sources[name]
+
+    def _find_page(self, name: str) -> Optional[Path]:
+        for directory in self.page_dirs:
+            path = directory / name
+            if path.is_file():
+                return path
+        return None
+
+    def _asset_etags(self, names: Sequence[str]) -> Tuple[Tuple[str, str], ...]:
+        """参照している静的ファイルの (名前, ETag)（キャッシュにないものは空）"""
+        return tuple(
+            (name, self._assets[name].etag if name in self._assets else "") for name in names
+        )
+
+    def _load_page(self, name: str):
+        """HTMLを読み込む（本体と参照先の静的ファイルに変更がなければ何もしない）"""
+        path = self._find_page(name)
+        if path is None:
+            self._pages.pop(name, None)
+            self._page_sources.pop(name, None)
+            return
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            return
+        source = self._page_sources.get(name)
+        if (
+            source is not None and name in self._pages
+            and source[:2] == (path, mtime)
+            and source[2] == self._asset_etags([n for n, _ in source[2]])
+        ):
+            return
+        try:
+            html = path.read_text(encoding="utf-8")
+        except OSError:
+            return
+        referenced = sorted({m.group(2) for m in _STATIC_REF_PATTERN.finditer(html)})
+        html = _STATIC_REF_PATTERN.sub(
+            lambda m: f"{m.group(1)}{self.asset_url(m.group(2))}{m.group(1)}", html
+        )
+        # 参照先の静的ファイルが新しければ Last-Modified もそれに合わせる
+        newest = max([mtime] + [self._assets[n].mtime for n in referenced if n in self._assets])
+        self._pages[name] = _make_cached(html.encode("utf-8"), "text/html", newest)
+        self._page_sources[name] = (path, mtime, self._asset_etags(referenced))
+
+    def asset_url(self, name: str) -> str:
+        """
+        静的ファイルのフィンガープリント付きURL
+
+        Args:
+            name: static ディレクトリからの相対パス（style.css など）
+
+        Returns:
+            /static/style.<hash>.css（キャッシュにないファイルは元のURL）
+        """
+        cached = self._assets.get(name)
+        if cached is None:
+            return f"{self.static_prefix}/{name}"
+        stem, dot, suffix = name.rpartition(".")
+        if not dot:
+            return f"{self.static_prefix}/{name}"
+        return f"{self.static_prefix}/{stem}.{cached.etag[1:11]}.{suffix}"
+
+    async def page(self, name: str) -> Optional[CachedFile]:
+        """
+        HTMLを取得（初回は読み込む）
+
+        Args:
+            name: ファイル名（top.html など）
+
+        Returns:
+            キャッシュ済みのHTML。見つからない場合はNone
+        """
+        await self._refresh()
+        if name not in self._page_sources:
+            async with self._lock:
+                if name not in self._page_sources:
+                    await asyncio.to_thread(self._load_page, name)
+        return self._pages.get(name)
+
+    async def asset(self, path: str) -> Tuple[Optional[CachedFile], bool]:
+        """
+        静的ファイルを取得
+
+        Args:
+            path: /static/ 以降のパス（フィンガープリント付きも可）
+
+        Returns:
+            (キャッシュ済みのファイル, フィンガープリントが現在の内容と一致するか)
+        """
+        await self._refresh()
+        cached = self._assets.get(path)
+        if cached is not None:
+            return cached, False
+        match = _FINGERPRINT_PATTERN.match(path)
+        if match is None:
+            return None, False
+        cached = self._assets.get(match.group("stem") + match.group("suffix"))
+        if cached is None:
+            return None, False
+        return cached, cached.etag[1:11] == match.group("digest")
@@ -0,0 +1,236 @@
+"""
+Gemini API 結果のキャッシュ（内容アドレス方式）
+"""
+import asyncio
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Optional, Tuple, Union
+from app import metrics
+
+cache_lookups = metrics.counter(
+    "result_cache_lookups_total",
+    "Result cache lookups by outcome (hit / miss / shared in-flight)",
+    ("result",)
+)
+
+
+def make_key(*parts: Union[str, bytes]) -> str:
+    """
+    入力内容からキャッシュキー（SHA-256）を生成
+
+    Args:
+        *parts: キーに含める値（モデル名・プロンプト・音声データなど）
+
+    Returns:
+        16進ダイジェスト
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        data = part.encode("utf-8") if isinstance(part, str) else part
+        # 区切りが曖昧にならないよう長さを前置する
+        digest.update(len(data).to_bytes(8, "big"))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+class _SQLiteBackend:
+    """キャッシュの永続化先（SQLite）"""
+
+    def __init__(self, db_path: Path, max_entries: int):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS result_cache ("
+            " key TEXT PRIMARY KEY,"
+            " value TEXT NOT NULL,"
+            " expires_at REAL NOT NULL,"
+            " created_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_result_cache_created"
+            " ON result_cache (created_at)"
+        )
+        self._conn.commit()
+        self._writes = 0
+
+    def get(self, key: str) -> Optional[Tuple[str, float]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM result_cache WHERE key = ?",
+                (key,)
+            ).fetchone()
+        if row is None or row[1] < time.time():
+            return None
+        return row[0], row[1]
+
+    def set(self, key: str, value: str, expires_at: float):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO result_cache VALUES (?, ?, ?, ?)",
+                (key, value, expires_at, time.time())
+            )
+            self._writes += 1
+            # 書き込み100回ごとに期限切れ・上限超過分を削除
+            if self._writes % 100 == 0:
+                self._conn.execute(
+                    "DELETE FROM result_cache WHERE expires_at < ?", (time.time(),)
+                )
+                self._conn.execute(
+                    "DELETE FROM result_cache WHERE key IN ("
+                    " SELECT key FROM result_cache ORDER BY created_at DESC"
+                    " LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)
+                )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class ResultCache:
+    """
+    Gemini API の結果キャッシュ
+
+    メモリ上のLRU（件数・合計サイズ・TTLで破棄）を一次キャッシュとし、
+    db_path を指定した場合はSQLiteにも保存して再起動後も再利用する。
+    同じキーの計算が同時に要求された場合は1回だけ実行して結果を共有する。
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl_seconds: float,
+                 db_path: Optional[Path] = None, db_max_entries: int = 10000):
+        """
+        Args:
+            max_entries: メモリ上に保持する件数の上限
+            max_bytes: メモリ上に保持する合計サイズの上限（バイト）
+            ttl_seconds: 保持期間（秒）
+            db_path: SQLiteファイルのパス（Noneの場合はメモリのみ）
+            db_max_entries: SQLiteに保持する件数の上限
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._total_bytes = 0
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._db = _SQLiteBackend(db_path, db_max_entries) if db_path else None
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _get_memory(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at < time.time():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def _set_memory(self, key: str, value: str, expires_at: float):
+        self._remove(key)
+        size = len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        self._entries[key] = (value, expires_at)
+        self._total_bytes += size
+        while len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._total_bytes -= len(entry[0].encode("utf-8"))
+
+    async def get(self, key: str) -> Optional[str]:
+        """
+        キャッシュから取得
+
+        Args:
+            key: キャッシュキー
+
+        Returns:
+            キャッシュされた値（存在しない場合はNone）
+        """
+        value = self._get_memory(key)
+        if value is None and self._db is not None:
+            row = await asyncio.to_thread(self._db.get, key)
+            if row is not None:
+                value, expires_at = row
+                self._set_memory(key, value, expires_at)
+        if value is None:
+            self.misses += 1
+            cache_lookups.inc(result="miss")
+        else:
+            self.hits += 1
+            cache_lookups.inc(result="hit")
+        return value
+
+    async def set(self, key: str, value: str):
+        """
+        キャッシュに保存
+
+        Args:
+            key: キャッシュキー
+            value: 保存する値
+        """
+        expires_at = time.time() + self.ttl_seconds
+        self._set_memory(key, value, expires_at)
+        if self._db is not None:
+            await asyncio.to_thread(self._db.set, key, value, expires_at)
+
+    async def get_or_compute(self, key: str, compute: Callable[[], Awaitable[str]]) -> str:
+        """
+        キャッシュにあれば返し、なければ計算して保存
+
+        計算は呼び出し元とは別のタスクで行い、各呼び出し元はその完了を待つ。
+        最初に要求した呼び出し元がキャンセルされても（クライアントの切断など）、
+        同じ結果を待っている他の呼び出し元には影響せず、結果も保存される。
+        計算中に例外が発生した場合は保存せずに全員にそのまま送出する。
+
+        Args:
+            key: キャッシュキー
+            compute: 値を計算するコルーチン関数
+
+        Returns:
+            値
+        """
+        value = await self.get(key)
+        if value is not None:
+            return value
+
+        task = self._inflight.get(key)
+        if task is not None:
+            cache_lookups.inc(result="shared")
+        else:
+            task = asyncio.ensure_future(self._compute(key, compute))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+        return await asyncio.shield(task)
+
+    async def _compute(self, key: str, compute: Callable[[], Awaitable[str]]) -> str:
+        value = await compute()
+        await self.set(key, value)
+        return value
+
+    def _finish(self, key: str, task: asyncio.Task):
+        """計算の完了（待機者がいない場合の "exception was never retrieved" 警告も抑制）"""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()
+
+    def close(self):
+        """永続化先を閉じる"""
+        if self._db is not None:
+            self._db.close()
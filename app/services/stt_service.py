@@ -1,60 +1,203 @@
 """
 Google Gemini API - 音声認識（STT）サービス
 """
-import os
-from google import genai
+import json
+from typing import Awaitable, Callable, Optional, Tuple
 from google.genai import types
-from app.config import Config
+from app import metrics
+from app.services.audio_ingest import AudioInput, audio_from_bytes
+from app.services import gemini_call
+from app.services.gemini_call import GeminiCallError
+from app.services.gemini_client import get_client
+from app.services.model_router import ModelRouter, ROUTE_STT
+from app.services.result_cache import ResultCache, make_key
+
+STT_MODEL = 'gemini-2.5-flash'
+STT_PROMPT = '音声の内容を日本語で文字起こししてください。'
+
+# 文字起こしと要約を1回で行うプロンプト（JSONで返させる）
+COMBINED_PROMPT = """
+以下の質問に対するインタビュー回答の音声です。
+transcript には音声の内容を日本語で文字起こししたものを、
+summary には回答を議事録用に簡潔に要約したもの（箇条書きまたは1〜2文程度）を入れてください。
+
+質問: {question}
+"""
+
+COMBINED_CONFIG = types.GenerateContentConfig(
+    response_mime_type='application/json',
+    response_schema=types.Schema(
+        type='OBJECT',
+        properties={
+            'transcript': types.Schema(type='STRING'),
+            'summary': types.Schema(type='STRING'),
+        },
+        required=['transcript', 'summary']
+    )
+)
 
 class STTService:
     """音声認識サービス（Gemini Audio Understanding）"""
     
-    def __init__(self):
-        """Gemini APIの初期化"""
-        # API キーのチェック
-        if not Config.GEMINI_API_KEY:
-            raise ValueError(
-                "GEMINI_API_KEY environment variable is not set. "
-                "Please set it in Render Dashboard > Environment tab."
-            )
-        
-        # 環境変数を設定
-        os.environ['GOOGLE_API_KEY'] = Config.GEMINI_API_KEY
+    def __init__(self, cache: Optional[ResultCache] = None,
+                 router: Optional[ModelRouter] = None):
+        """
+        Gemini APIの初期化（共有クライアントを使用）
         
-        # プロキシ設定
-        if Config.HTTP_PROXY:
-            os.environ['HTTP_PROXY'] = Config.HTTP_PROXY
-        if Config.HTTPS_PROXY:
-            os.environ['HTTPS_PROXY'] = Config.HTTPS_PROXY
-            
-        self.client = genai.Client()
+        Args:
+            cache: 文字起こし結果のキャッシュ（Noneの場合はキャッシュしない）
+            router: モデルの振り分け（Noneの場合は常に STT_MODEL）
+        """
+        # APIキー未設定の場合は ValueError
+        self.client = get_client()
+        self.cache = cache
+        self.router = router or ModelRouter(STT_MODEL)
     
-    async def transcribe(self, audio_data: bytes) -> str:
+    async def transcribe(self, audio_data: bytes, mime_type: str = 'audio/webm') -> str:
         """
         音声データを文字起こし
         
         Args:
             audio_data: 音声データ（バイト列）
+            mime_type: 音声データのMIMEタイプ
             
         Returns:
             文字起こしテキスト
+            
+        Raises:
+            GeminiCallError: 文字起こしに失敗した場合
         """
-        try:
-            # Gemini 2.5 Flash で音声認識
-            response = self.client.models.generate_content(
-                model='gemini-2.5-flash',
-                contents=[
-                    '音声の内容を日本語で文字起こししてください。',
-                    types.Part.from_bytes(
-                        data=audio_data,
-                        mime_type='audio/webm',
-                    )
-                ]
-            )
+        return await self.transcribe_input(audio_from_bytes(audio_data, mime_type))
+    
+    async def transcribe_input(self, audio: AudioInput) -> str:
+        """
+        取り込み済みの音声を文字起こし
+        
+        メモリ上の音声はリクエストに埋め込み、一時ファイルに退避した大きな音声は
+        Files APIでアップロードしてから参照する。
+        
+        Args:
+            audio: 音声データ
+            
+        Returns:
+            文字起こしテキスト
             
-            transcript = response.text.strip()
-            return transcript
+        Raises:
+            GeminiCallError: 文字起こしに失敗した場合
+        """
+        # 音声の長さの目安としてバイト数でモデルを選ぶ
+        model = self.router.select(ROUTE_STT, audio.size)
+        with metrics.timed("stt"):
+            if self.cache is None:
+                return await self._transcribe(audio, model)
+            key = make_key("stt", model, STT_PROMPT, audio.mime_type, audio.digest)
+            return await self.cache.get_or_compute(key, lambda: self._transcribe(audio, model))
+    
+    async def transcribe_and_summarize(self, audio: AudioInput,
+                                       question: str) -> Optional[Tuple[str, str]]:
+        """
+        音声の文字起こしと回答の要約を1回のリクエストで行う
+        
+        Args:
+            audio: 音声データ
+            question: 質問文
             
+        Returns:
+            (文字起こしテキスト, 要約文)。応答を解釈できない場合はNone
+            （呼び出し側で文字起こし→要約の2段階処理にフォールバックする）
+            
+        Raises:
+            GeminiCallError: Gemini呼び出しに失敗した場合
+        """
+        prompt = COMBINED_PROMPT.format(question=question)
+        model = self.router.select(ROUTE_STT, audio.size)
+        try:
+            with metrics.timed("stt_summary"):
+                text = await self._combined_text(prompt, audio, model)
+            result = json.loads(text)
+            return result["transcript"].strip(), result["summary"].strip()
+            
+        except GeminiCallError:
+            raise
         except Exception as e:
-            print(f"STT Error: {e}")
-            return "音声認識に失敗しました"
+            print(f"STT+Summary Error: {e}")
+            return None
+    
+    async def _combined_text(self, prompt: str, audio: AudioInput, model: str) -> str:
+        """文字起こしと要約のJSON応答（キャッシュがあれば利用）"""
+        if self.cache is None:
+            return await self._with_audio_part(
+                audio, lambda part: self._generate_combined(prompt, part, model)
+            )
+        key = make_key("stt_summary", model, prompt, audio.mime_type, audio.digest)
+        return await self.cache.get_or_compute(
+            key,
+            lambda: self._with_audio_part(
+                audio, lambda part: self._generate_combined(prompt, part, model)
+            )
+        )
+    
+    async def _transcribe(self, audio: AudioInput, model: str) -> str:
+        """Gemini APIで文字起こし（失敗時は例外を送出）"""
+        return await self._with_audio_part(audio, lambda part: self._generate(part, model))
+    
+    async def _with_audio_part(self, audio: AudioInput,
+                               generate: Callable[[types.Part], Awaitable[str]]) -> str:
+        """音声を Part に変換して generate を呼ぶ（アップロードしたファイルは後で削除）"""
+        if audio.path is None:
+            part = types.Part.from_bytes(
+                data=audio.data,
+                mime_type=audio.mime_type,
+            )
+            return await generate(part)
+        
+        # 大きな音声はファイルとしてアップロード（ファイルから少しずつ送信）
+        uploaded = await gemini_call.call(
+            self.client.files.upload,
+            discard=lambda file: self.client.files.delete(name=file.name),
+            path=str(audio.path),
+            config={'mime_type': audio.mime_type}
+        )
+        try:
+            part = types.Part.from_uri(uploaded.uri, audio.mime_type)
+            return await generate(part)
+        finally:
+            try:
+                await gemini_call.call(self.client.files.delete, name=uploaded.name)
+            except Exception as e:
+                print(f"STT file cleanup Error: {e}")
+    
+    async def _generate(self, part: types.Part, model: str) -> str:
+        response = await gemini_call.call(
+            self.client.models.generate_content,
+            idempotent=True,
+            model=model,
+            contents=[
+                STT_PROMPT,
+                part
+            ]
+        )
+        
+        transcript = (response.text or "").strip()
+        if not transcript:
+            raise GeminiCallError("Gemini returned an empty transcript")
+        return transcript
+    
+    async def _generate_combined(self, prompt: str, part: types.Part, model: str) -> str:
+        response = await gemini_call.call(
+            self.client.models.generate_content,
+            idempotent=True,
+            model=model,
+            contents=[
+                prompt,
+                part
+            ],
+            config=COMBINED_CONFIG
+        )
+        
+        # 解釈できない応答はキャッシュしないようここで検証する
+        text = response.text
+        result = json.loads(text)
+        if not isinstance(result.get("transcript"), str) or not isinstance(result.get("summary"), str):
+            raise ValueError("Unexpected combined response")
+        return text
@@ -0,0 +1,202 @@
+"""
+質問読み上げ音声のキャッシュ（テキスト・音声・モデルのハッシュで保存）
+"""
+import asyncio
+import os
+import tempfile
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+from app import metrics
+from app.services.result_cache import make_key
+
+tts_cache_lookups = metrics.counter(
+    "tts_cache_lookups_total",
+    "TTS audio lookups by source (memory / disk / synthesized / empty)",
+    ("result",)
+)
+
+
+@dataclass
+class CachedAudio:
+    """合成済みの音声データ"""
+    key: str
+    data: bytes
+    media_type: str = "audio/wav"
+
+    @property
+    def etag(self) -> str:
+        """ETag（キーは入力のハッシュなので内容が変わらない限り同じ値）"""
+        return f'"{self.key[:32]}"'
+
+
+class TTSCache:
+    """
+    合成済み音声のキャッシュ
+
+    キーはテキスト・音声・モデルのハッシュ（内容アドレス方式）なので、
+    インタビュータイプ間で同じ質問文は共有され、質問文を変更すると新しいキーになる。
+    ディスク（複数ワーカー・再起動で共有）に保存し、最近使ったものは
+    max_memory_bytes までメモリ上にも保持する。同じキーの合成が同時に
+    要求された場合は1回だけ実行する。
+    """
+
+    def __init__(self, tts_service, cache_dir: Path, max_memory_bytes: int,
+                 concurrency: int = 2):
+        """
+        Args:
+            tts_service: 音声合成サービス（model・voice・media_type・extension・synthesize を持つ）
+            cache_dir: 音声ファイルの保存先
+            max_memory_bytes: メモリ上に保持する合計サイズの上限（バイト）
+            concurrency: 事前合成の同時実行数
+        """
+        self.tts_service = tts_service
+        self.cache_dir = Path(cache_dir)
+        self.max_memory_bytes = max_memory_bytes
+        self.concurrency = concurrency
+        self._memory: "OrderedDict[str, CachedAudio]" = OrderedDict()
+        self._memory_bytes = 0
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    def key(self, text: str) -> str:
+        """テキストのキャッシュキー"""
+        return make_key(
+            "tts", self.tts_service.model, self.tts_service.voice,
+            self.tts_service.media_type, text
+        )
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.{self.tts_service.extension}"
+
+    def _audio(self, key: str, data: bytes) -> CachedAudio:
+        return CachedAudio(key, data, self.tts_service.media_type)
+
+    def _remember(self, audio: CachedAudio):
+        previous = self._memory.pop(audio.key, None)
+        if previous is not None:
+            self._memory_bytes -= len(previous.data)
+        if len(audio.data) > self.max_memory_bytes:
+            return
+        self._memory[audio.key] = audio
+        self._memory_bytes += len(audio.data)
+        while self._memory_bytes > self.max_memory_bytes:
+            _, oldest = self._memory.popitem(last=False)
+            self._memory_bytes -= len(oldest.data)
+
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        try:
+            return self._path(key).read_bytes()
+        except OSError:
+            return None
+
+    def _write_disk(self, key: str, data: bytes):
+        """一時ファイルに書いてから置き換える（他のワーカーが途中のファイルを読まない）"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, prefix=".tts_")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, self._path(key))
+        except OSError:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    async def get(self, text: str) -> Optional[CachedAudio]:
+        """
+        キャッシュ済みの音声を取得（合成はしない）
+
+        Args:
+            text: 読み上げるテキスト
+
+        Returns:
+            音声（キャッシュにない場合はNone）
+        """
+        key = self.key(text)
+        audio = self._memory.get(key)
+        if audio is not None:
+            self._memory.move_to_end(key)
+            tts_cache_lookups.inc(result="memory")
+            return audio
+        data = await asyncio.to_thread(self._read_disk, key)
+        if not data:
+            return None
+        audio = self._audio(key, data)
+        self._remember(audio)
+        tts_cache_lookups.inc(result="disk")
+        return audio
+
+    async def get_or_synthesize(self, text: str) -> Optional[CachedAudio]:
+        """
+        キャッシュにあれば返し、なければ合成して保存
+
+        Args:
+            text: 読み上げるテキスト
+
+        Returns:
+            音声（合成結果が空の場合はNone、保存しない）
+        """
+        audio = await self.get(text)
+        if audio is not None:
+            return audio
+
+        key = self.key(text)
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            data = await self.tts_service.synthesize(text)
+            audio = None
+            if data:
+                audio = self._audio(key, data)
+                await asyncio.to_thread(self._write_disk, key, data)
+                self._remember(audio)
+                tts_cache_lookups.inc(result="synthesized")
+            else:
+                tts_cache_lookups.inc(result="empty")
+            future.set_result(audio)
+            return audio
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # 待機者がいない場合の "exception was never retrieved" 警告を抑制
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+    async def warm(self, texts: Iterable[str]) -> int:
+        """
+        キャッシュにないテキストを事前に合成
+
+        Args:
+            texts: 読み上げるテキスト
+
+        Returns:
+            新たに合成した件数
+        """
+        missing = []
+        for text in dict.fromkeys(texts):
+            key = self.key(text)
+            if key in self._memory or key in self._inflight:
+                continue
+            if not await asyncio.to_thread(self._path(key).exists):
+                missing.append(text)
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def _synthesize(text: str) -> bool:
+            async with semaphore:
+                try:
+                    return await self.get_or_synthesize(text) is not None
+                except Exception as e:
+                    print(f"TTS precompute Error: {e}")
+                    return False
+
+        results = await asyncio.gather(*(_synthesize(text) for text in missing))
+        return sum(results)
@@ -1,36 +1,107 @@
 """
 Google Gemini API - 音声合成（TTS）サービス
 """
-from google import genai
+import io
+import re
+import wave
+from google.genai import types
 from app.config import Config
+from app.services import gemini_call
+from app.services.gemini_call import GeminiCallError
+from app.services.gemini_client import get_client
+
+# Gemini TTS が返す音声（16bit リニアPCM・モノラル）の既定のサンプリングレート
+PCM_SAMPLE_RATE = 24000
+
+_RATE_PATTERN = re.compile(r"rate=(\d+)")
+
+
+def pcm_to_wav(pcm: bytes, sample_rate: int = PCM_SAMPLE_RATE) -> bytes:
+    """
+    16bit リニアPCM（モノラル）を WAV ファイルに変換
+
+    Args:
+        pcm: PCMデータ
+        sample_rate: サンプリングレート（Hz）
+
+    Returns:
+        WAVファイルのバイト列
+    """
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(pcm)
+    return buffer.getvalue()
+
 
 class TTSService:
     """音声合成サービス（Gemini TTS）"""
-    
-    def __init__(self):
-        """Gemini APIの初期化"""
-        self.client = genai.Client(api_key=Config.GEMINI_API_KEY)
-    
+
+    # 合成した音声の形式（キャッシュのファイル名・レスポンスに使用）
+    media_type = "audio/wav"
+    extension = "wav"
+
+    def __init__(self, model: str = Config.TTS_MODEL, voice: str = Config.TTS_VOICE):
+        """
+        Gemini APIの初期化（共有クライアントを使用）
+
+        Args:
+            model: 音声合成モデル
+            voice: 音声（プリセット名）
+        """
+        self.client = get_client()
+        self.model = model
+        self.voice = voice
+        self.config = types.GenerateContentConfig(
+            response_modalities=["AUDIO"],
+            speech_config=types.SpeechConfig(
+                voice_config=types.VoiceConfig(
+                    prebuilt_voice_config=types.PrebuiltVoiceConfig(voice_name=voice)
+                )
+            )
+        )
+
     async def synthesize(self, text: str) -> bytes:
         """
         テキストを音声データに変換
-        
+
         Args:
             text: 読み上げるテキスト
-            
+
         Returns:
-            音声データ（バイト列）
+            音声データ（WAV、応答に音声が含まれない場合は空のバイト列）
+
+        Raises:
+            GeminiCallError: 合成に失敗した場合
         """
-        try:
-            # TODO: Gemini TTS API の正式な実装方法に合わせて調整
-            # または Google Cloud TTS を使用
-            
-            # 一旦、空のバイト列を返す（ダミー）
-            # 実装時にGemini APIの正式なTTSメソッドに置き換え
-            audio_data = b""
-            
-            return audio_data
-            
-        except Exception as e:
-            print(f"TTS Error: {e}")
+        response = await gemini_call.call(
+            self.client.models.generate_content,
+            idempotent=True,
+            model=self.model,
+            contents=text,
+            config=self.config
+        )
+
+        pcm = bytearray()
+        sample_rate = PCM_SAMPLE_RATE
+        for candidate in getattr(response, "candidates", None) or []:
+            content = getattr(candidate, "content", None)
+            for part in getattr(content, "parts", None) or []:
+                blob = getattr(part, "inline_data", None)
+                if blob is None or not blob.data:
+                    continue
+                mime_type = (blob.mime_type or "").lower()
+                if not mime_type.startswith(("audio/l16", "audio/pcm")):
+                    raise GeminiCallError(f"Unexpected TTS audio format: {blob.mime_type}")
+                match = _RATE_PATTERN.search(mime_type)
+                if match:
+                    sample_rate = int(match.group(1))
+                pcm.extend(blob.data)
+            break
+
+        if not pcm:
+            print("TTS Error: response contained no audio")
             return b""
+        return pcm_to_wav(bytes(pcm), sample_rate)
@@ -0,0 +1,90 @@
+"""
+ZIPアーカイブの逐次生成（エントリを追加するたびに書き出し済みのバイト列を返す）
+"""
+import time
+import zipfile
+from typing import List
+
+
+class _Sink:
+    """zipfile の書き込み先（シークできないストリームとして扱わせる）"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def take(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+class ZipStream:
+    """
+    ストリーミング用のZIPアーカイブ
+
+    書き込み先がシークできないため、各エントリはサイズとCRCを後ろに置く
+    データ記述子付きで書き出される。メモリに残るのは送信前のエントリと
+    中央ディレクトリ（1件あたり100バイト程度）だけなので、アーカイブ全体の
+    サイズによらず使用量は一定になる。.docx は圧縮済みのため圧縮レベルは低くする
+    （データ記述子付きの無圧縮エントリを読めない展開ツールがあるため無圧縮にはしない）。
+    """
+
+    def __init__(self, compresslevel: int = 1):
+        """
+        Args:
+            compresslevel: Deflate の圧縮レベル
+        """
+        self._sink = _Sink()
+        self._zip = zipfile.ZipFile(
+            self._sink, "w", zipfile.ZIP_DEFLATED, compresslevel=compresslevel
+        )
+
+    def _info(self, name: str) -> zipfile.ZipInfo:
+        info = zipfile.ZipInfo(name, time.localtime()[:6])
+        info.compress_type = zipfile.ZIP_DEFLATED
+        info.external_attr = 0o644 << 16
+        return info
+
+    def add(self, name: str, data: bytes) -> bytes:
+        """
+        エントリを追加
+
+        Args:
+            name: アーカイブ内のファイル名
+            data: ファイルの内容
+
+        Returns:
+            送信するバイト列
+        """
+        self._zip.writestr(self._info(name), data)
+        return self._sink.take()
+
+    def open(self, name: str):
+        """
+        エントリを少しずつ書き込むためのファイルオブジェクト（書き込み中は drain() で送信分を取り出す）
+
+        Args:
+            name: アーカイブ内のファイル名
+        """
+        return self._zip.open(self._info(name), "w")
+
+    def drain(self) -> bytes:
+        """書き出し済みで未送信のバイト列"""
+        return self._sink.take()
+
+    def close(self) -> bytes:
+        """
+        中央ディレクトリを書き込んでアーカイブを閉じる
+
+        Returns:
+            送信する残りのバイト列
+        """
+        self._zip.close()
+        return self._sink.take()
@@ -9,6 +9,9 @@ let interviewType = ''; // インタビュータイプ (denryoku, hoken, ippan,
 // 各質問の回答を保存（文字起こしのみ、要約は最後にまとめて実施）
 const answersData = {};
 
+// 質問一覧APIで取得した質問（ID → 質問データ）
+const questionCache = {};
+
 // URLからインタビュータイプを取得
 function getInterviewType() {
     const path = window.location.pathname;
@@ -207,13 +210,16 @@ async function loadQuestion(questionId) {
         document.querySelector('.question-card').style.opacity = '0.5';
         document.querySelector('.answer-card').style.opacity = '0.5';
         
-        const response = await fetch(`/api/${interviewType}/question/${questionId}`);
-        if (!response.ok) {
-            throw new Error('質問の取得に失敗しました');
+        // 一覧取得済みの質問はキャッシュから表示（未取得の場合のみ個別に取得）
+        let data = questionCache[questionId];
+        if (!data) {
+            const response = await fetch(`/api/${interviewType}/question/${questionId}`);
+            if (!response.ok) {
+                throw new Error('質問の取得に失敗しました');
+            }
+            data = await response.json();
         }
         
-        const data = await response.json();
-        
         // フェードインエフェクト
         setTimeout(() => {
             document.querySelector('.question-card').style.opacity = '1';
@@ -384,47 +390,115 @@ nextBtn.addEventListener('click', () => {
     window.scrollTo({ top: 0, behavior: 'smooth' });
 });
 
+// 生成したWordファイルを新しいタブで開く（ポップアップブロック時はダウンロード）
+function openDocxBlob(blob) {
+    const url = window.URL.createObjectURL(blob);
+    // 新しいタブで開く（ポップアップブロック時はフォールバックでダウンロード）
+    const newTab = window.open(url, '_blank');
+    if (!newTab) {
+        // フォールバック: 強制ダウンロード
+        const a = document.createElement('a');
+        a.href = url;
+        a.download = `議事録_${new Date().toISOString().slice(0,10)}.docx`;
+        document.body.appendChild(a);
+        a.click();
+        document.body.removeChild(a);
+        showStatus('ファイルをダウンロードしました。', 'success');
+        // ダウンロード後に短めに解放
+        setTimeout(() => { try { window.URL.revokeObjectURL(url); } catch (e) {} }, 5000);
+    } else {
+        showStatus('ファイルを新しいタブで開きました。', 'success');
+        // 新タブが読み込むまで URL を保持（長めに遅延して解放）
+        setTimeout(() => { try { window.URL.revokeObjectURL(url); } catch (e) {} }, 60000);
+    }
+}
+
+// 議事録をストリーミング生成（SSE）し、整形結果を逐次表示してからWordを取得
+async function generateDocxStream(payload) {
+    const response = await fetch('/api/docx/stream', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+        },
+        body: JSON.stringify(payload),
+    });
+    if (!response.ok || !response.body) throw new Error('生成に失敗しました');
+    
+    // 整形結果の表示エリア
+    const summaryBody = summaryText.querySelector('p');
+    summaryBody.textContent = '';
+    summaryBody.style.whiteSpace = 'pre-wrap';
+    summaryText.style.display = 'block';
+    
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    let downloadUrl = null;
+    
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        
+        // イベントは空行区切り
+        let sep;
+        while ((sep = buffer.indexOf('\n\n')) >= 0) {
+            const raw = buffer.slice(0, sep);
+            buffer = buffer.slice(sep + 2);
+            let event = 'message';
+            let data = '';
+            raw.split('\n').forEach(line => {
+                if (line.startsWith('event: ')) event = line.slice(7);
+                else if (line.startsWith('data: ')) data += line.slice(6);
+            });
+            if (!data) continue;
+            const parsed = JSON.parse(data);
+            if (event === 'delta') {
+                summaryBody.textContent += parsed.text;
+            } else if (event === 'done') {
+                downloadUrl = parsed.download_url;
+            } else if (event === 'error') {
+                throw new Error(parsed.error || '生成に失敗しました');
+            }
+        }
+    }
+    
+    if (!downloadUrl) throw new Error('生成に失敗しました');
+    const docxResponse = await fetch(downloadUrl);
+    if (!docxResponse.ok) throw new Error('生成に失敗しました');
+    return await docxResponse.blob();
+}
+
 finishBtn.addEventListener('click', async () => {
     try {
         finishBtn.disabled = true;
         finishBtn.innerHTML = '<i class="fas fa-spinner fa-spin"></i> 生成中...';
         showStatus('議事録を生成しています。しばらくお待ちください...', 'success');
         
-        // サーバーに回答データを送信してWord生成
-        const response = await fetch('/api/docx', {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json',
-            },
-            body: JSON.stringify({
-                interview_type: interviewType,
-                answers: answersData
-            }),
-        });
-        
-        if (!response.ok) throw new Error('生成に失敗しました');
+        const payload = {
+            interview_type: interviewType,
+            answers: answersData
+        };
         
-        // ダウンロード／表示処理（堅牢化）
-        const blob = await response.blob();
-        const url = window.URL.createObjectURL(blob);
-        // 新しいタブで開く（ポップアップブロック時はフォールバックでダウンロード）
-        const newTab = window.open(url, '_blank');
-        if (!newTab) {
-            // フォールバック: 強制ダウンロード
-            const a = document.createElement('a');
-            a.href = url;
-            a.download = `議事録_${new Date().toISOString().slice(0,10)}.docx`;
-            document.body.appendChild(a);
-            a.click();
-            document.body.removeChild(a);
-            showStatus('ファイルをダウンロードしました。', 'success');
-            // ダウンロード後に短めに解放
-            setTimeout(() => { try { window.URL.revokeObjectURL(url); } catch (e) {} }, 5000);
+        // ストリーミング生成が使えない環境では従来の一括生成にフォールバック
+        let blob;
+        if (window.ReadableStream && window.TextDecoder) {
+            blob = await generateDocxStream(payload);
         } else {
-            showStatus('ファイルを新しいタブで開きました。', 'success');
-            // 新タブが読み込むまで URL を保持（長めに遅延して解放）
-            setTimeout(() => { try { window.URL.revokeObjectURL(url); } catch (e) {} }, 60000);
+            // サーバーに回答データを送信してWord生成
+            const response = await fetch('/api/docx', {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                },
+                body: JSON.stringify(payload),
+            });
+            if (!response.ok) throw new Error('生成に失敗しました');
+            blob = await response.blob();
         }
+        
+        // ダウンロード／表示処理（堅牢化）
+        openDocxBlob(blob);
 
         finishBtn.disabled = false;
         finishBtn.innerHTML = '<i class="fas fa-file-word"></i> Word生成';
@@ -473,63 +547,30 @@ if (backToTopLink) {
 async function initQuestionSidebar() {
     try {
         console.log('🧭 initQuestionSidebar start', interviewType);
-        // すべての質問を取得（1から順番に）
-        // Edge対策: まず1件目で総数を確認し、残りはバッチ（小さな並列）で取得する。
-        const questions = [];
+        // 質問一覧とカテゴリー別グループを1回のリクエストで取得
+        // （ETagによりブラウザキャッシュを安価に再検証できる）
+        let questions = [];
+        let categories = [];
         try {
-            const firstResp = await fetchWithRetry(`/api/${interviewType}/question/1`, 2, 200);
-            if (!firstResp.ok) throw new Error('first response not ok');
-            const firstData = await firstResp.json();
-            questions.push(firstData);
-
-            const total = firstData.total_questions || 1;
-            const batchSize = 4; // 同時並列数を抑える
-            for (let start = 2; start <= total; start += batchSize) {
-                const end = Math.min(total, start + batchSize - 1);
-                const batch = [];
-                for (let id = start; id <= end; id++) {
-                    batch.push(
-                        fetchWithRetry(`/api/${interviewType}/question/${id}`, 2, 200)
-                            .then(r => r.ok ? r.json() : null)
-                            .catch(e => {
-                                console.warn('batch fetch error', id, e);
-                                return null;
-                            })
-                    );
-                }
-                const results = await Promise.all(batch);
-                results.forEach(r => { if (r) questions.push(r); });
+            const response = await fetchWithRetry(`/api/${interviewType}/questions`, 2, 200);
+            if (!response.ok) throw new Error('questions response not ok');
+            const data = await response.json();
+            questions = data.questions || [];
+            categories = data.categories || [];
+            if (data.total_questions) {
+                totalQuestions = data.total_questions;
             }
+            questions.forEach(q => { questionCache[q.id] = q; });
         } catch (e) {
-            console.warn('並列取得でエラーが発生しました、フォールバックで順次取得を試行します', e);
-            // フォールバック: 順次取得
-            let questionId = 1;
-            let hasMore = true;
-            while (hasMore) {
-                try {
-                    const response = await fetchWithRetry(`/api/${interviewType}/question/${questionId}`, 1, 200);
-                    if (response && response.ok) {
-                        const data = await response.json();
-                        questions.push(data);
-                        questionId++;
-                        if (data.is_last) hasMore = false;
-                    } else {
-                        hasMore = false;
-                    }
-                } catch (error) {
-                    console.error('順次取得で中断:', error);
-                    hasMore = false;
-                }
-            }
+            console.warn('質問一覧の取得に失敗しました', e);
         }
         
-        // カテゴリーごとにグループ化
+        // カテゴリーごとにグループ化（サーバーのグループ順を使用）
         const groupedQuestions = {};
-        questions.forEach(q => {
-            if (!groupedQuestions[q.category]) {
-                groupedQuestions[q.category] = [];
-            }
-            groupedQuestions[q.category].push(q);
+        categories.forEach(c => {
+            groupedQuestions[c.category] = c.question_ids
+                .map(id => questionCache[id])
+                .filter(q => q);
         });
         
         // HTMLを生成
@@ -195,7 +195,9 @@ async function generateWord() {
         
         showStatus('Wordファイルを生成しています...', 'info');
         
-        const response = await fetch('/api/docx', {
+        // 非同期ジョブとして登録し、完了を待ってからダウンロード
+        // （長い生成でもHTTPリクエストがタイムアウトしない）
+        const jobResponse = await fetch('/api/docx/jobs', {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json',
@@ -211,6 +213,19 @@ async function generateWord() {
             }),
         });
         
+        if (!jobResponse.ok) throw new Error('Word生成に失敗しました');
+        const job = await jobResponse.json();
+        
+        let jobStatus = job.status;
+        while (jobStatus !== 'done') {
+            if (jobStatus === 'failed') throw new Error('Word生成に失敗しました');
+            await new Promise(r => setTimeout(r, 1500));
+            const statusResponse = await fetch(job.status_url);
+            if (!statusResponse.ok) throw new Error('Word生成に失敗しました');
+            jobStatus = (await statusResponse.json()).status;
+        }
+        
+        const response = await fetch(job.download_url);
         if (!response.ok) throw new Error('Word生成に失敗しました');
         
         const blob = await response.blob();
@@ -0,0 +1,109 @@
+"""
+Word文書生成のマイクロベンチマーク（議事録の行数ごとの生成時間）
+
+Gemini の整形結果を模した議事録テキスト（見出し・【…】見出し・箇条書き・
+番号付きリスト・表・太字）を指定行数で作り、DocxService.render_bytes の
+生成時間の中央値を計測する。比較用に python-docx で1段落ずつ追加する
+方式（Document() を毎回作成）も計測する。
+
+使い方:
+    python benchmarks/docx_render.py
+    python benchmarks/docx_render.py --lines 1000 10000 --runs 5 --no-baseline
+"""
+import argparse
+import io
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from docx import Document  # noqa: E402
+
+from app.services.docx_service import DocxService  # noqa: E402
+
+
+def sample_minutes(lines: int) -> str:
+    """議事録らしいテキストを指定行数で作成"""
+    block = [
+        "【会議概要】",
+        "## 議題",
+        "- 日時: 2024年4月1日 10:00〜11:00",
+        "- 参加者: **営業部** 山田、技術部 佐藤",
+        "1. 前回の課題の確認",
+        "2. **新サービス**の提供開始時期について",
+        "| 項目 | 担当 | 期限 |",
+        "| --- | --- | --- |",
+        "| 見積書の作成 | 山田 | 4月10日 |",
+        "| 技術検証 | 佐藤 | 4月15日 |",
+        "",
+        "顧客からは導入時期を早めたいとの要望があり、**5月中の提供開始**を目標とすることで合意した。",
+    ]
+    return "\n".join(block[i % len(block)] for i in range(lines))
+
+
+def baseline_render(content: str) -> bytes:
+    """比較用: python-docx で1段落ずつ追加する方式"""
+    doc = Document()
+    doc.add_heading("議事録", level=1)
+    for line in content.split("\n"):
+        line = line.strip()
+        if not line:
+            doc.add_paragraph("")
+        elif line.startswith("## "):
+            doc.add_heading(line[3:], level=2)
+        elif line.startswith("# "):
+            doc.add_heading(line[2:], level=1)
+        elif line.startswith("- "):
+            doc.add_paragraph(line[2:], style="List Bullet")
+        else:
+            doc.add_paragraph(line)
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def measure(render: Callable[[str], bytes], content: str, runs: int) -> List[float]:
+    """生成時間（秒）を runs 回計測"""
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        render(content)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Word文書生成のマイクロベンチマーク")
+    parser.add_argument("--lines", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--no-baseline", action="store_true",
+                        help="python-docx の1段落ずつ追加する方式を計測しない")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    service = DocxService()
+    print(f"template load: {(time.perf_counter() - started) * 1000:.1f} ms (first request only)")
+
+    def engine(content: str) -> bytes:
+        return service.render_bytes([], content)
+
+    for lines in args.lines:
+        content = sample_minutes(lines)
+        size = len(engine(content))
+        timings = measure(engine, content, args.runs)
+        median = statistics.median(timings) * 1000
+        print(f"{lines:>6} lines  engine    {median:9.1f} ms  "
+              f"({median * 1000 / lines:6.1f} us/line, {size / 1024:.0f} KiB)")
+        if not args.no_baseline:
+            timings = measure(baseline_render, content, max(1, min(args.runs, 3)))
+            median = statistics.median(timings) * 1000
+            print(f"{lines:>6} lines  python-docx {median:7.1f} ms  "
+                  f"({median * 1000 / lines:6.1f} us/line)")
+
+
+if __name__ == "__main__":
+    main()
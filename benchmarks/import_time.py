@@ -0,0 +1,143 @@
+"""
+コールドスタート計測（main の import 時間と初回リクエストまでの時間）
+
+新しいPythonプロセスで main を読み込み、起動処理と最初のリクエスト
+（トップ画面・質問取得）までの時間を計測する。複数回実行した中央値を出力し、
+最後に -X importtime で読み込みに時間のかかったモジュールの上位を表示する。
+
+使い方:
+    python benchmarks/import_time.py --runs 5
+    python benchmarks/import_time.py --runs 5 --path /api/ippan/questions --top 20
+
+Gemini APIは呼び出さない（GEMINI_BACKEND=fake で実行する）。
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# 子プロセスで実行するコード（結果をJSONで出力する）
+CHILD = """
+import asyncio, json, sys, time
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+
+# ASGIアプリに直接 GET を送ってステータスを返す（HTTPクライアントを読み込まない）
+async def get(path):
+    status = None
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"",
+        "root_path": "", "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 0), "server": ("bench", 80),
+    }
+    await main.app(scope, receive, send)
+    return status
+
+async def run(paths):
+    await main.app.router.startup()
+    timings = {}
+    try:
+        for path in paths:
+            t0 = time.perf_counter()
+            status = await get(path)
+            if status is None or status >= 400:
+                raise RuntimeError(f"GET {path} returned {status}")
+            timings[path] = time.perf_counter() - t0
+    finally:
+        await main.app.router.shutdown()
+    return timings
+
+timings = asyncio.run(run(sys.argv[1:]))
+heavy = [m for m in ("google.genai", "docx", "gtts") if m in sys.modules]
+print(json.dumps({
+    "import": imported - started,
+    "requests": timings,
+    "total": time.perf_counter() - started,
+    "heavy_modules": heavy,
+}))
+"""
+
+
+def child_env() -> Dict[str, str]:
+    env = dict(os.environ)
+    env.setdefault("GEMINI_BACKEND", "fake")
+    env["ACCESS_LOG"] = "False"
+    env["PYTHONDONTWRITEBYTECODE"] = "1"
+    return env
+
+
+def measure(paths: List[str]) -> dict:
+    """新しいプロセスで1回計測"""
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD, *paths],
+        cwd=ROOT, env=child_env(), capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def import_profile(top: int) -> List[Tuple[float, str]]:
+    """-X importtime の結果から main が直接読み込んだモジュールを累積時間の順に取得"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=ROOT, env=child_env(), capture_output=True, text=True, check=True
+    )
+    totals: Dict[str, float] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or line.count("|") != 2:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        try:
+            micros = int(cumulative.strip())
+        except ValueError:
+            continue
+        # 字下げ1段のモジュールが main から直接読み込まれたもの
+        name = name.rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        if depth == 1:
+            totals[name.strip()] = totals.get(name.strip(), 0) + micros / 1e6
+    return sorted(((v, k) for k, v in totals.items()), reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="コールドスタート計測")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--path", action="append", dest="paths",
+                        help="初回リクエストのパス（複数指定可）")
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+    paths = args.paths or ["/", "/api/ippan/questions"]
+
+    runs = [measure(paths) for _ in range(args.runs)]
+
+    def median_ms(values) -> float:
+        return statistics.median(values) * 1000
+
+    print(f"runs: {args.runs}")
+    print(f"import main       {median_ms([r['import'] for r in runs]):8.1f} ms")
+    for path in paths:
+        print(f"first GET {path:<20} {median_ms([r['requests'][path] for r in runs]):8.1f} ms")
+    print(f"total             {median_ms([r['total'] for r in runs]):8.1f} ms")
+    heavy = runs[-1]["heavy_modules"]
+    print(f"heavy modules loaded: {', '.join(heavy) if heavy else 'none'}")
+
+    print(f"\nslowest imports (cumulative, top {args.top}):")
+    for seconds, name in import_profile(args.top):
+        print(f"  {seconds * 1000:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+負荷試験（スループットと p50/p95/p99 レイテンシ）
+
+既定ではフェイクGemini（GEMINI_BACKEND=fake）でアプリをプロセス内に起動し、
+ネットワークなしで各エンドポイントに一定の同時実行数でリクエストを送る。
+プロセス内実行ではイベントループの遅延（ブロッキングの検出用）も計測する。
+
+使い方:
+    python benchmarks/load_test.py --scenario questions --requests 2000 --concurrency 50
+    python benchmarks/load_test.py --scenario stt --requests 200 --concurrency 20
+    python benchmarks/load_test.py --scenario docx --requests 50 --concurrency 10
+    python benchmarks/load_test.py --url http://localhost:8001 --scenario stt
+
+フェイクの応答特性は GEMINI_FAKE_LATENCY_MS / GEMINI_FAKE_JITTER_MS /
+GEMINI_FAKE_ERROR_RATE で変更できる（.env.example 参照）。
+スループットは GEMINI_RATE_LIMIT_RPM のレート制限で頭打ちになるため、
+それ以外の要因を測る場合は十分大きな値を指定する。
+"""
+import argparse
+import asyncio
+import os
+import secrets
+import statistics
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List
+
+try:
+    import httpx
+except ImportError:
+    sys.exit("httpx is required: pip install -r requirements-dev.txt")
+
+ROOT = Path(__file__).resolve().parent.parent
+
+SCENARIOS = ("questions", "stt", "docx")
+
+
+def percentile(values: List[float], q: float) -> float:
+    """q（0〜100）パーセンタイル"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(q / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def build_request(scenario: str, interview_type: str, audio_bytes: int,
+                  unique: bool) -> Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]]:
+    """シナリオごとのリクエスト関数を作成"""
+    fixed_audio = secrets.token_bytes(audio_bytes)
+
+    async def questions(client: httpx.AsyncClient, i: int) -> httpx.Response:
+        if i % 2 == 0:
+            return await client.get(f"/api/{interview_type}/questions")
+        return await client.get(f"/api/{interview_type}/question/{i % 5 + 1}")
+
+    async def stt(client: httpx.AsyncClient, i: int) -> httpx.Response:
+        audio = secrets.token_bytes(audio_bytes) if unique else fixed_audio
+        return await client.post(
+            "/api/stt",
+            files={"file": ("answer.webm", audio, "audio/webm")},
+            data={"question_id": "1", "interview_type": interview_type}
+        )
+
+    async def docx(client: httpx.AsyncClient, i: int) -> httpx.Response:
+        suffix = f" {i}" if unique else ""
+        answers = {
+            str(qid): {"transcript": f"質問{qid}への回答です。具体的な内容を話しています。{suffix}"}
+            for qid in range(1, 11)
+        }
+        return await client.post(
+            "/api/docx",
+            json={"answers": answers, "interview_type": interview_type}
+        )
+
+    return {"questions": questions, "stt": stt, "docx": docx}[scenario]
+
+
+async def monitor_loop_lag(samples: List[float], stop: asyncio.Event, interval: float = 0.01):
+    """イベントループが予定より遅れて起きた時間を記録"""
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append(time.perf_counter() - started - interval)
+
+
+async def run(client: httpx.AsyncClient, send, total: int, concurrency: int) -> Dict:
+    """total 件を concurrency 並列で送信して結果を集計"""
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    counter = iter(range(total))
+
+    async def worker():
+        for i in counter:
+            started = time.perf_counter()
+            try:
+                response = await send(client, i)
+                statuses[response.status_code] += 1
+            except httpx.HTTPError as e:
+                statuses[type(e).__name__] += 1
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {"elapsed": elapsed, "latencies": latencies, "statuses": statuses}
+
+
+def report(scenario: str, concurrency: int, result: Dict, loop_lag: List[float]):
+    latencies = [v * 1000 for v in result["latencies"]]
+    count = len(latencies)
+    print(f"scenario:     {scenario} (concurrency {concurrency})")
+    print(f"requests:     {count} in {result['elapsed']:.2f}s")
+    print(f"throughput:   {count / result['elapsed']:.1f} req/s")
+    if latencies:
+        print(
+            "latency (ms): "
+            f"p50 {percentile(latencies, 50):.1f} / "
+            f"p95 {percentile(latencies, 95):.1f} / "
+            f"p99 {percentile(latencies, 99):.1f} / "
+            f"mean {statistics.mean(latencies):.1f} / max {max(latencies):.1f}"
+        )
+    print("status:       " + ", ".join(f"{k}: {v}" for k, v in sorted(result["statuses"].items(), key=str)))
+    if loop_lag:
+        lag = [v * 1000 for v in loop_lag]
+        print(f"loop lag (ms): p99 {percentile(lag, 99):.1f} / max {max(lag):.1f}")
+
+
+async def main(args: argparse.Namespace):
+    send = build_request(args.scenario, args.interview_type, args.audio_bytes, not args.cached)
+
+    if args.url:
+        async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout) as client:
+            await send(client, 0)
+            result = await run(client, send, args.requests, args.concurrency)
+        report(args.scenario, args.concurrency, result, [])
+        return
+
+    # プロセス内でアプリを起動（フェイクGemini）
+    os.environ.setdefault("GEMINI_BACKEND", "fake")
+    sys.path.insert(0, str(ROOT))
+    os.chdir(ROOT)
+    import main as app_main
+
+    await app_main.app.router.startup()
+    try:
+        transport = httpx.ASGITransport(app=app_main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench",
+                                     timeout=args.timeout) as client:
+            # 初回のみ発生する処理（設定読み込みなど）を計測から除く
+            await send(client, 0)
+            lag: List[float] = []
+            stop = asyncio.Event()
+            monitor = asyncio.create_task(monitor_loop_lag(lag, stop))
+            result = await run(client, send, args.requests, args.concurrency)
+            stop.set()
+            await monitor
+        report(args.scenario, args.concurrency, result, lag)
+    finally:
+        await app_main.app.router.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="負荷試験")
+    parser.add_argument("--scenario", choices=SCENARIOS, default="questions")
+    parser.add_argument("--requests", type=int, default=200, help="送信するリクエスト数")
+    parser.add_argument("--concurrency", type=int, default=20, help="同時実行数")
+    parser.add_argument("--interview-type", default="ippan")
+    parser.add_argument("--audio-bytes", type=int, default=32 * 1024, help="stt の音声サイズ")
+    parser.add_argument("--cached", action="store_true",
+                        help="毎回同じ入力を送る（結果キャッシュのヒットを計測）")
+    parser.add_argument("--url", help="起動済みサーバーのURL（省略時はプロセス内で起動）")
+    parser.add_argument("--timeout", type=float, default=300)
+    asyncio.run(main(parser.parse_args()))
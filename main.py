@@ -1,30 +1,41 @@
 """
 FastAPI メインアプリケーション（Render対応）
 """
-import os
-from fastapi import FastAPI, File, UploadFile, Form, Body
-from fastapi.responses import FileResponse, JSONResponse, Response
-from fastapi.staticfiles import StaticFiles
+import asyncio
+import itertools
+import json
+import re
+from datetime import datetime
+from functools import cached_property
+from typing import Dict, Optional, Tuple
+from urllib.parse import quote
+from fastapi import FastAPI, File, UploadFile, Form, Body, Request
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.background import BackgroundTask
 from pathlib import Path
 
-# プロキシ設定を削除（Gemini APIへの直接接続を確保）
-if 'HTTP_PROXY' in os.environ:
-    del os.environ['HTTP_PROXY']
-if 'HTTPS_PROXY' in os.environ:
-    del os.environ['HTTPS_PROXY']
-if 'http_proxy' in os.environ:
-    del os.environ['http_proxy']
-if 'https_proxy' in os.environ:
-    del os.environ['https_proxy']
-
+from app import metrics
 from app.config import Config
+from app.observability import RequestMetricsMiddleware
+from app.domain.interview_config import InterviewConfigRegistry, InterviewConfigError
+from app.domain.summary import Summary
 from app.domain.question_flow import QuestionFlow
-from app.domain.summary import InterviewSummary, Summary
-from app.services.stt_service import STTService
-from app.services.gemini_service import GeminiService
-from app.services.tts_service import TTSService
-from app.services.docx_service import DocxService
+from app.domain.session_store import SessionStore
+from app.domain.transcript import Transcript
+from app.services.audio_ingest import (
+    AudioInput, AudioTooLargeError, UploadLimitMiddleware, ingest_upload
+)
+from app.services.gemini_call import GeminiCallError
+from app.services.result_cache import ResultCache, make_key
+from app.services.chunked_stt import ChunkedTranscriber, ChunkedUploadError
+from app.services.document_store import DocumentStore, GeneratedDocument, sweep_directory
+from app.services.job_queue import Job, JobQueue, QueueFullError, JOB_DONE
+from app.services.page_cache import CachedFile, PageCache
+from app.services.interview_store import InterviewStore
+from app.services import cpu_pool, executor
+from app.services.cpu_pool import CPUPoolError
+from app.services.zip_stream import ZipStream
 
 # FastAPIアプリケーション初期化
 app = FastAPI(title="議事録インタビューAI")
@@ -38,56 +49,379 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# 静的ファイルの配信（app/ui/staticを使用）
-static_dir = Path(__file__).parent / "app" / "ui" / "static"
-static_dir.mkdir(parents=True, exist_ok=True)
-app.mount("/static", StaticFiles(directory=str(static_dir)), name="static")
+# multipart のヘッダー等を見込んだ余裕（バイト）
+UPLOAD_OVERHEAD_BYTES = 64 * 1024
+
+# 音声アップロードのサイズ上限（本文の受信中に確認、対象は /api/stt のみ）
+app.add_middleware(
+    UploadLimitMiddleware,
+    path_prefix="/api/stt",
+    max_bytes=Config.STT_MAX_UPLOAD_BYTES + UPLOAD_OVERHEAD_BYTES
+)
 
-# サービス初期化
-questions = Config.load_questions()
-question_flow = QuestionFlow(questions)
-interview_summary = InterviewSummary()
-stt_service = STTService()
-gemini_service = GeminiService()
-tts_service = TTSService()
-docx_service = DocxService()
+# リクエストの所要時間・処理段階別の時間を記録（/metrics とJSONログ）
+app.add_middleware(RequestMetricsMiddleware, access_log=Config.ACCESS_LOG)
 
+# 画面と静的ファイル（app/ui）をメモリ上に保持して配信
+# Vercel用 - publicディレクトリのHTMLを優先
+page_cache = PageCache(
+    page_dirs=[Path(__file__).parent / "public", Path(__file__).parent / "app" / "ui" / "templates"],
+    static_dir=Path(__file__).parent / "app" / "ui" / "static",
+    check_interval=Config.PAGE_RELOAD_INTERVAL
+)
 
-@app.get("/")
-async def root():
-    """ルートエンドポイント - カテゴリー選択画面"""
-    # Vercel用 - publicディレクトリを優先
-    public_path = Path(__file__).parent / "public" / "top.html"
-    template_path = Path(__file__).parent / "app" / "ui" / "templates" / "top.html"
+config_registry = InterviewConfigRegistry(Config.BASE_DIR, Config.CONFIG_RELOAD_INTERVAL)
+
+
+def _question_flow_for(interview_type: str) -> Optional[QuestionFlow]:
+    """インタビュータイプの質問フロー（永続化先から読み込んだセッション用）"""
+    if interview_type == "default":
+        return services.question_flow
+    try:
+        config = config_registry.get(interview_type)
+    except InterviewConfigError:
+        return None
+    return config.question_flow if config else None
+
+
+# インタビュー状態の永続化先（複数ワーカープロセス・再起動をまたいで共有）
+interview_store = InterviewStore(
+    Path(Config.INTERVIEW_DB),
+    ttl_seconds=Config.SESSION_TTL_SECONDS,
+    flush_interval=Config.INTERVIEW_DB_FLUSH_INTERVAL,
+    batch_size=Config.INTERVIEW_DB_BATCH_SIZE
+) if Config.INTERVIEW_DB else None
+session_store = SessionStore(
+    ttl_seconds=Config.SESSION_TTL_SECONDS,
+    max_sessions=Config.SESSION_MAX_COUNT,
+    max_bytes=Config.SESSION_MAX_BYTES,
+    store=interview_store,
+    resolve_flow=_question_flow_for
+)
+result_cache = ResultCache(
+    max_entries=Config.RESULT_CACHE_MAX_ENTRIES,
+    max_bytes=Config.RESULT_CACHE_MAX_BYTES,
+    ttl_seconds=Config.RESULT_CACHE_TTL_SECONDS,
+    db_path=Path(Config.RESULT_CACHE_DB) if Config.RESULT_CACHE_DB else None,
+    db_max_entries=Config.RESULT_CACHE_DB_MAX_ENTRIES
+)
+
+
+class _Services:
+    """
+    Gemini・Word関連サービスの遅延初期化
+    
+    google.genai や python-docx の読み込み・クライアント生成は初回利用時に行う。
+    画面の配信や質問取得だけのリクエスト（サーバーレスのコールドスタート）では
+    これらを読み込まない。APIキー未設定の場合も、Geminiを使うAPIだけがエラーになる。
+    """
+    
+    def created(self, name: str) -> bool:
+        """サービスが生成済みかどうか"""
+        return name in self.__dict__
+    
+    @cached_property
+    def question_flow(self):
+        """config.json の質問フロー（インタビュータイプ省略時に使用）"""
+        from app.domain.question_flow import QuestionFlow
+        return QuestionFlow(Config.load_questions())
     
-    file_path = public_path if public_path.exists() else template_path
+    @cached_property
+    def model_router(self):
+        from app.services.model_router import (
+            ModelRouter, ROUTE_MINUTES_MAP, ROUTE_STT, ROUTE_SUMMARY
+        )
+        return ModelRouter(
+            Config.GEMINI_MODEL,
+            Config.GEMINI_FAST_MODEL,
+            fast_max_sizes={
+                ROUTE_SUMMARY: Config.MODEL_ROUTE_SUMMARY_MAX_CHARS,
+                ROUTE_STT: Config.MODEL_ROUTE_STT_MAX_BYTES,
+                ROUTE_MINUTES_MAP: Config.MODEL_ROUTE_MINUTES_MAP_MAX_CHARS,
+            }
+        )
+    
+    @cached_property
+    def stt(self):
+        from app.services.stt_service import STTService
+        return STTService(cache=result_cache, router=self.model_router)
+    
+    @cached_property
+    def context_cache(self):
+        if not Config.GEMINI_CONTEXT_CACHE:
+            return None
+        from app.services.context_cache import ContextCache
+        from app.services.gemini_client import get_client
+        return ContextCache(get_client(), ttl_seconds=Config.GEMINI_CONTEXT_CACHE_TTL)
     
-    if file_path.exists():
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        return Response(content=content, media_type="text/html")
+    @cached_property
+    def gemini(self):
+        from app.services.gemini_service import GeminiService
+        return GeminiService(
+            cache=result_cache,
+            router=self.model_router,
+            context_cache=self.context_cache
+        )
+    
+    @cached_property
+    def chunked_transcriber(self):
+        return ChunkedTranscriber(
+            self.stt,
+            ttl_seconds=Config.STT_CHUNK_TTL_SECONDS,
+            max_uploads=Config.STT_CHUNK_MAX_UPLOADS,
+            max_segments=Config.STT_CHUNK_MAX_SEGMENTS
+        )
+    
+    @cached_property
+    def tts(self):
+        from app.services.tts_service import TTSService
+        return TTSService()
+    
+    @cached_property
+    def tts_cache(self):
+        from app.services.tts_cache import TTSCache
+        cache_dir = Path(Config.TTS_CACHE_DIR) if Config.TTS_CACHE_DIR else Config.OUTPUTS_DIR / "tts"
+        return TTSCache(self.tts, cache_dir, max_memory_bytes=Config.TTS_CACHE_MAX_BYTES)
+    
+    @cached_property
+    def minutes(self):
+        from app.services.minutes_service import MinutesService
+        return MinutesService(
+            self.gemini,
+            spill_to_disk=Config.DOCX_SPILL_TO_DISK,
+            map_reduce_threshold=Config.MINUTES_MAP_REDUCE_TOKENS,
+            chunk_tokens=Config.MINUTES_CHUNK_TOKENS,
+            map_concurrency=Config.MINUTES_MAP_CONCURRENCY,
+            context_cache_min_tokens=Config.GEMINI_CONTEXT_CACHE_MIN_TOKENS
+        )
+
+
+# サービス初期化（初回利用時に生成）
+services = _Services()
+document_store = DocumentStore(
+    ttl_seconds=Config.DOCUMENT_TTL_SECONDS,
+    max_entries=Config.DOCUMENT_MAX_COUNT,
+    max_bytes=Config.DOCUMENT_MAX_BYTES
+)
+job_queue = JobQueue(
+    workers=Config.DOCX_JOB_WORKERS,
+    max_pending=Config.DOCX_JOB_MAX_PENDING,
+    ttl_seconds=Config.DOCX_JOB_TTL_SECONDS,
+    # 生成済み文書（トークン）はジョブより先に破棄されうる
+    result_available=lambda token: document_store.get(token) is not None
+)
+
+DOCX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+
+# 質問音声の事前合成タスク
+_tts_precompute_task: Optional[asyncio.Task] = None
+
+
+def _all_question_texts() -> list:
+    """全インタビュータイプ（と config.json）の質問文"""
+    flows = [services.question_flow]
+    for interview_type in config_registry.interview_types():
+        try:
+            config = config_registry.get(interview_type)
+        except InterviewConfigError:
+            continue
+        if config is not None:
+            flows.append(config.question_flow)
+    return [question.text for flow in flows for question in flow.questions]
+
+
+async def _precompute_tts():
+    """
+    質問音声を合成してキャッシュに保存し、以降は一定間隔で設定の変更を確認する
+    
+    キャッシュキーは質問文のハッシュなので、変更・追加された質問だけが合成される。
+    """
+    while True:
+        try:
+            synthesized = await services.tts_cache.warm(_all_question_texts())
+            if synthesized:
+                print(f"TTS precompute: {synthesized} question prompts synthesized")
+        except Exception as e:
+            print(f"TTS precompute Error: {e}")
+        await asyncio.sleep(Config.TTS_PRECOMPUTE_INTERVAL)
+
+
+@app.on_event("startup")
+async def startup_event():
+    """インタビュー設定を一括読み込みし、不正なファイルを報告"""
+    errors = config_registry.load_all()
+    print(f"Loaded interview configs: {', '.join(config_registry.interview_types())}")
+    for interview_type, error in errors.items():
+        print(f"Invalid interview config ({interview_type}): {error}")
+    
+    # 前回起動時に残ったWordファイルを削除
+    removed = sweep_directory(Config.OUTPUTS_DIR, Config.DOCUMENT_TTL_SECONDS)
+    if removed:
+        print(f"Removed {removed} stale documents from {Config.OUTPUTS_DIR}")
+    
+    # 議事録生成ジョブのワーカーを起動
+    job_queue.start()
+    
+    # 全インタビュータイプの質問音声を事前に合成
+    if Config.TTS_PRECOMPUTE_INTERVAL > 0:
+        global _tts_precompute_task
+        _tts_precompute_task = asyncio.create_task(_precompute_tts())
+    
+    # Gemini APIへの接続を事前確立（初回リクエストのTLSハンドシェイクを回避）
+    if Config.GEMINI_WARMUP_CONNECTIONS > 0:
+        from app.services import gemini_client
+        opened = await executor.run_blocking(
+            gemini_client.warmup, Config.GEMINI_WARMUP_CONNECTIONS
+        )
+        print(f"Gemini warm-up: {opened}/{Config.GEMINI_WARMUP_CONNECTIONS} connections")
+    
+    # Word文書生成用のプロセスを起動し、テンプレートを読み込んでおく
+    if Config.CPU_POOL_WARMUP:
+        from app.services import docx_service
+        started = await cpu_pool.warmup(docx_service.warm_worker)
+        print(f"CPU pool warm-up: {started}/{cpu_pool.pool_size()} workers")
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """ジョブワーカー・スレッドプール・プロセスプール・キャッシュを停止し、生成済み文書を破棄"""
+    await job_queue.stop()
+    if _tts_precompute_task is not None:
+        _tts_precompute_task.cancel()
+    document_store.clear()
+    if services.created("context_cache") and services.context_cache is not None:
+        await services.context_cache.close()
+    if interview_store is not None:
+        await interview_store.close()
+    executor.shutdown()
+    cpu_pool.shutdown()
+    result_cache.close()
+
+
+def _cached_file_response(cached: CachedFile, request: Request, cache_control: str) -> Response:
+    """メモリ上のファイルを返す（条件付きリクエストには304、圧縮はAccept-Encodingに合わせる）"""
+    body, encoding, etag = cached.select(request.headers.get("accept-encoding", ""))
+    headers = {
+        "ETag": etag,
+        "Last-Modified": cached.last_modified,
+        "Cache-Control": cache_control,
+        "Vary": "Accept-Encoding"
+    }
+    if cached.not_modified(
+        request.headers.get("if-none-match", ""),
+        request.headers.get("if-modified-since", "")
+    ):
+        return Response(status_code=304, headers=headers)
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type=cached.content_type, headers=headers)
+
+
+async def _page_response(name: str, request: Request) -> Optional[Response]:
+    """HTML画面を返す（毎回ETagで再検証させる）。見つからない場合はNone"""
+    cached = await page_cache.page(name)
+    if cached is None:
+        return None
+    return _cached_file_response(cached, request, "no-cache")
+
+
+@app.get("/")
+async def root(request: Request):
+    """ルートエンドポイント - カテゴリー選択画面"""
+    response = await _page_response("top.html", request)
+    if response is not None:
+        return response
     return {"message": "議事録インタビューAI API"}
 
 
 @app.get("/interview/{interview_type}")
-async def interview_page(interview_type: str):
+async def interview_page(interview_type: str, request: Request):
     """インタビューページ"""
-    # Vercel用 - publicディレクトリを優先
-    public_path = Path(__file__).parent / "public" / "index.html"
-    template_path = Path(__file__).parent / "app" / "ui" / "templates" / "index.html"
-    
-    file_path = public_path if public_path.exists() else template_path
-    
-    if file_path.exists():
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        return Response(content=content, media_type="text/html")
+    response = await _page_response("index.html", request)
+    if response is not None:
+        return response
     return JSONResponse(
         status_code=404,
         content={"error": "Interview page not found"}
     )
 
 
+@app.get("/bulk/{interview_type}")
+async def bulk_page(interview_type: str, request: Request):
+    """一括入力ページ"""
+    response = await _page_response("bulk.html", request)
+    if response is not None:
+        return response
+    return JSONResponse(
+        status_code=404,
+        content={"error": "Bulk page not found"}
+    )
+
+
+@app.get("/static/{path:path}")
+async def static_file(path: str, request: Request):
+    """
+    静的ファイル
+    
+    フィンガープリント付きURL（HTMLから参照されるもの）は内容が変わらないため
+    長期間キャッシュさせる。それ以外のURLは毎回ETagで再検証させる。
+    """
+    cached, fingerprinted = await page_cache.asset(path)
+    if cached is None:
+        return JSONResponse(status_code=404, content={"error": "Not found"})
+    cache_control = "public, max-age=31536000, immutable" if fingerprinted else "no-cache"
+    return _cached_file_response(cached, request, cache_control)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match ヘッダーがETagに一致するか（弱い比較）"""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or any(
+        tag.removeprefix("W/") == etag for tag in candidates
+    )
+
+
+@app.get("/api/{interview_type}/questions")
+async def get_questions(interview_type: str, request: Request):
+    """
+    質問一覧を一括取得
+    
+    Args:
+        interview_type: インタビュータイプ (denryoku, hoken, ippan, other, free)
+        
+    Returns:
+        ID順の質問リストとカテゴリー別グループ（ETagで再検証可能）
+    """
+    try:
+        config = config_registry.get(interview_type)
+    except InterviewConfigError:
+        return JSONResponse(
+            status_code=503,
+            content={"error": "Interview type configuration is invalid"}
+        )
+    
+    if config is None:
+        return JSONResponse(
+            status_code=404,
+            content={"error": "Interview type not found"}
+        )
+    
+    headers = {
+        "ETag": config.etag,
+        "Cache-Control": f"public, max-age={Config.QUESTIONS_CACHE_MAX_AGE}, must-revalidate"
+    }
+    if _etag_matches(request.headers.get("if-none-match", ""), config.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(
+        content=config.questions_body,
+        media_type="application/json",
+        headers=headers
+    )
+
+
 @app.get("/api/{interview_type}/question/{question_id}")
 async def get_question(interview_type: str, question_id: int):
     """
@@ -100,43 +434,195 @@ async def get_question(interview_type: str, question_id: int):
     Returns:
         質問データ
     """
-    # タイプ別の設定ファイルを読み込む
-    import json
-    config_path = Path(__file__).parent / f"config_{interview_type}.json"
+    try:
+        config = config_registry.get(interview_type)
+    except InterviewConfigError:
+        return JSONResponse(
+            status_code=503,
+            content={"error": "Interview type configuration is invalid"}
+        )
     
-    if not config_path.exists():
+    if config is None:
         return JSONResponse(
             status_code=404,
             content={"error": "Interview type not found"}
         )
     
-    with open(config_path, 'r', encoding='utf-8') as f:
-        config = json.load(f)
+    # 質問を検索
+    question = config.question_flow.get_question(question_id)
     
-    questions = config.get('questions', [])
+    if not question:
+        return JSONResponse(
+            status_code=404,
+            content={"error": "Question not found"}
+        )
     
-    # 質問を検索
-    question = next((q for q in questions if q['id'] == question_id), None)
+    return {
+        "id": question.id,
+        "text": question.text,
+        "category": question.category,
+        "is_last": question_id >= config.total_questions,
+        "total_questions": config.total_questions
+    }
+
+
+async def _resolve_session(session_id: Optional[str], interview_type: Optional[str]):
+    """
+    セッションを取得（存在しない・期限切れの場合は新規作成）
     
+    Args:
+        session_id: クライアントが保持するセッションID
+        interview_type: インタビュータイプ（省略時は config.json の質問）
+        
+    Returns:
+        セッション、またはエラーレスポンス
+    """
+    if session_id:
+        session = await session_store.get(session_id)
+        if session is not None and (
+            interview_type is None or session.interview_type == interview_type
+        ):
+            return session
+    
+    if interview_type is None:
+        return await session_store.create("default", services.question_flow)
+    
+    try:
+        config = config_registry.get(interview_type)
+    except InterviewConfigError:
+        return JSONResponse(
+            status_code=503,
+            content={"error": "Interview type configuration is invalid"}
+        )
+    if config is None:
+        return JSONResponse(
+            status_code=404,
+            content={"error": "Interview type not found"}
+        )
+    return await session_store.create(interview_type, config.question_flow)
+
+
+def _mime_type(file: UploadFile) -> str:
+    """アップロードファイルのMIMEタイプ（パラメータを除く）"""
+    return (file.content_type or 'audio/webm').split(';')[0].strip()
+
+
+async def _resolve_question(session_id: Optional[str], interview_type: Optional[str], question_id: int):
+    """
+    セッションと質問を取得
+    
+    Returns:
+        (セッション, 質問)、またはエラーレスポンス
+    """
+    session = await _resolve_session(session_id, interview_type)
+    if isinstance(session, JSONResponse):
+        return session
+    
+    # 質問取得
+    question = session.question_flow.get_question(question_id)
     if not question:
         return JSONResponse(
             status_code=404,
             content={"error": "Question not found"}
         )
+    return session, question
+
+
+async def _answer_question(session, question, transcript: str,
+                           summary_text: Optional[str] = None) -> dict:
+    """
+    文字起こし結果を要約してセッションに保存し、次の質問を返す
+    
+    Args:
+        session: セッション
+        question: 回答対象の質問
+        transcript: 文字起こし結果
+        summary_text: 生成済みの要約（Noneの場合はここで生成）
+        
+    Returns:
+        文字起こし結果と要約、次の質問、セッションID
+    """
+    question_flow = session.question_flow
+    
+    # 要約生成
+    if summary_text is None:
+        with metrics.timed("summarize"):
+            summary_text = await services.gemini.summarize(question.text, transcript)
+    
+    # 要約を保存
+    summary = Summary(
+        question_id=question.id,
+        question_text=question.text,
+        summary_text=summary_text,
+        category=question.category
+    )
+    await session_store.add_summary(
+        session, summary, Transcript(question.id, question.text, transcript)
+    )
+    
+    # 次の質問を取得
+    next_question = question_flow.get_next_question(question.id)
     
     return {
-        "id": question['id'],
-        "text": question['text'],
-        "category": question['category'],
-        "is_last": question_id >= len(questions),
-        "total_questions": len(questions)
+        "session_id": session.session_id,
+        "transcript": transcript,
+        "summary": summary_text,
+        "next_question_id": next_question.id if next_question else None,
+        "next_question_text": next_question.text if next_question else None,
+        "is_last": question_flow.is_last_question(question.id)
     }
 
 
+async def _ingest_audio(file: UploadFile) -> AudioInput:
+    """アップロード音声をサイズ上限付きで取り込む"""
+    with metrics.timed("upload_read"):
+        return await ingest_upload(
+            file,
+            _mime_type(file),
+            max_bytes=Config.STT_MAX_UPLOAD_BYTES,
+            memory_threshold=Config.STT_SPOOL_THRESHOLD_BYTES
+        )
+
+
+def _gemini_error_response(error: GeminiCallError) -> JSONResponse:
+    """Gemini呼び出しの失敗をエラーレスポンスに変換"""
+    print(f"Gemini call failed: {error}")
+    headers = None
+    if error.retry_after is not None:
+        headers = {"Retry-After": str(max(1, round(error.retry_after)))}
+    return JSONResponse(
+        status_code=error.status_code,
+        content={"error": str(error)},
+        headers=headers
+    )
+
+
+def _cpu_pool_error_response(error: CPUPoolError) -> JSONResponse:
+    """文書生成の混雑・タイムアウトをエラーレスポンスに変換"""
+    print(f"Document rendering failed: {error}")
+    headers = None
+    if error.retry_after is not None:
+        headers = {"Retry-After": str(max(1, round(error.retry_after)))}
+    return JSONResponse(
+        status_code=error.status_code,
+        content={"error": str(error)},
+        headers=headers
+    )
+
+
+def _too_large_response(error: Exception) -> JSONResponse:
+    return JSONResponse(
+        status_code=413,
+        content={"error": str(error)}
+    )
+
+
 @app.post("/api/stt")
 async def speech_to_text(
     file: UploadFile = File(...),
-    question_id: int = Form(...)
+    question_id: int = Form(...),
+    session_id: Optional[str] = Form(None),
+    interview_type: Optional[str] = Form(None)
 ):
     """
     音声認識エンドポイント
@@ -144,201 +630,447 @@ async def speech_to_text(
     Args:
         file: 音声ファイル
         question_id: 質問ID
+        session_id: セッションID（初回は省略し、レスポンスの値を以降で送る）
+        interview_type: インタビュータイプ
         
     Returns:
-        文字起こし結果と要約、次の質問
+        文字起こし結果と要約、次の質問、セッションID
     """
     try:
-        # 質問取得
-        question = question_flow.get_question(question_id)
-        if not question:
-            return JSONResponse(
-                status_code=404,
-                content={"error": "Question not found"}
-            )
-        
-        # 音声データ読み込み
-        audio_data = await file.read()
+        resolved = await _resolve_question(session_id, interview_type, question_id)
+        if isinstance(resolved, JSONResponse):
+            return resolved
+        session, question = resolved
         
-        # STT（音声認識）
-        transcript = await stt_service.transcribe(audio_data)
+        # 音声データ読み込み（上限を超えたら中断、大きい音声は一時ファイルへ）
+        audio = await _ingest_audio(file)
+        try:
+            # 文字起こしと要約を1回で（失敗時は2段階にフォールバック）
+            if Config.STT_COMBINED_SUMMARY:
+                combined = await services.stt.transcribe_and_summarize(audio, question.text)
+                if combined is not None:
+                    transcript, summary_text = combined
+                    return await _answer_question(session, question, transcript, summary_text)
+            
+            # STT（音声認識）
+            transcript = await services.stt.transcribe_input(audio)
+        finally:
+            audio.cleanup()
         
-        # 要約生成
-        summary_text = await gemini_service.summarize(question.text, transcript)
+        return await _answer_question(session, question, transcript)
         
-        # 要約を保存
-        summary = Summary(
-            question_id=question.id,
-            question_text=question.text,
-            summary_text=summary_text,
-            category=question.category
+    except AudioTooLargeError as e:
+        return _too_large_response(e)
+    except GeminiCallError as e:
+        return _gemini_error_response(e)
+    except Exception as e:
+        print(f"Error in STT endpoint: {e}")
+        return JSONResponse(
+            status_code=500,
+            content={"error": str(e)}
         )
-        interview_summary.add_summary(summary)
+
+
+@app.post("/api/stt/chunk")
+async def speech_to_text_chunk(
+    file: UploadFile = File(...),
+    seq: int = Form(...),
+    upload_id: Optional[str] = Form(None),
+    overlap_ms: int = Form(0)
+):
+    """
+    音声の分割アップロード（録音中に送信）
+    
+    録音を数秒ごとに区切った単体再生可能なセグメントを連番付きで送る。
+    受信したセグメントはすぐにバックグラウンドで文字起こしを開始する。
+    最初のセグメントでは upload_id を省略し、レスポンスの値を以降で送る。
+    前のセグメントの末尾と重ねて録音した場合は overlap_ms にその長さを送る
+    （重なった部分の文字起こしだけを連結時に取り除く）。
+    録音終了後に /api/stt/finish を呼ぶ。
+    
+    Args:
+        file: 音声セグメント
+        seq: セグメントの連番（0始まり）
+        upload_id: アップロードID
+        overlap_ms: 前のセグメントと重ねて録音した長さ（ミリ秒）
         
-        # 次の質問を取得
-        next_question = question_flow.get_next_question(question_id)
+    Returns:
+        アップロードIDと受信済みの連番
+    """
+    try:
+        upload = None
+        if upload_id:
+            upload = services.chunked_transcriber.get(upload_id)
+            if upload is None:
+                return JSONResponse(
+                    status_code=404,
+                    content={"error": "Upload not found"}
+                )
         
-        response = {
-            "transcript": transcript,
-            "summary": summary_text,
-            "next_question_id": next_question.id if next_question else None,
-            "next_question_text": next_question.text if next_question else None,
-            "is_last": question_flow.is_last_question(question_id)
-        }
+        audio = await _ingest_audio(file)
+        if upload is not None:
+            services.chunked_transcriber.add_segment(upload, seq, audio, overlap_ms)
+            return {"upload_id": upload.upload_id, "seq": seq}
         
-        return response
+        # 音声を受け取れてから開始する（413などで空のアップロードを残さない）
+        upload = services.chunked_transcriber.start(_mime_type(file))
+        try:
+            services.chunked_transcriber.add_segment(upload, seq, audio, overlap_ms)
+        except ChunkedUploadError:
+            services.chunked_transcriber.discard(upload.upload_id)
+            raise
+        return {"upload_id": upload.upload_id, "seq": seq}
         
-    except Exception as e:
-        print(f"Error in STT endpoint: {e}")
+    except AudioTooLargeError as e:
+        return _too_large_response(e)
+    except ChunkedUploadError as e:
         return JSONResponse(
-            status_code=500,
+            status_code=400,
             content={"error": str(e)}
         )
 
 
-@app.get("/api/tts/{question_id}")
-async def text_to_speech(question_id: int):
+@app.post("/api/stt/finish")
+async def speech_to_text_finish(
+    upload_id: str = Form(...),
+    question_id: int = Form(...),
+    total_segments: Optional[int] = Form(None),
+    session_id: Optional[str] = Form(None),
+    interview_type: Optional[str] = Form(None)
+):
     """
-    音声合成エンドポイント
+    分割アップロードの完了（録音停止後に呼ぶ）
+    
+    全セグメントの文字起こしを待って境界の重複を除いて連結し、
+    /api/stt と同じ形式で要約と次の質問を返す。
+    セグメントが欠落している場合は 400 を返すが、アップロードは残るため
+    欠落分を再送してから呼び直せる。
     
     Args:
+        upload_id: アップロードID
         question_id: 質問ID
+        total_segments: 送信したセグメント数（欠落の検出に使用）
+        session_id: セッションID
+        interview_type: インタビュータイプ
         
     Returns:
-        音声ファイル
+        文字起こし結果と要約、次の質問、セッションID
     """
     try:
-        # 質問取得
-        question = question_flow.get_question(question_id)
-        if not question:
-            return JSONResponse(
-                status_code=404,
-                content={"error": "Question not found"}
-            )
+        resolved = await _resolve_question(session_id, interview_type, question_id)
+        if isinstance(resolved, JSONResponse):
+            return resolved
+        session, question = resolved
         
-        # TTS（音声合成）
-        audio_data = await tts_service.synthesize(question.text)
+        transcript = await services.chunked_transcriber.finish(upload_id, total_segments)
         
-        # 一時ファイルに保存
-        temp_file = Config.OUTPUTS_DIR / f"tts_{question_id}.mp3"
-        with open(temp_file, "wb") as f:
-            f.write(audio_data)
+        return await _answer_question(session, question, transcript)
         
-        return FileResponse(
-            temp_file,
-            media_type="audio/mpeg",
-            filename=f"question_{question_id}.mp3"
+    except ChunkedUploadError as e:
+        return JSONResponse(
+            status_code=400,
+            content={"error": str(e)}
         )
-        
+    except GeminiCallError as e:
+        return _gemini_error_response(e)
+    except Exception as e:
+        print(f"Error in STT finish endpoint: {e}")
+        return JSONResponse(
+            status_code=500,
+            content={"error": str(e)}
+        )
+
+
+def _parse_range(range_header: str, size: int):
+    """
+    Range ヘッダー（単一範囲の bytes=start-end）を解釈
+    
+    Returns:
+        (開始, 終了)（終了を含む）。ヘッダーなし・解釈できない場合はNone、
+        範囲外の場合は "unsatisfiable"
+    """
+    unit, _, spec = range_header.partition("=")
+    if unit.strip() != "bytes" or "," in spec:
+        return None
+    start_text, sep, end_text = spec.strip().partition("-")
+    if not sep:
+        return None
+    try:
+        if start_text:
+            start = int(start_text)
+            end = int(end_text) if end_text else size - 1
+            if end_text and start > end:
+                # 終了が開始より前の指定は不正（Range ヘッダーを無視する）
+                return None
+        else:
+            # bytes=-N は末尾Nバイト
+            length = int(end_text)
+            if length <= 0:
+                return "unsatisfiable"
+            start, end = max(0, size - length), size - 1
+    except ValueError:
+        return None
+    if start >= size:
+        return "unsatisfiable"
+    return start, min(end, size - 1)
+
+
+def _audio_response(audio, request: Request, filename: str) -> Response:
+    """合成済み音声を返す（ETagで再検証、Rangeで部分取得）"""
+    size = len(audio.data)
+    headers = {
+        "ETag": audio.etag,
+        "Accept-Ranges": "bytes",
+        "Cache-Control": "public, max-age=86400",
+        "Content-Disposition": f"inline; filename=\"{filename}\""
+    }
+    if _etag_matches(request.headers.get("if-none-match", ""), audio.etag):
+        return Response(status_code=304, headers=headers)
+    
+    byte_range = None
+    if_range = request.headers.get("if-range")
+    if "range" in request.headers and (if_range is None or if_range == audio.etag):
+        byte_range = _parse_range(request.headers["range"], size)
+    if byte_range == "unsatisfiable":
+        return Response(
+            status_code=416,
+            headers={**headers, "Content-Range": f"bytes */{size}"}
+        )
+    if byte_range is not None:
+        start, end = byte_range
+        return Response(
+            content=audio.data[start:end + 1],
+            status_code=206,
+            media_type=audio.media_type,
+            headers={**headers, "Content-Range": f"bytes {start}-{end}/{size}"}
+        )
+    return Response(content=audio.data, media_type=audio.media_type, headers=headers)
+
+
+async def _speak_question(question_flow, question_id: int, request: Request):
+    """質問文の読み上げ音声（キャッシュになければ合成）"""
+    question = question_flow.get_question(question_id)
+    if not question:
+        return JSONResponse(
+            status_code=404,
+            content={"error": "Question not found"}
+        )
+    
+    try:
+        audio = await services.tts_cache.get_or_synthesize(question.text)
+    except GeminiCallError as e:
+        return _gemini_error_response(e)
     except Exception as e:
         print(f"Error in TTS endpoint: {e}")
         return JSONResponse(
             status_code=500,
             content={"error": str(e)}
         )
+    if audio is None:
+        return JSONResponse(
+            status_code=503,
+            content={"error": "Speech synthesis is unavailable"}
+        )
+    return _audio_response(
+        audio, request, f"question_{question_id}.{services.tts.extension}"
+    )
 
 
-@app.post("/api/docx")
-async def generate_docx(request: dict = Body(...)):
+@app.get("/api/tts/{question_id}")
+async def text_to_speech(question_id: int, request: Request):
     """
-    Word文書生成エンドポイント
-    全質問の回答をまとめてGemini APIで要約・整形してから文書化
+    音声合成エンドポイント（config.json の質問）
     
     Args:
-        request: {"answers": {question_id: {"transcript": "..."}, ...}}
+        question_id: 質問ID
         
     Returns:
-        生成されたWordファイル
+        音声ファイル（ETag・Range対応）
     """
-    try:
-        # フロントエンドから全回答とインタビュータイプを受け取る
-        answers = request.get("answers", {})
-        interview_type = request.get("interview_type", "ippan")
+    return await _speak_question(services.question_flow, question_id, request)
+
+
+@app.get("/api/{interview_type}/tts/{question_id}")
+async def text_to_speech_for_type(interview_type: str, question_id: int, request: Request):
+    """
+    音声合成エンドポイント（インタビュータイプ別）
+    
+    Args:
+        interview_type: インタビュータイプ
+        question_id: 質問ID
         
-        if not answers:
+    Returns:
+        音声ファイル（ETag・Range対応）
+    """
+    try:
+        config = config_registry.get(interview_type)
+    except InterviewConfigError:
+        return JSONResponse(
+            status_code=503,
+            content={"error": "Interview type configuration is invalid"}
+        )
+    if config is None:
+        return JSONResponse(
+            status_code=404,
+            content={"error": "Interview type not found"}
+        )
+    return await _speak_question(config.question_flow, question_id, request)
+
+
+def _docx_response(document: GeneratedDocument, cleanup: bool = False) -> Response:
+    """
+    Word文書のレスポンスを作成
+    
+    Args:
+        document: 生成済み文書
+        cleanup: 送信後にディスク上のファイルを削除する
+    """
+    # Set Content-Disposition using RFC5987 (filename*), percent-encoding UTF-8
+    # This avoids latin-1 encoding errors when header contains non-ASCII chars.
+    headers = {"Content-Disposition": f"inline; filename*=UTF-8''{quote(document.filename)}"}
+    if document.data is not None:
+        # メモリ上のバイト列をそのまま送信
+        return Response(
+            content=document.data,
+            media_type=DOCX_MEDIA_TYPE,
+            headers=headers
+        )
+    return FileResponse(
+        document.path,
+        media_type=DOCX_MEDIA_TYPE,
+        headers=headers,
+        background=BackgroundTask(document.cleanup) if cleanup else None
+    )
+
+
+def _answers_error(answers) -> Optional[str]:
+    """
+    answers の形式を検証
+    
+    Returns:
+        エラー内容（正しい形式の場合はNone）
+    """
+    if not isinstance(answers, dict):
+        return "answers must be an object"
+    for question_id, answer in answers.items():
+        try:
+            int(question_id)
+        except (TypeError, ValueError):
+            return f"Invalid question id: {question_id}"
+        if not isinstance(answer, dict):
+            return f"Answer for question {question_id} must be an object"
+        if not isinstance(answer.get("transcript", ""), str):
+            return f"Transcript for question {question_id} must be a string"
+    return None
+
+
+async def _prepare_minutes(request: dict):
+    """
+    リクエストから議事録生成の入力を作成
+    
+    session_id を指定した場合、answers を省略するとセッションに保存済みの
+    文字起こしを使う（永続化先がある場合）。整形結果はセッションに保存する。
+    
+    Returns:
+        (議事録生成の入力, セッション（session_id 指定時のみ）)、またはエラーレスポンス
+    """
+    # フロントエンドから全回答とインタビュータイプを受け取る
+    answers = request.get("answers", {})
+    interview_type = request.get("interview_type")
+    
+    session = None
+    if request.get("session_id"):
+        if not isinstance(request["session_id"], str):
             return JSONResponse(
                 status_code=400,
-                content={"error": "No answers available"}
+                content={"error": "session_id must be a string"}
             )
-        
-        # インタビュータイプの設定ファイルを読み込む
-        import json
-        config_path = Path(__file__).parent / f"config_{interview_type}.json"
-        
-        if not config_path.exists():
+        session = await session_store.get(request["session_id"])
+        if session is None:
             return JSONResponse(
                 status_code=404,
-                content={"error": "Interview type configuration not found"}
+                content={"error": "Session not found"}
             )
-        
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = json.load(f)
-        
-        custom_prompt = config.get('summary_prompt', '')
-        questions = config.get('questions', [])
-        
-        # 全質問と回答をまとめたテキストを作成
-        all_qa_text = ""
-        
-        for question_id_str, answer_data in answers.items():
-            question_id = int(question_id_str)
-            question = next((q for q in questions if q['id'] == question_id), None)
-            if question and answer_data.get("transcript"):
-                all_qa_text += f"【{question['category']}】{question['text']}\n"
-                all_qa_text += f"回答: {answer_data['transcript']}\n\n"
-        
-        # Gemini APIで全体を要約・整形（1回だけAPI呼び出し）
-        print(f"Gemini APIで全回答を要約・整形中... (タイプ: {interview_type})")
+        interview_type = interview_type or session.interview_type
+        if not answers:
+            answers = {
+                str(t.question_id): {"transcript": t.raw_text}
+                for t in await session_store.get_transcripts(session)
+            }
+    interview_type = interview_type or "ippan"
+    if not isinstance(interview_type, str):
+        return JSONResponse(
+            status_code=400,
+            content={"error": "interview_type must be a string"}
+        )
+    
+    if not answers:
+        return JSONResponse(
+            status_code=400,
+            content={"error": "No answers available"}
+        )
+    error = _answers_error(answers)
+    if error:
+        return JSONResponse(
+            status_code=400,
+            content={"error": error}
+        )
+    
+    # インタビュータイプの設定を取得
+    try:
+        config = config_registry.get(interview_type)
+    except InterviewConfigError:
+        return JSONResponse(
+            status_code=503,
+            content={"error": "Interview type configuration is invalid"}
+        )
+    
+    if config is None:
+        return JSONResponse(
+            status_code=404,
+            content={"error": "Interview type configuration not found"}
+        )
+    
+    return services.minutes.prepare(config, answers), session
 
-        # カスタムプロンプトを使用
-        # 不要な固定項目（質問でない項目）をプロンプトから除去する
-        def _remove_fixed_sections(text: str) -> str:
-            import re
-            targets = ['会社メールアドレス', '訪問日時', '開催場所']
-            for t in targets:
-                pattern = r"【" + re.escape(t) + r"】[\s\S]*?(（記載なし）|$)"
-                text = re.sub(pattern, '', text)
-            text = re.sub(r"\n{2,}", "\n\n", text).strip()
-            return text
 
-        sanitized_prompt = _remove_fixed_sections(custom_prompt)
+async def _save_minutes(session, formatted_content: str):
+    """整形済みの議事録をセッションに保存（session_id 指定時のみ）"""
+    if session is not None:
+        await session_store.save_minutes(session, formatted_content)
 
-        # プロンプトと全QAテキストを連結して要約用プロンプトを作成
-        summary_prompt = f"{sanitized_prompt}\n\n{all_qa_text}".strip()
 
+@app.post("/api/docx")
+async def generate_docx(request: dict = Body(...)):
+    """
+    Word文書生成エンドポイント
+    全質問の回答をまとめてGemini APIで要約・整形してから文書化
+    
+    Args:
+        request: {"answers": {question_id: {"transcript": "..."}, ...}, "session_id": 任意}
+        
+    Returns:
+        生成されたWordファイル
+    """
+    try:
+        prepared = await _prepare_minutes(request)
+        if isinstance(prepared, JSONResponse):
+            return prepared
+        minutes, session = prepared
+        
         # Geminiに投げて整形結果を取得
-        formatted_content = await gemini_service.summarize("議事録作成", summary_prompt)
-        
-        # 整形された内容からSummaryオブジェクトを作成
-        summaries = []
-        for question_id_str, answer_data in answers.items():
-            question_id = int(question_id_str)
-            question = question_flow.get_question(question_id)
-            if question:
-                summary = Summary(
-                    question_id=question.id,
-                    question_text=question.text,
-                    summary_text=answer_data.get("transcript", ""),
-                    category=question.category
-                )
-                summaries.append(summary)
+        formatted_content = await services.minutes.format(minutes)
+        await _save_minutes(session, formatted_content)
         
         # Word文書生成（整形済みの内容を含める）
-        output_path = docx_service.generate_document(summaries, formatted_content)
-        
-        from urllib.parse import quote
-        filename = f"議事録_{summaries[0].question_id if summaries else 'output'}.docx"
-        # Create FileResponse normally (let Starlette handle content-length, etc.)
-        response = FileResponse(
-            output_path,
-            media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-            filename=filename
-        )
-        # Set Content-Disposition using RFC5987 (filename*), percent-encoding UTF-8
-        # This avoids latin-1 encoding errors when header contains non-ASCII chars.
-        response.headers["Content-Disposition"] = f"inline; filename*=UTF-8''{quote(filename)}"
-        return response
+        document = await services.minutes.render(minutes, formatted_content)
+        
+        return _docx_response(document, cleanup=True)
         
+    except GeminiCallError as e:
+        return _gemini_error_response(e)
+    except CPUPoolError as e:
+        return _cpu_pool_error_response(e)
     except Exception as e:
         print(f"Error in DOCX endpoint: {e}")
         import traceback
@@ -349,6 +1081,386 @@ async def generate_docx(request: dict = Body(...)):
         )
 
 
+def _sse_event(event: str, data: dict) -> str:
+    """Server-Sent Events の1イベント分を作成"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@app.post("/api/docx/stream")
+async def generate_docx_stream(request: dict = Body(...)):
+    """
+    Word文書生成エンドポイント（Server-Sent Events）
+    Geminiの整形結果を delta イベントで逐次送り、完了後に文書を生成して
+    done イベントでダウンロードURLを返す
+    
+    Args:
+        request: {"answers": {question_id: {"transcript": "..."}, ...}, "session_id": 任意}
+        
+    Returns:
+        text/event-stream（delta / done / error）
+    """
+    prepared = await _prepare_minutes(request)
+    if isinstance(prepared, JSONResponse):
+        return prepared
+    minutes, session = prepared
+    
+    async def events():
+        try:
+            parts = []
+            async for text in services.minutes.format_stream(minutes):
+                parts.append(text)
+                yield _sse_event("delta", {"text": text})
+            
+            # 蓄積した全文からWord文書を生成
+            formatted_content = "".join(parts).strip()
+            await _save_minutes(session, formatted_content)
+            document = await services.minutes.render(minutes, formatted_content)
+            token = document_store.put(document)
+            yield _sse_event("done", {"download_url": f"/api/docx/download/{token}"})
+            
+        except Exception as e:
+            print(f"Error in DOCX stream endpoint: {e}")
+            yield _sse_event("error", {"error": str(e)})
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            # リバースプロキシでのバッファリングを無効化
+            "X-Accel-Buffering": "no"
+        }
+    )
+
+
+@app.get("/api/docx/download/{token}")
+async def download_docx(token: str):
+    """
+    生成済みWord文書のダウンロード
+    
+    Args:
+        token: /api/docx/stream の done イベントで返されたトークン
+        
+    Returns:
+        生成されたWordファイル
+    """
+    document = document_store.get(token)
+    if document is None:
+        return JSONResponse(
+            status_code=404,
+            content={"error": "Document not found"}
+        )
+    return _docx_response(document)
+
+
+def _job_response(job: Job) -> dict:
+    """ジョブ登録のレスポンス（状態と各URL）"""
+    return {
+        **job.to_dict(),
+        "status_url": f"/api/docx/jobs/{job.job_id}",
+        "events_url": f"/api/docx/jobs/{job.job_id}/events",
+        "download_url": f"/api/docx/jobs/{job.job_id}/download"
+    }
+
+
+@app.post("/api/docx/jobs", status_code=202)
+async def create_docx_job(http_request: Request, request: dict = Body(...)):
+    """
+    Word文書生成ジョブの登録（非同期モード）
+    すぐにジョブIDを返し、Gemini整形とWord生成はワーカーで実行する
+    
+    同じ Idempotency-Key ヘッダー（省略時はリクエスト内容のハッシュ）の
+    ジョブが実行中・完了済みの場合は既存のジョブを返す
+    
+    Args:
+        request: {"answers": {question_id: {"transcript": "..."}, ...}, "session_id": 任意}
+        
+    Returns:
+        ジョブIDと状態・ダウンロードURL
+    """
+    # 明示的なキーの重複送信は入力を組み立てる前に既存のジョブを返す
+    key = http_request.headers.get("idempotency-key")
+    if key:
+        existing = job_queue.find(key)
+        if existing is not None:
+            return _job_response(existing)
+    
+    prepared = await _prepare_minutes(request)
+    if isinstance(prepared, JSONResponse):
+        return prepared
+    minutes, session = prepared
+    
+    # 保存済みの文字起こしを使う場合もあるため、入力のプロンプトもキーに含める
+    key = key or make_key(
+        "docx-job", json.dumps(request, ensure_ascii=False, sort_keys=True), minutes.prompt
+    )
+    
+    async def run():
+        formatted_content = await services.minutes.format(minutes)
+        await _save_minutes(session, formatted_content)
+        document = await services.minutes.render(minutes, formatted_content)
+        return document_store.put(document)
+    
+    try:
+        job = job_queue.submit(key, run)
+    except QueueFullError:
+        return JSONResponse(
+            status_code=429,
+            content={"error": "Too many pending jobs"},
+            headers={"Retry-After": "5"}
+        )
+    
+    return _job_response(job)
+
+
+@app.get("/api/docx/jobs/{job_id}")
+async def get_docx_job(job_id: str):
+    """
+    Word文書生成ジョブの状態取得（ポーリング用）
+    
+    Args:
+        job_id: ジョブID
+        
+    Returns:
+        ジョブの状態（queued / running / done / failed）
+    """
+    job = job_queue.get(job_id)
+    if job is None:
+        return JSONResponse(
+            status_code=404,
+            content={"error": "Job not found"}
+        )
+    return job.to_dict()
+
+
+@app.get("/api/docx/jobs/{job_id}/events")
+async def docx_job_events(job_id: str):
+    """
+    Word文書生成ジョブの状態変化を購読（Server-Sent Events）
+    
+    Args:
+        job_id: ジョブID
+        
+    Returns:
+        text/event-stream（状態が変わるたびに status イベント）
+    """
+    job = job_queue.get(job_id)
+    if job is None:
+        return JSONResponse(
+            status_code=404,
+            content={"error": "Job not found"}
+        )
+    
+    async def events():
+        yield _sse_event("status", job.to_dict())
+        while not job.finished:
+            if await job.wait_for_change(timeout=15):
+                yield _sse_event("status", job.to_dict())
+            else:
+                # 接続維持用のコメント
+                yield ": keep-alive\n\n"
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"
+        }
+    )
+
+
+@app.get("/api/docx/jobs/{job_id}/download")
+async def download_docx_job(job_id: str):
+    """
+    Word文書生成ジョブの結果をダウンロード
+    
+    Args:
+        job_id: ジョブID
+        
+    Returns:
+        生成されたWordファイル（未完了の場合は409）
+    """
+    job = job_queue.get(job_id)
+    if job is None:
+        return JSONResponse(
+            status_code=404,
+            content={"error": "Job not found"}
+        )
+    if job.status != JOB_DONE:
+        return JSONResponse(
+            status_code=409,
+            content=job.to_dict()
+        )
+    document = document_store.get(job.result)
+    if document is None:
+        return JSONResponse(
+            status_code=404,
+            content={"error": "Document expired"}
+        )
+    return _docx_response(document)
+
+
+def _export_name(index: int, item: dict, interview_type: str) -> str:
+    """アーカイブ内のファイル名（番号で一意にする）"""
+    label = re.sub(r"[^\w-]", "_", str(item.get("session_id") or interview_type))[:40]
+    return f"議事録_{index + 1:03d}_{label}.docx"
+
+
+async def _export_document(item: dict) -> Tuple[str, GeneratedDocument]:
+    """
+    エクスポートする1件分のWord文書を生成
+    
+    answers を省略した session_id は保存済みの議事録（回答の変更がないもの）を
+    使い、Geminiでの整形を省く。
+    
+    Args:
+        item: {"session_id": "..."} または {"answers": {...}, "interview_type": "..."}
+        
+    Returns:
+        (インタビュータイプ, 生成済み文書)
+        
+    Raises:
+        ValueError: セッションや回答がない・インタビュータイプが不正
+    """
+    session_id = item.get("session_id")
+    if session_id and not item.get("answers") and interview_store is not None:
+        stored = await interview_store.get_minutes(session_id)
+        if stored is not None:
+            from app.services.minutes_service import MinutesInput
+            interview_type, content = stored
+            minutes = MinutesInput(interview_type, "", [], [])
+            return interview_type, await services.minutes.render(minutes, content)
+    
+    prepared = await _prepare_minutes(item)
+    if isinstance(prepared, JSONResponse):
+        raise ValueError(json.loads(prepared.body)["error"])
+    minutes, session = prepared
+    formatted_content = await services.minutes.format(minutes)
+    await _save_minutes(session, formatted_content)
+    return minutes.interview_type, await services.minutes.render(minutes, formatted_content)
+
+
+async def _write_export_entry(archive: ZipStream, name: str, document: GeneratedDocument):
+    """生成済み文書をアーカイブに書き込み、送信するバイト列を順に返す"""
+    try:
+        if document.data is not None:
+            yield await asyncio.to_thread(archive.add, name, document.data)
+            return
+        # ディスク上の文書は少しずつ読み込んで書き込む
+        with document.path.open("rb") as source, archive.open(name) as target:
+            while chunk := await asyncio.to_thread(source.read, 256 * 1024):
+                await asyncio.to_thread(target.write, chunk)
+                yield archive.drain()
+        yield archive.drain()
+    finally:
+        document.cleanup()
+
+
+async def _export_stream(items: list):
+    """
+    議事録を並行して生成し、完成したものから順にZIPとして送信
+    
+    同時に生成するのは EXPORT_CONCURRENCY 件までで、書き込んだ文書はすぐに
+    破棄するため、メモリ使用量は件数によらず一定になる。失敗した項目は
+    最後に errors.json として追加する。
+    """
+    archive = ZipStream()
+    errors = []
+    pending = iter(enumerate(items))
+    running: Dict[asyncio.Task, int] = {}
+    try:
+        while True:
+            for index, item in itertools.islice(
+                pending, max(1, Config.EXPORT_CONCURRENCY) - len(running)
+            ):
+                running[asyncio.create_task(_export_document(item))] = index
+            if not running:
+                break
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                index = running.pop(task)
+                try:
+                    interview_type, document = task.result()
+                except Exception as e:
+                    print(f"Export Error (item {index + 1}): {e}")
+                    errors.append({
+                        "item": index + 1,
+                        "session_id": items[index].get("session_id"),
+                        "error": str(e)
+                    })
+                    continue
+                name = _export_name(index, items[index], interview_type)
+                async for chunk in _write_export_entry(archive, name, document):
+                    yield chunk
+        
+        if errors:
+            # 完了順ではなく項目順に並べる
+            errors.sort(key=lambda error: error["item"])
+            yield archive.add(
+                "errors.json", json.dumps(errors, ensure_ascii=False, indent=2).encode("utf-8")
+            )
+        yield archive.close()
+    finally:
+        # クライアントが切断した場合は生成中・未送信の文書を破棄
+        for task in running:
+            if not task.done():
+                task.cancel()
+            elif not task.cancelled() and task.exception() is None:
+                task.result()[1].cleanup()
+
+
+@app.post("/api/docx/export")
+async def export_docx(request: dict = Body(...)):
+    """
+    議事録の一括エクスポート（ZIP）
+    複数のセッション・回答の議事録を並行して生成し、完成した文書から順に
+    ZIPアーカイブとして送信する（最初の文書が完成した時点でダウンロードが始まる）
+    
+    Args:
+        request: {"items": [{"session_id": "..."} または
+                  {"answers": {question_id: {"transcript": "..."}, ...}, "interview_type": "..."}, ...]}
+        
+    Returns:
+        application/zip（生成に失敗した項目は errors.json に記録）
+    """
+    items = request.get("items")
+    if not isinstance(items, list) or not items or not all(isinstance(i, dict) for i in items):
+        return JSONResponse(
+            status_code=400,
+            content={"error": "items must be a non-empty list of objects"}
+        )
+    if len(items) > Config.EXPORT_MAX_ITEMS:
+        return JSONResponse(
+            status_code=400,
+            content={"error": f"Too many items (max {Config.EXPORT_MAX_ITEMS})"}
+        )
+    
+    filename = f"議事録_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
+    return StreamingResponse(
+        _export_stream(items),
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": f"attachment; filename*=UTF-8''{quote(filename)}",
+            "X-Accel-Buffering": "no"
+        }
+    )
+
+
+@app.get("/metrics")
+async def get_metrics():
+    """
+    メトリクス（Prometheus テキスト形式）
+    
+    Returns:
+        リクエスト・処理段階・Gemini呼び出し・キャッシュのメトリクス
+    """
+    return Response(
+        content=metrics.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
 # ローカル開発用
 if __name__ == "__main__":
     import uvicorn
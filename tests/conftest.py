@@ -0,0 +1,18 @@
+"""
+テスト共通設定（リポジトリのルートを import パスに追加し、Gemini はフェイクを使う）
+"""
+import os
+import tempfile
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# app.config の読み込み前に設定する（ネットワークに出ない・ログを出さない）
+os.environ.setdefault("GEMINI_BACKEND", "fake")
+os.environ.setdefault("GEMINI_FAKE_LATENCY_MS", "1")
+os.environ.setdefault("GEMINI_FAKE_JITTER_MS", "0")
+os.environ.setdefault("ACCESS_LOG", "False")
+# 生成物はリポジトリの外に置き、文書生成はスレッドで行う（プロセスを起動しない）
+os.environ.setdefault("TTS_CACHE_DIR", tempfile.mkdtemp(prefix="tts_test_"))
+os.environ.setdefault("CPU_POOL_WORKERS", "0")
@@ -0,0 +1,111 @@
+"""
+分割アップロードの文字起こし連結（chunked_stt）のテスト
+"""
+import asyncio
+
+import pytest
+
+from app.services.audio_ingest import audio_from_bytes
+from app.services.chunked_stt import ChunkedTranscriber, ChunkedUploadError, stitch_transcripts
+
+
+class _EchoSTT:
+    """音声データをそのまま文字列として返す音声認識"""
+
+    async def transcribe_input(self, audio):
+        return audio.data.decode("utf-8")
+
+
+def _transcriber() -> ChunkedTranscriber:
+    return ChunkedTranscriber(_EchoSTT(), ttl_seconds=60, max_uploads=10, max_segments=10)
+
+
+def test_stitch_removes_boundary_overlap_when_segments_overlap():
+    parts = ["本日の会議では新サービスの提供開始", "新サービスの提供開始時期について議論した"]
+    assert stitch_transcripts(parts, [False, True]) == "本日の会議では新サービスの提供開始時期について議論した"
+
+
+def test_stitch_keeps_repeated_speech_without_overlap():
+    parts = ["はい、そうです。はい、そうです。", "はい、そうです。次に進みます"]
+    assert stitch_transcripts(parts) == "はい、そうです。はい、そうです。はい、そうです。次に進みます"
+    assert stitch_transcripts(parts, [False, False]) == "はい、そうです。はい、そうです。はい、そうです。次に進みます"
+
+
+def test_stitch_ignores_overlap_shorter_than_minimum():
+    assert stitch_transcripts(["ABCDEF", "EFGH"], [False, True]) == "ABCDEFEFGH"
+    assert stitch_transcripts(["ABCDEF", "CDEFGH"], [False, True]) == "ABCDEFGH"
+
+
+def test_stitch_skips_empty_parts():
+    assert stitch_transcripts(["", "  前半 ", "", "後半"], [False, False, False, True]) == "前半後半"
+    assert stitch_transcripts([]) == ""
+
+
+def test_finish_dedups_only_overlapped_segments():
+    async def scenario():
+        transcriber = _transcriber()
+        upload = transcriber.start("audio/webm")
+        for seq, (text, overlap_ms) in enumerate([
+            ("ありがとうございます。", 0),
+            ("ありがとうございます。それでは", 0),
+            ("それでは始めましょう", 1500),
+        ]):
+            transcriber.add_segment(upload, seq, audio_from_bytes(text.encode("utf-8"), "audio/webm"),
+                                    overlap_ms)
+        return await transcriber.finish(upload.upload_id, 3)
+
+    assert asyncio.run(scenario()) == "ありがとうございます。ありがとうございます。それでは始めましょう"
+
+
+@pytest.mark.parametrize("total_segments", [None, 0])
+def test_finish_without_segments_is_an_error(total_segments):
+    async def scenario():
+        transcriber = _transcriber()
+        upload = transcriber.start("audio/webm")
+        await transcriber.finish(upload.upload_id, total_segments)
+
+    with pytest.raises(ChunkedUploadError, match="No segments"):
+        asyncio.run(scenario())
+
+
+def test_finish_reports_missing_segments():
+    async def scenario():
+        transcriber = _transcriber()
+        upload = transcriber.start("audio/webm")
+        transcriber.add_segment(upload, 0, audio_from_bytes(b"a", "audio/webm"))
+        await transcriber.finish(upload.upload_id, 2)
+
+    with pytest.raises(ChunkedUploadError, match=r"Missing segments: \[1\]"):
+        asyncio.run(scenario())
+
+
+def test_finish_keeps_upload_until_missing_segments_arrive():
+    async def scenario():
+        transcriber = _transcriber()
+        upload = transcriber.start("audio/webm")
+        transcriber.add_segment(upload, 0, audio_from_bytes("前半".encode("utf-8"), "audio/webm"))
+        with pytest.raises(ChunkedUploadError, match="Missing segments"):
+            await transcriber.finish(upload.upload_id, 2)
+        # 送信中だった最後のセグメントが届けば、もう一度 finish できる
+        transcriber.add_segment(upload, 1, audio_from_bytes("後半".encode("utf-8"), "audio/webm"))
+        transcript = await transcriber.finish(upload.upload_id, 2)
+        assert transcriber.get(upload.upload_id) is None
+        return transcript
+
+    assert asyncio.run(scenario()) == "前半後半"
+
+
+def test_chunk_endpoint_does_not_start_upload_for_rejected_audio(monkeypatch):
+    from fastapi.testclient import TestClient
+    import main
+
+    with TestClient(main.app) as client:
+        transcriber = main.services.chunked_transcriber
+        monkeypatch.setattr(main.Config, "STT_MAX_UPLOAD_BYTES", 10)
+        response = client.post("/api/stt/chunk", data={"seq": "0"},
+                               files={"file": ("a.webm", b"x" * 100, "audio/webm")})
+        assert response.status_code == 413
+        response = client.post("/api/stt/chunk", data={"seq": "-1"},
+                               files={"file": ("a.webm", b"x", "audio/webm")})
+        assert response.status_code == 400
+        assert not transcriber._uploads
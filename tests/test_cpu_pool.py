@@ -0,0 +1,74 @@
+"""
+プロセスプール（cpu_pool）のテスト（conftest の CPU_POOL_WORKERS=0 を上書きして実際のプロセスで実行する）
+"""
+import asyncio
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+from docx import Document
+from fastapi.testclient import TestClient
+
+from app.config import Config
+from app.domain.summary import Summary
+from app.services import cpu_pool
+from app.services.cpu_pool import CPUPoolError
+from app.services.docx_service import render_minutes
+
+
+@pytest.fixture
+def process_pool(monkeypatch):
+    cpu_pool.shutdown()
+    monkeypatch.setattr(Config, "CPU_POOL_WORKERS", "1")
+    yield
+    cpu_pool.shutdown()
+
+
+def _summaries():
+    return [Summary(question_id=1, question_text="質問", summary_text="回答", category="概要")]
+
+
+def test_render_runs_in_a_worker_process(process_pool):
+    data = asyncio.run(cpu_pool.run_cpu(render_minutes, _summaries(), "# 議事録\n本文"))
+    assert isinstance(cpu_pool._get_executor(), ProcessPoolExecutor)
+    assert any(p.text == "本文" for p in Document(io.BytesIO(data)).paragraphs)
+    assert asyncio.run(cpu_pool.run_cpu(os.getpid)) != os.getpid()
+
+
+def test_pool_is_rebuilt_after_a_worker_dies(process_pool):
+    broken = cpu_pool._get_executor()
+    # 再実行でもワーカーが終了するため 503
+    with pytest.raises(CPUPoolError) as excinfo:
+        asyncio.run(cpu_pool.run_cpu(os._exit, 1))
+    assert excinfo.value.status_code == 503
+    assert cpu_pool._get_executor() is not broken
+    assert asyncio.run(cpu_pool.run_cpu(render_minutes, _summaries(), "本文"))
+
+
+def test_timed_out_task_keeps_its_slot(process_pool, monkeypatch):
+    monkeypatch.setattr(Config, "CPU_POOL_MAX_PENDING", 1)
+    asyncio.run(cpu_pool.run_cpu(os.getpid))  # ワーカーを起動しておく
+    with pytest.raises(CPUPoolError) as excinfo:
+        asyncio.run(cpu_pool.run_cpu(time.sleep, 1, timeout=0.1))
+    assert excinfo.value.status_code == 504
+    # ワーカーはまだ処理中なので次のタスクは受け付けない
+    with pytest.raises(CPUPoolError) as excinfo:
+        asyncio.run(cpu_pool.run_cpu(os.getpid))
+    assert excinfo.value.status_code == 503
+    deadline = time.monotonic() + 10
+    while cpu_pool._pending and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert asyncio.run(cpu_pool.run_cpu(os.getpid))
+
+
+def test_docx_endpoint_with_process_pool(process_pool):
+    import main
+    with TestClient(main.app) as client:
+        response = client.post("/api/docx", json={
+            "answers": {"1": {"transcript": "回答です"}}, "interview_type": "ippan"
+        })
+    assert response.status_code == 200
+    assert isinstance(cpu_pool._get_executor(), ProcessPoolExecutor)
+    assert Document(io.BytesIO(response.content)).paragraphs
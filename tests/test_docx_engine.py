@@ -0,0 +1,119 @@
+"""
+Word文書の高速生成（docx_engine の1パス変換・テンプレート）のテスト
+"""
+import io
+import zipfile
+
+import pytest
+from docx import Document
+
+from app.domain.summary import Summary
+from app.services.docx_engine import DocxTemplate, MinutesRenderer, get_template
+from app.services.docx_service import DocxService
+
+
+@pytest.fixture(scope="module")
+def renderer() -> MinutesRenderer:
+    return MinutesRenderer(get_template())
+
+
+def _style(renderer: MinutesRenderer, role: str) -> str:
+    return f'<w:pStyle w:val="{renderer.template.style_ids[role]}"/>'
+
+
+@pytest.mark.parametrize("line, role", [
+    ("# 見出し", "heading1"),
+    ("## 見出し", "heading2"),
+    ("### 見出し", "heading3"),
+    ("【会議概要】", "heading2"),
+    ("- 項目", "bullet"),
+    ("* 項目", "bullet"),
+    ("・項目", "bullet"),
+])
+def test_styled_lines(renderer, line, role):
+    (element,) = renderer.render_markdown(line)
+    assert _style(renderer, role) in element
+    assert "見出し" in element or "項目" in element or "会議概要" in element
+
+
+@pytest.mark.parametrize("line", [
+    "**太字だけの行**",
+    "-ハイフンの後に空白がない",
+    "#見出しではない",
+    "【閉じていない",
+    "####### 見出しは3段まで",
+])
+def test_lines_that_look_like_markup_are_plain_paragraphs(renderer, line):
+    (element,) = renderer.render_markdown(line)
+    assert "<w:pStyle" not in element
+
+
+@pytest.mark.parametrize("line", ["---", "***", "___", "", "   "])
+def test_rules_and_blank_lines_become_empty_paragraphs(renderer, line):
+    assert renderer.render_markdown(line) == ["<w:p/>"]
+
+
+def test_numbered_list_keeps_number_and_hanging_indent(renderer):
+    (element,) = renderer.render_markdown("1. 最初の議題")
+    assert "<w:ind " in element and "1. 最初の議題" in element
+
+
+def test_bold_runs_and_unclosed_markers(renderer):
+    element = renderer.paragraph("前**太字**後")
+    assert element.count("<w:b/>") == 1 and ">太字<" in element
+    element = renderer.paragraph("閉じない**太字")
+    assert "<w:b/>" not in element and "閉じない**太字" in element
+
+
+def test_text_is_escaped_and_invalid_xml_characters_removed(renderer):
+    element = renderer.paragraph("a < b & c > d\x00\x0b")
+    assert "a &lt; b &amp; c &gt; d<" in element
+
+
+def test_table_skips_separator_and_pads_short_rows(renderer):
+    elements = renderer.render_markdown("| 項目 | 担当 | 期限 |\n| --- | :---: | ---: |\n| 見積 | 山田 |\n次の段落")
+    table, paragraph = elements
+    assert table.startswith("<w:tbl>") and table.count("<w:tr>") == 2
+    assert table.count("<w:tc>") == 6 and table.count("<w:gridCol ") == 3
+    assert "<w:b/>" in table.split("</w:tr>")[0]
+    assert "次の段落" in paragraph
+
+
+def test_template_without_styles_emits_no_style_reference(tmp_path):
+    doc = Document()
+    styles = doc.styles.element
+    for style in list(styles):
+        if style.get("{http://schemas.openxmlformats.org/wordprocessingml/2006/main}styleId") in (
+            "ListBullet", "Heading1"
+        ):
+            styles.remove(style)
+    path = tmp_path / "template.docx"
+    doc.save(str(path))
+
+    template = DocxTemplate(path)
+    assert template.style_ids["bullet"] is None and template.style_ids["heading1"] is None
+    renderer = MinutesRenderer(template)
+    for element in renderer.render_markdown("# 見出し\n- 項目"):
+        assert "<w:pStyle" not in element
+    data = template.package("".join(renderer.render_markdown("# 見出し\n- 項目")) + "<w:p/>")
+    assert [p.text for p in Document(io.BytesIO(data)).paragraphs][:2] == ["見出し", "項目"]
+
+
+def test_template_removes_existing_body_content(tmp_path):
+    doc = Document()
+    doc.add_paragraph("テンプレートの本文")
+    path = tmp_path / "template.docx"
+    doc.save(str(path))
+    data = DocxTemplate(path).package("<w:p/>")
+    assert "テンプレートの本文" not in zipfile.ZipFile(io.BytesIO(data)).read("word/document.xml").decode()
+
+
+@pytest.mark.parametrize("content", ["", None, "| a |", "# 見出しだけ"])
+def test_render_bytes_produces_valid_documents(content):
+    summaries = [Summary(question_id=1, question_text="質問", summary_text="要約", category="概要")]
+    data = DocxService().render_bytes(summaries, content)
+    document = Document(io.BytesIO(data))
+    assert document.paragraphs[0].text
+    # 表で終わる場合も最後は段落になる
+    body = document.element.body
+    assert body[-2].tag.endswith("}p")
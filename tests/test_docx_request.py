@@ -0,0 +1,42 @@
+"""
+議事録生成リクエストの検証（/api/docx・/api/docx/stream・/api/docx/jobs・/api/docx/export）のテスト
+"""
+import io
+import json
+import zipfile
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+
+INVALID_BODIES = [
+    {"answers": ["回答"]},
+    {"answers": {"abc": {"transcript": "回答"}}},
+    {"answers": {"1": "回答"}},
+    {"answers": {"1": {"transcript": 123}}},
+    {"answers": {"1": {"transcript": "回答"}}, "interview_type": ["ippan"]},
+    {"session_id": {"id": 1}},
+]
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(main.app) as client:
+        yield client
+
+
+@pytest.mark.parametrize("path", ["/api/docx", "/api/docx/stream", "/api/docx/jobs"])
+@pytest.mark.parametrize("body", INVALID_BODIES)
+def test_invalid_answers_are_rejected(client, path, body):
+    response = client.post(path, json=body)
+    assert response.status_code == 400
+    assert response.json()["error"]
+
+
+def test_invalid_export_items_are_reported(client):
+    response = client.post("/api/docx/export", json={"items": INVALID_BODIES})
+    assert response.status_code == 200
+    archive = zipfile.ZipFile(io.BytesIO(response.content))
+    errors = json.loads(archive.read("errors.json"))
+    assert sorted(error["item"] for error in errors) == list(range(1, len(INVALID_BODIES) + 1))
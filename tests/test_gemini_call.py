@@ -0,0 +1,192 @@
+"""
+Gemini呼び出しラッパー（gemini_call）とワーカースレッド（executor）のテスト
+"""
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import main
+from app.config import Config
+from app.services import executor
+from app.services.fake_gemini import FakeBackendSettings
+from app.services.gemini_call import GeminiCallError, GeminiCaller, TokenBucket
+
+
+@pytest.fixture(autouse=True)
+def fresh_executor():
+    # セマフォはイベントループごとに作り直す
+    executor.shutdown()
+    yield
+    executor.shutdown()
+
+
+def _caller(**kwargs) -> GeminiCaller:
+    options = dict(rate_per_second=0, burst=1, deadline=5, max_retries=3,
+                   base_delay=0, max_delay=0)
+    options.update(kwargs)
+    return GeminiCaller(**options)
+
+
+def _unavailable():
+    try:
+        FakeBackendSettings(error_rate=1.0, error_code=503).maybe_fail()
+    except Exception as e:
+        return e
+
+
+def test_only_idempotent_calls_are_retried():
+    calls = []
+
+    def upload(*, path):
+        calls.append(path)
+        raise _unavailable()
+
+    caller = _caller()
+    with pytest.raises(GeminiCallError):
+        asyncio.run(caller.call(upload, path="a.wav"))
+    assert len(calls) == 1
+
+    calls.clear()
+    with pytest.raises(GeminiCallError):
+        asyncio.run(caller.call(upload, path="a.wav", idempotent=True))
+    assert len(calls) == 4
+
+
+def test_latency_is_tracked_per_operation_and_model():
+    def generate_content(*, model):
+        return model
+
+    def upload(*, path):
+        return path
+
+    async def run(caller):
+        await caller.call(generate_content, model="fast", idempotent=True)
+        await caller.call(generate_content, model="slow", idempotent=True)
+        await caller.call(upload, path="a.wav")
+
+    caller = _caller(hedge_min_samples=1)
+    asyncio.run(run(caller))
+    assert set(caller._latency) == {
+        ("generate_content", "fast"), ("generate_content", "slow"), ("upload", "")
+    }
+
+
+def test_hedge_only_for_idempotent_calls():
+    calls = []
+
+    def generate_content(*, model):
+        calls.append(model)
+        time.sleep(0.2)
+        return model
+
+    def caller():
+        caller = _caller(hedge=True, hedge_min_samples=1)
+        caller.latency("generate_content", "m").record(0.01)
+        return caller
+
+    plain = caller()
+    asyncio.run(plain.call(generate_content, model="m"))
+    assert len(calls) == 1 and plain.hedged == 0
+
+    calls.clear()
+    hedged = caller()
+    asyncio.run(hedged.call(generate_content, model="m", idempotent=True))
+    assert len(calls) == 2 and hedged.hedged == 1
+
+
+def test_abandoned_result_is_discarded():
+    created = SimpleNamespace(name="files/late")
+    discarded = []
+
+    def upload(*, path):
+        time.sleep(0.3)
+        return created
+
+    async def run():
+        with pytest.raises(GeminiCallError) as excinfo:
+            await _caller().call(upload, path="a.wav", deadline=0.05, discard=discarded.append)
+        assert excinfo.value.status_code == 504
+        # 期限切れ後もアップロードは完了するため、完了を待って削除される
+        await asyncio.sleep(0.5)
+
+    asyncio.run(run())
+    assert discarded == [created]
+
+
+def test_stream_deadline_covers_the_whole_stream():
+    def generate_content_stream(*, model):
+        yield "first"
+        time.sleep(1)
+        yield "late"
+
+    async def run():
+        received = []
+        with pytest.raises(GeminiCallError) as excinfo:
+            async for item in _caller().stream(generate_content_stream, model="m", deadline=0.2):
+                received.append(item)
+        assert excinfo.value.status_code == 504
+        return received
+
+    started = time.monotonic()
+    assert asyncio.run(run()) == ["first"]
+    assert time.monotonic() - started < 0.8
+
+
+def test_cancelled_call_keeps_its_slot_until_the_thread_finishes(monkeypatch):
+    monkeypatch.setattr(Config, "GEMINI_MAX_CONCURRENCY", 1)
+
+    async def run():
+        started = time.monotonic()
+        task = asyncio.ensure_future(executor.run_blocking(time.sleep, 0.3))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        # 1つ目のスレッドが終わるまで2つ目は始まらない
+        second = await executor.run_blocking(time.monotonic)
+        return second - started
+
+    assert asyncio.run(run()) >= 0.25
+
+
+def test_token_bucket_waits_for_refill():
+    async def run():
+        bucket = TokenBucket(rate=20, capacity=1)
+        assert bucket.try_acquire()
+        assert not bucket.try_acquire()
+        started = time.monotonic()
+        await bucket.acquire()
+        return time.monotonic() - started
+
+    assert 0.03 <= asyncio.run(run()) < 0.5
+
+
+def test_token_bucket_without_rate_is_unlimited():
+    bucket = TokenBucket(rate=0, capacity=1)
+    assert all(bucket.try_acquire() for _ in range(100))
+    asyncio.run(bucket.acquire(deadline=time.monotonic()))
+
+
+def test_rate_limited_call_fails_fast_before_deadline():
+    calls = []
+
+    def generate_content(*, model):
+        calls.append(model)
+        return model
+
+    async def run(caller):
+        await caller.call(generate_content, model="m", idempotent=True)
+        with pytest.raises(GeminiCallError) as excinfo:
+            await caller.call(generate_content, model="m", idempotent=True, deadline=0.5)
+        return excinfo.value
+
+    # 1トークン/10秒: 2回目は期限内に取得できないため、待たずに 503 で失敗する
+    caller = _caller(rate_per_second=0.1, burst=1)
+    started = time.monotonic()
+    error = asyncio.run(run(caller))
+    assert time.monotonic() - started < 0.4
+    assert error.status_code == 503 and error.retry_after > 5
+    assert calls == ["m"]
+
+    response = main._gemini_error_response(error)
+    assert response.status_code == 503 and int(response.headers["Retry-After"]) >= 5
@@ -0,0 +1,134 @@
+"""
+バックグラウンドジョブキュー（job_queue）のテスト
+"""
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.services.job_queue import JOB_DONE, JOB_FAILED, JobQueue, QueueFullError
+
+
+def _queue(**kwargs) -> JobQueue:
+    options = dict(workers=1, max_pending=2, ttl_seconds=60)
+    options.update(kwargs)
+    return JobQueue(**options)
+
+
+def test_same_key_returns_existing_job():
+    async def scenario():
+        queue = _queue()
+        calls = []
+
+        async def run():
+            calls.append(1)
+            return "result"
+
+        first = queue.submit("key", run)
+        assert queue.submit("key", run) is first
+        await asyncio.sleep(0.01)
+        assert first.status == JOB_DONE and first.result == "result"
+        # 完了済みでも同じジョブを返す
+        assert queue.submit("key", run) is first
+        await queue.stop()
+        return calls
+
+    assert asyncio.run(scenario()) == [1]
+
+
+def test_failed_job_can_be_resubmitted():
+    async def scenario():
+        queue = _queue()
+
+        async def fail():
+            raise ValueError("boom")
+
+        failed = queue.submit("key", fail)
+        await asyncio.sleep(0.01)
+        assert failed.status == JOB_FAILED and failed.error == "boom"
+        assert queue.find("key") is None
+        retried = queue.submit("key", fail)
+        await queue.stop()
+        return failed, retried
+
+    failed, retried = asyncio.run(scenario())
+    assert retried is not failed
+
+
+def test_done_job_with_discarded_result_is_resubmitted():
+    async def scenario():
+        available = {"token"}
+        queue = _queue(result_available=lambda token: token in available)
+
+        async def run():
+            return "token"
+
+        first = queue.submit("key", run)
+        await asyncio.sleep(0.01)
+        assert queue.submit("key", run) is first
+        available.clear()
+        second = queue.submit("key", run)
+        await queue.stop()
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert second is not first
+
+
+def test_backpressure_rejects_when_queue_is_full():
+    async def scenario():
+        queue = _queue(max_pending=1)
+        release = asyncio.Event()
+
+        async def block():
+            await release.wait()
+
+        queue.submit("running", block)
+        await asyncio.sleep(0.01)
+        queue.submit("waiting", block)
+        assert queue.pending == 1
+        with pytest.raises(QueueFullError):
+            queue.submit("rejected", block)
+        release.set()
+        await asyncio.sleep(0.01)
+        assert queue.pending == 0
+        queue.submit("accepted", block)
+        await queue.stop()
+
+    asyncio.run(scenario())
+
+
+def test_finished_jobs_expire_after_ttl():
+    async def scenario():
+        queue = _queue(ttl_seconds=0.05)
+
+        async def run():
+            return 1
+
+        job = queue.submit("key", run)
+        await asyncio.sleep(0.01)
+        assert queue.get(job.job_id) is job
+        await asyncio.sleep(0.1)
+        assert queue.get(job.job_id) is None
+        assert queue.find("key") is None
+        await queue.stop()
+
+    asyncio.run(scenario())
+
+
+def test_idempotency_key_is_checked_before_preparing(monkeypatch):
+    import main
+
+    body = {"answers": {"1": {"transcript": "回答"}}, "interview_type": "ippan"}
+    headers = {"Idempotency-Key": "job-1"}
+    with TestClient(main.app) as client:
+        first = client.post("/api/docx/jobs", json=body, headers=headers)
+        assert first.status_code == 202
+
+        async def unexpected(request):
+            raise AssertionError("duplicate submission was prepared again")
+
+        monkeypatch.setattr(main, "_prepare_minutes", unexpected)
+        second = client.post("/api/docx/jobs", json=body, headers=headers)
+    assert second.status_code == 202
+    assert second.json()["job_id"] == first.json()["job_id"]
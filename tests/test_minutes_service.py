@@ -0,0 +1,66 @@
+"""
+議事録の入力作成・チャンク分割（minutes_service）のテスト
+"""
+from app.config import Config
+from app.domain.interview_config import InterviewConfigRegistry
+from app.services.minutes_service import QAItem, estimate_tokens, prepare_minutes, split_chunks
+
+
+def _item(category: str, tokens: int) -> QAItem:
+    # 全角1文字≒1トークン
+    return QAItem(category=category, text="あ" * tokens)
+
+
+def test_estimate_tokens_counts_cjk_and_ascii():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("あいう") == 3
+    assert estimate_tokens("abcdefgh") == 2
+    assert estimate_tokens("議事録abcd") == 4
+
+
+def test_split_chunks_empty():
+    assert split_chunks([], 100) == []
+
+
+def test_split_chunks_keeps_everything_in_one_chunk_when_it_fits():
+    items = [_item("A", 10), _item("B", 10), _item("B", 10)]
+    assert split_chunks(items, 100) == ["あ" * 30]
+
+
+def test_split_chunks_breaks_between_categories():
+    items = [_item("A", 40), _item("A", 40), _item("B", 40), _item("C", 10)]
+    chunks = split_chunks(items, 100)
+    # A（80）は1チャンクにまとめ、B+C（50）は次のチャンク
+    assert [estimate_tokens(chunk) for chunk in chunks] == [80, 50]
+
+
+def test_split_chunks_splits_oversized_category_by_answer():
+    items = [_item("A", 60), _item("A", 60), _item("A", 60)]
+    chunks = split_chunks(items, 100)
+    assert [estimate_tokens(chunk) for chunk in chunks] == [60, 60, 60]
+
+
+def test_split_chunks_keeps_oversized_answer_whole():
+    items = [_item("A", 10), _item("B", 250), _item("C", 10)]
+    chunks = split_chunks(items, 100)
+    assert [estimate_tokens(chunk) for chunk in chunks] == [10, 250, 10]
+
+
+def test_split_chunks_preserves_order_and_text():
+    items = [QAItem(category=c, text=f"{c}{i}\n") for i, c in enumerate("AABBBCAA")]
+    chunks = split_chunks(items, 3)
+    assert "".join(chunks) == "".join(item.text for item in items)
+
+
+def test_prepare_minutes_skips_unknown_questions_and_empty_answers():
+    config = InterviewConfigRegistry(Config.BASE_DIR).get("ippan")
+    first, second = config.question_flow.questions[:2]
+    minutes = prepare_minutes(config, {
+        str(first.id): {"transcript": "回答です"},
+        str(second.id): {"transcript": ""},
+        "9999": {"transcript": "存在しない質問"},
+    })
+    assert minutes.interview_type == "ippan"
+    assert [s.question_id for s in minutes.summaries] == [first.id, second.id]
+    assert len(minutes.qa_items) == 1
+    assert f"【{first.category}】{first.text}\n回答: 回答です" in minutes.prompt
@@ -0,0 +1,81 @@
+"""
+画面・静的ファイルのメモリキャッシュ（page_cache）のテスト
+"""
+import asyncio
+import os
+import threading
+
+import pytest
+
+from app.services.page_cache import PageCache
+
+
+@pytest.fixture
+def site(tmp_path):
+    pages = tmp_path / "pages"
+    static = tmp_path / "static"
+    pages.mkdir()
+    static.mkdir()
+    (pages / "top.html").write_text('<link href="/static/style.css">', encoding="utf-8")
+    (static / "style.css").write_text("body { color: black; }", encoding="utf-8")
+    (static / "other.js").write_text("console.log(1);", encoding="utf-8")
+    os.utime(pages / "top.html", (1000, 1000))
+    os.utime(static / "style.css", (2000, 2000))
+    os.utime(static / "other.js", (9000, 9000))
+    return pages, static
+
+
+def _cache(site) -> PageCache:
+    pages, static = site
+    return PageCache([pages], static, check_interval=0)
+
+
+def test_last_modified_uses_only_referenced_assets(site):
+    page = asyncio.run(_cache(site).page("top.html"))
+    # other.js は参照していないため、より新しくても使わない
+    assert page.mtime == 2000
+    assert b"/static/style." in page.body
+
+
+def test_page_reloads_only_when_referenced_assets_change(site):
+    pages, static = site
+    cache = _cache(site)
+
+    async def scenario():
+        first = await cache.page("top.html")
+        (static / "other.js").write_text("console.log(2);", encoding="utf-8")
+        unchanged = await cache.page("top.html")
+        (static / "style.css").write_text("body { color: red; }", encoding="utf-8")
+        os.utime(static / "style.css", (3000, 3000))
+        changed = await cache.page("top.html")
+        return first, unchanged, changed
+
+    first, unchanged, changed = asyncio.run(scenario())
+    assert unchanged is first
+    assert changed.etag != first.etag and changed.mtime == 3000
+
+
+def test_fingerprinted_asset_lookup(site):
+    cache = _cache(site)
+
+    async def scenario():
+        page = await cache.page("top.html")
+        url = page.body.decode("utf-8").split('"')[1]
+        return await cache.asset(url.removeprefix("/static/")), await cache.asset("style.0000000000.css")
+
+    (current, fresh), (stale, stale_fresh) = asyncio.run(scenario())
+    assert current is stale and fresh and not stale_fresh
+
+
+def test_scan_runs_off_the_event_loop(site, monkeypatch):
+    cache = _cache(site)
+    threads = []
+    scan = cache._refresh_assets
+
+    def recording_scan():
+        threads.append(threading.current_thread())
+        scan()
+
+    monkeypatch.setattr(cache, "_refresh_assets", recording_scan)
+    asyncio.run(cache.page("top.html"))
+    assert threads and threading.main_thread() not in threads
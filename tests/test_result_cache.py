@@ -0,0 +1,134 @@
+"""
+Gemini API 結果のキャッシュ（result_cache）のテスト
+"""
+import asyncio
+
+import pytest
+
+from app.services.result_cache import ResultCache, make_key
+
+
+def _cache(**kwargs) -> ResultCache:
+    options = dict(max_entries=10, max_bytes=1000, ttl_seconds=60)
+    options.update(kwargs)
+    return ResultCache(**options)
+
+
+def test_make_key_separates_parts():
+    assert make_key("ab", "c") != make_key("a", "bc")
+    assert make_key("a", b"b") == make_key("a", "b")
+
+
+def test_lru_evicts_least_recently_used_entry():
+    async def scenario():
+        cache = _cache(max_entries=2)
+        await cache.set("a", "1")
+        await cache.set("b", "2")
+        assert await cache.get("a") == "1"
+        await cache.set("c", "3")
+        return [await cache.get(key) for key in ("a", "b", "c")]
+
+    assert asyncio.run(scenario()) == ["1", None, "3"]
+
+
+def test_total_size_limit_evicts_and_skips_oversized_values():
+    async def scenario():
+        cache = _cache(max_bytes=10)
+        await cache.set("a", "12345")
+        await cache.set("b", "67890")
+        await cache.set("c", "x")
+        await cache.set("huge", "y" * 11)
+        return [await cache.get(key) for key in ("a", "b", "c", "huge")], cache._total_bytes
+
+    values, total = asyncio.run(scenario())
+    assert values == [None, "67890", "x", None]
+    assert total == 6
+
+
+def test_entries_expire_after_ttl():
+    async def scenario():
+        cache = _cache(ttl_seconds=0.05)
+        await cache.set("a", "1")
+        assert await cache.get("a") == "1"
+        await asyncio.sleep(0.1)
+        return await cache.get("a"), len(cache)
+
+    assert asyncio.run(scenario()) == (None, 0)
+
+
+def test_sqlite_backend_survives_restart(tmp_path):
+    db_path = tmp_path / "cache.db"
+
+    async def write():
+        cache = _cache(db_path=db_path)
+        await cache.set("a", "1")
+        cache.close()
+
+    async def read():
+        cache = _cache(db_path=db_path)
+        try:
+            return await cache.get("a")
+        finally:
+            cache.close()
+
+    asyncio.run(write())
+    assert asyncio.run(read()) == "1"
+
+
+def test_concurrent_requests_share_one_computation():
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "value"
+
+    async def scenario():
+        cache = _cache()
+        results = await asyncio.gather(*(cache.get_or_compute("k", compute) for _ in range(5)))
+        return results, await cache.get_or_compute("k", compute)
+
+    results, cached = asyncio.run(scenario())
+    assert results == ["value"] * 5 and cached == "value"
+    assert calls == [1]
+
+
+def test_cancelled_owner_does_not_cancel_waiters():
+    async def compute():
+        await asyncio.sleep(0.05)
+        return "value"
+
+    async def scenario():
+        cache = _cache()
+        owner = asyncio.ensure_future(cache.get_or_compute("k", compute))
+        await asyncio.sleep(0)
+        waiter = asyncio.ensure_future(cache.get_or_compute("k", compute))
+        await asyncio.sleep(0.01)
+        owner.cancel()
+        result = await waiter
+        with pytest.raises(asyncio.CancelledError):
+            await owner
+        return result, await cache.get("k")
+
+    assert asyncio.run(scenario()) == ("value", "value")
+
+
+def test_failed_computation_is_shared_and_not_cached():
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    async def scenario():
+        cache = _cache()
+        results = await asyncio.gather(
+            cache.get_or_compute("k", compute), cache.get_or_compute("k", compute),
+            return_exceptions=True
+        )
+        return results, await cache.get("k")
+
+    results, cached = asyncio.run(scenario())
+    assert all(isinstance(result, ValueError) for result in results)
+    assert calls == [1] and cached is None
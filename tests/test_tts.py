@@ -0,0 +1,128 @@
+"""
+質問読み上げ音声（TTSCache・Range の解釈・音声エンドポイント）のテスト
+"""
+import asyncio
+import io
+import wave
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from app.services.tts_cache import TTSCache
+from app.services.tts_service import pcm_to_wav
+
+
+class _CountingTTS:
+    """呼び出し回数を数える音声合成"""
+    model = "test-model"
+    voice = "test-voice"
+    media_type = "audio/wav"
+    extension = "wav"
+
+    def __init__(self, data: bytes = b"RIFF-audio"):
+        self.data = data
+        self.calls = 0
+
+    async def synthesize(self, text: str) -> bytes:
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return self.data
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("bytes=0-99", (0, 99)),
+    ("bytes=100-", (100, 999)),
+    ("bytes=-100", (900, 999)),
+    ("bytes=-5000", (0, 999)),
+    ("bytes=900-5000", (900, 999)),
+    ("bytes=1000-", "unsatisfiable"),
+    ("bytes=-0", "unsatisfiable"),
+    ("bytes=5-2", None),
+    ("bytes=0-1,5-6", None),
+    ("items=0-1", None),
+    ("bytes=abc", None),
+    ("bytes=a-b", None),
+])
+def test_parse_range(header, expected):
+    assert main._parse_range(header, 1000) == expected
+
+
+def test_parse_range_on_empty_body_is_unsatisfiable():
+    assert main._parse_range("bytes=0-", 0) == "unsatisfiable"
+    assert main._parse_range("bytes=-10", 0) == "unsatisfiable"
+
+
+def test_pcm_to_wav_header():
+    wav = wave.open(io.BytesIO(pcm_to_wav(b"\x00\x00" * 480, 24000)))
+    assert (wav.getnchannels(), wav.getsampwidth(), wav.getframerate(), wav.getnframes()) == (1, 2, 24000, 480)
+
+
+def test_cache_synthesizes_once_and_reads_back_from_disk(tmp_path):
+    tts = _CountingTTS()
+
+    async def scenario():
+        cache = TTSCache(tts, tmp_path, max_memory_bytes=1024)
+        results = await asyncio.gather(*(cache.get_or_synthesize("こんにちは") for _ in range(5)))
+        # 別のインスタンス（別ワーカー・再起動）はディスクから読む
+        other = TTSCache(tts, tmp_path, max_memory_bytes=1024)
+        return results, await other.get("こんにちは")
+
+    results, from_disk = asyncio.run(scenario())
+    assert tts.calls == 1
+    assert {audio.data for audio in results} == {b"RIFF-audio"}
+    assert from_disk.data == b"RIFF-audio" and from_disk.etag == results[0].etag
+    assert from_disk.media_type == "audio/wav"
+
+
+def test_cache_does_not_store_empty_audio(tmp_path):
+    tts = _CountingTTS(data=b"")
+
+    async def scenario():
+        cache = TTSCache(tts, tmp_path, max_memory_bytes=1024)
+        first = await cache.get_or_synthesize("空")
+        second = await cache.get_or_synthesize("空")
+        return first, second
+
+    assert asyncio.run(scenario()) == (None, None)
+    assert tts.calls == 2
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_cache_key_changes_with_text_and_voice(tmp_path):
+    tts = _CountingTTS()
+    cache = TTSCache(tts, tmp_path, max_memory_bytes=1024)
+    key = cache.key("質問1")
+    assert cache.key("質問1") == key
+    assert cache.key("質問2") != key
+    tts.voice = "other-voice"
+    assert cache.key("質問1") != key
+
+
+def test_audio_endpoint_etag_and_ranges():
+    with TestClient(main.app) as client:
+        full = client.get("/api/ippan/tts/1")
+        assert full.status_code == 200
+        assert full.headers["content-type"] == "audio/wav"
+        size = len(full.content)
+        etag = full.headers["etag"]
+
+        assert client.get("/api/ippan/tts/1", headers={"If-None-Match": etag}).status_code == 304
+
+        suffix = client.get("/api/ippan/tts/1", headers={"Range": "bytes=-10"})
+        assert suffix.status_code == 206
+        assert suffix.headers["content-range"] == f"bytes {size - 10}-{size - 1}/{size}"
+        assert suffix.content == full.content[-10:]
+
+        open_ended = client.get("/api/ippan/tts/1", headers={"Range": f"bytes={size - 4}-"})
+        assert open_ended.status_code == 206 and open_ended.content == full.content[-4:]
+
+        unsatisfiable = client.get("/api/ippan/tts/1", headers={"Range": f"bytes={size}-"})
+        assert unsatisfiable.status_code == 416
+        assert unsatisfiable.headers["content-range"] == f"bytes */{size}"
+
+        # If-Range が一致しない場合は全体を返す
+        stale = client.get("/api/ippan/tts/1", headers={"Range": "bytes=0-9", "If-Range": '"old"'})
+        assert stale.status_code == 200 and len(stale.content) == size
+
+        assert client.get("/api/ippan/tts/999").status_code == 404
@@ -0,0 +1,102 @@
+"""
+ZIPアーカイブの逐次生成（ZipStream）と議事録の一括エクスポートのテスト
+"""
+import io
+import json
+import os
+import zipfile
+
+from fastapi.testclient import TestClient
+from docx import Document
+
+import main
+from app.services.zip_stream import ZipStream
+
+
+def _collect(chunks) -> zipfile.ZipFile:
+    archive = zipfile.ZipFile(io.BytesIO(b"".join(chunks)))
+    assert archive.testzip() is None
+    return archive
+
+
+def test_empty_archive_is_valid():
+    archive = _collect([ZipStream().close()])
+    assert archive.namelist() == []
+
+
+def test_entries_are_returned_as_soon_as_they_are_added():
+    stream = ZipStream()
+    first = stream.add("議事録_001.docx", b"a" * 1000)
+    assert first.startswith(b"PK\x03\x04")
+    second = stream.add("b.txt", b"")
+    archive = _collect([first, second, stream.close()])
+    assert archive.namelist() == ["議事録_001.docx", "b.txt"]
+    assert archive.read("議事録_001.docx") == b"a" * 1000
+    assert archive.read("b.txt") == b""
+    # 日本語のファイル名は UTF-8 フラグ付きで書き込まれる
+    assert archive.getinfo("議事録_001.docx").flag_bits & 0x800
+
+
+def test_streamed_entry_written_in_pieces():
+    stream = ZipStream()
+    payload = os.urandom(1_000_000)
+    chunks = []
+    with stream.open("large.bin") as target:
+        for offset in range(0, len(payload), 100_000):
+            target.write(payload[offset:offset + 100_000])
+            chunks.append(stream.drain())
+    chunks.append(stream.drain())
+    chunks.append(stream.close())
+    # 書き込み途中でも送信できるバイト列が出ている
+    assert sum(1 for chunk in chunks[:-2] if chunk) > 1
+    assert _collect(chunks).read("large.bin") == payload
+
+
+def test_zip64_directory_for_many_entries():
+    stream = ZipStream()
+    chunks = [stream.add(f"{i}.txt", b"x") for i in range(65_536)]
+    chunks.append(stream.close())
+    body = b"".join(chunks)
+    # エントリ数が 65535 を超えると ZIP64 の終端レコードが必要
+    assert b"PK\x06\x06" in body
+    assert len(zipfile.ZipFile(io.BytesIO(body)).infolist()) == 65_536
+
+
+def test_export_rejects_invalid_requests():
+    with TestClient(main.app) as client:
+        for body in ({}, {"items": []}, {"items": "s1"}, {"items": [1, 2]}):
+            response = client.post("/api/docx/export", json=body)
+            assert response.status_code == 400
+        too_many = [{"session_id": "x"}] * (main.Config.EXPORT_MAX_ITEMS + 1)
+        assert client.post("/api/docx/export", json={"items": too_many}).status_code == 400
+
+
+def test_export_with_only_failures_contains_errors_only():
+    with TestClient(main.app) as client:
+        response = client.post("/api/docx/export", json={"items": [
+            {"session_id": "missing"},
+            {"answers": {"1": {"transcript": "回答"}}, "interview_type": "unknown"},
+        ]})
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/zip"
+    archive = _collect([response.content])
+    assert archive.namelist() == ["errors.json"]
+    errors = json.loads(archive.read("errors.json"))
+    assert [error["item"] for error in errors] == [1, 2]
+    assert errors[0]["session_id"] == "missing"
+
+
+def test_export_renders_each_item_with_unique_names():
+    items = [{"answers": {"1": {"transcript": f"回答{i}"}}, "interview_type": "ippan"} for i in range(5)]
+    with TestClient(main.app) as client:
+        response = client.post("/api/docx/export", json={"items": items})
+    archive = _collect([response.content])
+    names = sorted(archive.namelist())
+    assert names == [f"議事録_{i:03d}_ippan.docx" for i in range(1, 6)]
+    for name in names:
+        assert Document(io.BytesIO(archive.read(name))).paragraphs
+
+
+def test_export_name_sanitizes_session_id():
+    name = main._export_name(0, {"session_id": "../../etc/passwd"}, "ippan")
+    assert "/" not in name and name.startswith("議事録_001_")